@@ -6,6 +6,8 @@ from semantic_kernel.agents.orchestration.group_chat import BooleanResult, Round
 from semantic_kernel.contents import  ChatHistory
 from typing_extensions import override
 
+from utils.human_input import is_termination_request
+
 
 class CustomRoundRobinGroupChatManager(RoundRobinGroupChatManager):
     """Custom round robin group chat manager to enable user input."""
@@ -31,4 +33,14 @@ class CustomRoundRobinGroupChatManager(RoundRobinGroupChatManager):
         return BooleanResult(
             result=False,
             reason="User input is not needed if the last message is not from the reviewer.",
-        )
\ No newline at end of file
+        )
+
+    @override
+    async def should_terminate(self, chat_history: ChatHistory) -> BooleanResult:
+        """Stop when a human request timed out and the default action is to terminate."""
+        if is_termination_request(chat_history):
+            return BooleanResult(
+                result=True,
+                reason="No human response before the deadline.",
+            )
+        return await super().should_terminate(chat_history)
@@ -2,92 +2,159 @@
 Agent factory for creating specialized research agents.
 """
 import logging
+import threading
+from typing import Any, Dict, Optional
 
 from semantic_kernel.agents import ChatCompletionAgent
 
+from plugins.blobPlugin import BlobPlugin
+from plugins.evidence import create_evidence_store
+from plugins.evidencePlugin import EvidencePlugin
+from plugins.extractPlugin import ExtractPlugin
+from plugins.extraction import get_page_extractor
 from plugins.searchPlugin import SearchPlugin
 from utils.prompts import (CREDIBILITY_CRITIC_PROMPT, DATA_FEEDER_PROMPT,
                       REFLECTION_CRITIC_PROMPT, REPORT_WRITER_PROMPT,
                       SUMMARIZER_PROMPT, TRANSLATOR_PROMPT, MANAGER_PROMPT)
+from utils.usage_ledger import get_usage_ledger
 from utils.util import get_azure_openai_service,ModelAndDeploymentName
 
 logger = logging.getLogger(__name__)
 
 
-def data_feeder() -> ChatCompletionAgent:
-    """Create data feeder agent for web search operations."""
+class ResearchSession:
+    """State shared by the agents of one research run.
+
+    The data feeder and the credibility critic each get their own SearchPlugin;
+    both record and assess results in the session's result store, so the critic
+    sees what the feeder found. Snippets and page chunks either of them collects
+    go to the session's evidence store, which the report writer and the reflection
+    critic retrieve from, so evidence never leaks from one run into the next.
+    """
+
+    def __init__(self):
+        """Initialize an empty session."""
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.evidence = create_evidence_store()
+        self.extractor = get_page_extractor(evidence=self.evidence)
+
+
+_default_session: Optional[ResearchSession] = None
+_default_session_lock = threading.Lock()
+
+
+def _get_default_session() -> ResearchSession:
+    """Return the session shared by agents created without one, creating it on first use."""
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = ResearchSession()
+        return _default_session
+
+
+def data_feeder(research_task: Optional[str] = None, session: Optional[ResearchSession] = None) -> ChatCompletionAgent:
+    """Create data feeder agent for web search operations.
+
+    Args:
+        research_task: Optional research task that search results are reranked against
+        session: Research session shared with the other agents (default is shared process-wide)
+    """
+    session = session or _get_default_session()
     logger.info("Creating DataFeederAgent")
-    return ChatCompletionAgent(
+    return get_usage_ledger().register_agent(ChatCompletionAgent(
         name="DataFeederAgent",
         description="Performs comprehensive web search using Tavily API and returns structured JSON results.",
         instructions=DATA_FEEDER_PROMPT,
         service=get_azure_openai_service(ModelAndDeploymentName.GPT_41_MINI),
-        plugins=[SearchPlugin()]
-    )
+        plugins=[SearchPlugin(research_task=research_task, session_results=session.results,
+                              evidence=session.evidence, extractor=session.extractor),
+                 ExtractPlugin(session.extractor), BlobPlugin()]
+    ))
+
 
+def credibility_critic(research_task: Optional[str] = None,
+                       session: Optional[ResearchSession] = None) -> ChatCompletionAgent:
+    """Create credibility critic agent for source verification.
 
-def credibility_critic() -> ChatCompletionAgent:
-    """Create credibility critic agent for source verification."""
+    Args:
+        research_task: Optional research task that search results are reranked against
+        session: Research session shared with the other agents (default is shared process-wide)
+    """
+    session = session or _get_default_session()
     logger.info("Creating CredibilityCriticAgent")
-    return ChatCompletionAgent(
+    return get_usage_ledger().register_agent(ChatCompletionAgent(
         name="CredibilityCriticAgent",
         description="Analyzes credibility and coverage of search results using advanced LLM analysis.",
         instructions=CREDIBILITY_CRITIC_PROMPT,
         service=get_azure_openai_service(ModelAndDeploymentName.GPT_41_MINI),
-        plugins=[SearchPlugin()]
-    )
+        plugins=[SearchPlugin(research_task=research_task, session_results=session.results,
+                              evidence=session.evidence, extractor=session.extractor), BlobPlugin()]
+    ))
 
 
 def summarizer() -> ChatCompletionAgent:
     """Create summarizer agent for result compression."""
     logger.info("Creating SummarizerAgent")
-    return ChatCompletionAgent(
+    return get_usage_ledger().register_agent(ChatCompletionAgent(
         name="SummarizerAgent",
         description="Synthesizes large volumes of search results into comprehensive, organized summaries.",
         instructions=SUMMARIZER_PROMPT,
-        service=get_azure_openai_service(ModelAndDeploymentName.GPT_41_MINI)
-    )
+        service=get_azure_openai_service(ModelAndDeploymentName.GPT_41_MINI),
+        plugins=[BlobPlugin()]
+    ))
+
 
+def report_writer(session: Optional[ResearchSession] = None) -> ChatCompletionAgent:
+    """Create report writer agent for markdown report generation.
 
-def report_writer() -> ChatCompletionAgent:
-    """Create report writer agent for markdown report generation."""
+    Args:
+        session: Research session whose evidence is retrieved (default is shared process-wide)
+    """
+    session = session or _get_default_session()
     logger.info("Creating ReportWriterAgent")
-    return ChatCompletionAgent(
+    return get_usage_ledger().register_agent(ChatCompletionAgent(
         name="ReportWriterAgent",
         description="Creates structured markdown reports with proper citations, hyperlinks, and visual content.",
         instructions=REPORT_WRITER_PROMPT,
-        service=get_azure_openai_service(ModelAndDeploymentName.O4_MINI)
-    )
+        service=get_azure_openai_service(ModelAndDeploymentName.O4_MINI),
+        plugins=[EvidencePlugin(session.evidence), BlobPlugin()]
+    ))
 
 
 def translator() -> ChatCompletionAgent:
     """Create translator agent for bilingual translation."""
     logger.info("Creating TranslatorAgent")
-    return ChatCompletionAgent(
+    return get_usage_ledger().register_agent(ChatCompletionAgent(
         name="TranslatorAgent",
         description="Provides natural English-Chinese translation while preserving technical accuracy and formatting.",
         instructions=TRANSLATOR_PROMPT,
         service=get_azure_openai_service(ModelAndDeploymentName.GPT_41)
-    )
+    ))
+
 
+def reflection_critic(session: Optional[ResearchSession] = None) -> ChatCompletionAgent:
+    """Create reflection critic agent for report quality assessment.
 
-def reflection_critic() -> ChatCompletionAgent:
-    """Create reflection critic agent for report quality assessment."""
+    Args:
+        session: Research session whose evidence is retrieved (default is shared process-wide)
+    """
+    session = session or _get_default_session()
     logger.info("Creating ReflectionCriticAgent")
-    return ChatCompletionAgent(
+    return get_usage_ledger().register_agent(ChatCompletionAgent(
         name="ReflectionCriticAgent",
         description="Evaluates report quality for coverage, coherence, citations and provides improvement feedback.",
         instructions=REFLECTION_CRITIC_PROMPT,
-        service=get_azure_openai_service(ModelAndDeploymentName.O4_MINI)
-    )
+        service=get_azure_openai_service(ModelAndDeploymentName.O4_MINI),
+        plugins=[EvidencePlugin(session.evidence), BlobPlugin()]
+    ))
 
 
 def manager() -> ChatCompletionAgent:
     """Create manager agent for orchestrating the research workflow."""
     logger.info("Creating ManagerAgent")
-    return ChatCompletionAgent(
+    return get_usage_ledger().register_agent(ChatCompletionAgent(
         name="ManagerAgent",
         description="Orchestrates the research team and controls workflow quality, human interaction decisions.",
         instructions=MANAGER_PROMPT,
         service=get_azure_openai_service(ModelAndDeploymentName.O4_MINI)
-    )
+    ))
@@ -35,6 +35,10 @@ from semantic_kernel.agents import Agent, ChatCompletionAgent
 from semantic_kernel.agents.runtime import InProcessRuntime
 from semantic_kernel.contents.chat_message_content import ChatMessageContent
 from agents.CustomGroupChatManager import CustomRoundRobinGroupChatManager
+from plugins.search_clients import close_search_clients
+from utils.output_sink import close_output_sinks
+from utils.stream_mux import get_stream_multiplexer
+from utils.service_registry import close_azure_openai_services
 from utils.util import agent_response_callback,streaming_agent_response_callback, get_azure_openai_service,ModelAndDeploymentName,human_response_function
 
 ## reference: 
@@ -66,66 +70,73 @@ async def main():
         exclude_powershell_credential=True
     )
 
-    # connect to Azure AI Project    
-    async with  AIProjectClient(
-        endpoint=os.environ["DEEP_RESEARCH_PROJECT_CONNECTION_STRING"],
-        credential=credential,
-    ) as project_client:
-
-        # get the Bing Connection ID
-        conn_id = (await project_client.connections.get(name=os.environ["DEEP_RESEARCH_BING_RESOURCE_NAME"])).id
-
-
-        # Initialize a Deep Research tool with Bing Connection ID and Deep Research model deployment name
-        deep_research_tool = DeepResearchTool(
-            bing_grounding_connection_id=conn_id,
-            deep_research_model=os.environ["DEEP_RESEARCH_MODEL_DEPLOYMENT_NAME"],
-        )
-
-        # define the deep research agent
-        deep_research_demo_agent_def = await project_client.agents.create_agent(
-                model=os.environ["DEEP_RESEARCH_CHAT_MODEL_DEPLOYMENT_NAME"],
-                name="deep-research-demo-agent-01",
-                description="A helpful agent that assists in researching scientific & technical topics.",
-                instructions="You are a helpful Agent that assists in researching scientific & technical topics.",
-                tools=deep_research_tool.definitions)
-
-        deep_research_demo_agent = AzureAIAgent(
-                client=project_client,
-                definition=deep_research_demo_agent_def)
+    try:
+        # connect to Azure AI Project    
+        async with  AIProjectClient(
+            endpoint=os.environ["DEEP_RESEARCH_PROJECT_CONNECTION_STRING"],
+            credential=credential,
+        ) as project_client:
+
+            # get the Bing Connection ID
+            conn_id = (await project_client.connections.get(name=os.environ["DEEP_RESEARCH_BING_RESOURCE_NAME"])).id
+
+
+            # Initialize a Deep Research tool with Bing Connection ID and Deep Research model deployment name
+            deep_research_tool = DeepResearchTool(
+                bing_grounding_connection_id=conn_id,
+                deep_research_model=os.environ["DEEP_RESEARCH_MODEL_DEPLOYMENT_NAME"],
+            )
+
+            # define the deep research agent
+            deep_research_demo_agent_def = await project_client.agents.create_agent(
+                    model=os.environ["DEEP_RESEARCH_CHAT_MODEL_DEPLOYMENT_NAME"],
+                    name="deep-research-demo-agent-01",
+                    description="A helpful agent that assists in researching scientific & technical topics.",
+                    instructions="You are a helpful Agent that assists in researching scientific & technical topics.",
+                    tools=deep_research_tool.definitions)
+
+            deep_research_demo_agent = AzureAIAgent(
+                    client=project_client,
+                    definition=deep_research_demo_agent_def)
         
-        # define reviewer agent
-        reviewer_agent_definition = await project_client.agents.create_agent(
-                model=os.environ["DEEP_RESEARCH_CHAT_MODEL_DEPLOYMENT_NAME"],
-                name="content-reviewer-agent",
-                description="An agent that reviews content for quality and adherence to guidelines.",
-                instructions='''You are an art director who has opinions about copywriting born of a love for David Ogilvy.
+            # define reviewer agent
+            reviewer_agent_definition = await project_client.agents.create_agent(
+                    model=os.environ["DEEP_RESEARCH_CHAT_MODEL_DEPLOYMENT_NAME"],
+                    name="content-reviewer-agent",
+                    description="An agent that reviews content for quality and adherence to guidelines.",
+                    instructions='''You are an art director who has opinions about copywriting born of a love for David Ogilvy.
                                 The goal is to determine if the given copy is acceptable to print.
                                 If so, state that it is approved.  Do not use the word "approve" unless you are giving approval.
                                 If not, provide insight on how to refine suggested copy without example.''')
         
-        reviewer_agent = AzureAIAgent(
-                client=project_client,
-                definition=reviewer_agent_definition)
+            reviewer_agent = AzureAIAgent(
+                    client=project_client,
+                    definition=reviewer_agent_definition)
         
-        group_chat_orchestration = GroupChatOrchestration(
-                members=[deep_research_demo_agent,reviewer_agent],
-                manager=CustomRoundRobinGroupChatManager(max_rounds=5,human_response_function=human_response_function),
-                agent_response_callback=agent_response_callback
+            group_chat_orchestration = GroupChatOrchestration(
+                    members=[deep_research_demo_agent,reviewer_agent],
+                    manager=CustomRoundRobinGroupChatManager(max_rounds=5,human_response_function=human_response_function),
+                    agent_response_callback=agent_response_callback
+                )
+
+            runtime = InProcessRuntime()
+            runtime.start()
+
+            orchestration_result = await group_chat_orchestration.invoke(
+                task=TASK,
+                runtime=runtime
             )
 
-        runtime = InProcessRuntime()
-        runtime.start()
-
-        orchestration_result = await group_chat_orchestration.invoke(
-            task=TASK,
-            runtime=runtime
-        )
+            value = await orchestration_result.get()
 
-        value = await orchestration_result.get()
-        print(f"***** Final Result *****\n{value}")
+            get_stream_multiplexer().close_all()
+            close_output_sinks()
+            print(f"***** Final Result *****\n{value}")
 
-        await runtime.stop_when_idle()
+            await runtime.stop_when_idle()
+    finally:
+        await close_search_clients()
+        await close_azure_openai_services()
 
         
 
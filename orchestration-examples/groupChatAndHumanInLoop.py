@@ -23,10 +23,15 @@ from semantic_kernel.agents.orchestration.group_chat import (
 )
 
 from plugins.searchPlugin import SearchPlugin
+from plugins.search_clients import close_search_clients
+from utils.service_registry import close_azure_openai_services
 
 from semantic_kernel.agents.runtime import InProcessRuntime
 from semantic_kernel.contents.chat_message_content import ChatMessageContent
 from agents.CustomGroupChatManager import CustomRoundRobinGroupChatManager
+from utils.output_sink import close_output_sinks
+from utils.stream_mux import get_stream_multiplexer
+from utils.usage_ledger import get_usage_ledger, report_usage
 from utils.util import agent_response_callback,streaming_agent_response_callback, get_azure_openai_service,ModelAndDeploymentName,human_response_function
 
 ## reference: 
@@ -86,9 +91,9 @@ def set_up_logging():
 from semantic_kernel.agents import Agent, ChatCompletionAgent
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
 
-searchPlugin = SearchPlugin()
-
 def get_agents() -> list[Agent]:
+    # Every SearchPlugin shares the process-wide pooled Tavily client
+    searchPlugin = SearchPlugin()
     researcher = ChatCompletionAgent(
         name="Researcher",
         description="A researcher agent.",
@@ -111,7 +116,9 @@ def get_agents() -> list[Agent]:
         ),
         service=get_azure_openai_service(ModelAndDeploymentName.GPT_41_MINI),
     )
-    return [researcher, reviewer]
+    # Attribute each agent's model requests and tool calls in the usage report
+    ledger = get_usage_ledger()
+    return [ledger.register_agent(researcher), ledger.register_agent(reviewer)]
 
 from semantic_kernel.contents import ChatMessageContent
 
@@ -136,6 +143,8 @@ async def main():
             agent_response_callback=agent_response_callback
         )
 
+        run_id = get_usage_ledger().start_run()
+
         runtime = InProcessRuntime()
         runtime.start()
 
@@ -145,9 +154,15 @@ async def main():
         )
 
         value = await orchestration_result.get()
+
+        get_stream_multiplexer().close_all()
+        close_output_sinks()
         print(f"***** Final Result *****\n{value}")
+        print(report_usage(run_id))
 
         await runtime.stop_when_idle()
+        await close_search_clients()
+        await close_azure_openai_services()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -26,16 +26,21 @@ from opentelemetry.semconv.resource import ResourceAttributes
 
 from semantic_kernel.contents import  ChatMessageContent
 
-from agents.agent_factory import (credibility_critic, data_feeder,
+from agents.agent_factory import (ResearchSession, credibility_critic, data_feeder,
                                reflection_critic, report_writer, summarizer,
                                translator, manager)
 
 from plugins.searchPlugin import SearchPlugin
+from plugins.search_clients import close_search_clients
+from utils.service_registry import close_azure_openai_services
 
 from semantic_kernel.agents.runtime import InProcessRuntime
 from semantic_kernel.contents.chat_message_content import ChatMessageContent
 from agents.CustomGroupChatManager import CustomRoundRobinGroupChatManager
-from utils.util import agent_response_callback,streaming_agent_response_callback, get_azure_openai_service,ModelAndDeploymentName,human_response_function
+from utils.output_sink import close_output_sinks
+from utils.stream_mux import get_stream_multiplexer
+from utils.usage_ledger import get_usage_ledger, report_usage
+from utils.util import agent_response_callback,make_streaming_callback, get_azure_openai_service,ModelAndDeploymentName,human_response_function
 
 ## reference: 
 # https://github.com/microsoft/semantic-kernel/blob/main/python/samples/getting_started_with_agents/multi_agent_orchestration/step4b_handoff_streaming_agent_response_callback.py
@@ -132,14 +137,15 @@ async def main():
 
     tracer = trace.get_tracer(__name__)
     with tracer.start_as_current_span("azure_ai_agent_deep_research_by_groupChat_human_in_loop-main"):
+        session = ResearchSession()
 
         managerAgent = manager()
-        dataFeederAgent = data_feeder() 
-        credibilityCriticAgent = credibility_critic()
+        dataFeederAgent = data_feeder(TASK, session) 
+        credibilityCriticAgent = credibility_critic(TASK, session)
         summarizerAgent = summarizer()
-        reportWriterAgent = report_writer()
+        reportWriterAgent = report_writer(session)
         translatorAgent = translator()
-        reflectionCriticAgent = reflection_critic()
+        reflectionCriticAgent = reflection_critic(session)
 
         members = [
             managerAgent,
@@ -193,11 +199,13 @@ async def main():
         handoff_orchestration = HandoffOrchestration(
             members=members,
             handoffs=handoffs,
-            streaming_agent_response_callback=streaming_agent_response_callback,
+            streaming_agent_response_callback=make_streaming_callback("handoff"),
             agent_response_callback=agent_response_callback,
             human_response_function=human_response_function
         )
 
+        run_id = get_usage_ledger().start_run()
+
         runtime = InProcessRuntime()
         runtime.start()
 
@@ -208,9 +216,15 @@ async def main():
         )
 
         value = await orchestration_result.get()
+
+        get_stream_multiplexer().close_all()
+        close_output_sinks()
         print(f"***** Final Result *****\n{value}")
+        print(report_usage(run_id))
 
         await runtime.stop_when_idle()
+        await close_search_clients()
+        await close_azure_openai_services()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,144 @@
+"""
+Coverage-driven escalation of searches for one outline section.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from plugins.credibility import COVERAGE_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# Source presets tried, in order, once the plain query is exhausted
+ESCALATION_PRESETS = ("official_docs", "academic", "news")
+
+
+def build_escalation_plan(
+    query: str,
+    base_top_k: int = 5,
+    sub_queries: Optional[List[str]] = None,
+    max_top_k: int = 20,
+    presets: tuple = ESCALATION_PRESETS
+) -> List[Dict[str, Any]]:
+    """
+    Order search steps from cheapest to most expensive.
+
+    The plan starts with a basic search, then asks for more results, then
+    switches to advanced depth, then runs the given sub-queries and finally
+    the query restricted to source presets.
+
+    Args:
+        query: Main query of the section
+        base_top_k: Results requested by the first step
+        sub_queries: Additional queries tried after the main query
+        max_top_k: Upper bound on results per step
+        presets: Source presets tried last
+
+    Returns:
+        List[Dict[str, Any]]: Steps with query, top_k, search_depth and optional source_types
+    """
+    wide = min(max(base_top_k * 2, base_top_k + 1), max_top_k)
+    plan = [
+        {"query": query, "top_k": base_top_k, "search_depth": "basic"},
+        {"query": query, "top_k": wide, "search_depth": "basic"},
+        {"query": query, "top_k": wide, "search_depth": "advanced"},
+    ]
+    for sub_query in dict.fromkeys(q for q in (sub_queries or []) if q and q != query):
+        plan.append({"query": sub_query, "top_k": base_top_k, "search_depth": "advanced"})
+    for preset in presets:
+        plan.append({"query": query, "top_k": base_top_k, "search_depth": "advanced", "source_types": [preset]})
+    return plan
+
+
+def _merge_first(merged: Dict[str, Dict[str, Any]], results: List[Dict[str, Any]], query: str) -> None:
+    for result in results:
+        merged.setdefault(result.get("url") or repr(sorted(result.items())), result)
+
+
+class AdaptiveSearchController:
+    """Run escalation steps until measured coverage reaches the threshold.
+
+    Each step's results are merged into the section's result set and the
+    coverage of the whole set is measured; the controller stops at the first
+    step that meets the threshold. Steps that cannot add anything are
+    skipped: asking for more results of a query that already returned fewer
+    than requested, at the same depth, is pointless.
+    """
+
+    def __init__(
+        self,
+        search: Callable[[Dict[str, Any]], Awaitable[List[Dict[str, Any]]]],
+        measure: Callable[[List[Dict[str, Any]]], float],
+        merge: Optional[Callable[[Dict[str, Dict[str, Any]], List[Dict[str, Any]], str], None]] = None,
+        threshold: float = COVERAGE_THRESHOLD,
+        max_steps: int = 6
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            search: Coroutine running one step and returning processed results
+            measure: Function returning the coverage of a result set
+            merge: Function merging step results into the accumulated results keyed by URL
+                (default keeps the first copy)
+            threshold: Coverage at which escalation stops
+            max_steps: Maximum searches per section
+        """
+        self.search = search
+        self.measure = measure
+        self.merge = merge or _merge_first
+        self.threshold = threshold
+        self.max_steps = max_steps
+
+    async def run(self, plan: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Execute the plan until coverage is met or the step budget is spent.
+
+        Args:
+            plan: Steps as built by build_escalation_plan
+
+        Returns:
+            Dict[str, Any]: Final coverage, whether it met the threshold, per-step
+                records and the accumulated results
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        steps: List[Dict[str, Any]] = []
+        exhausted = set()
+        coverage = 0.0
+
+        for step in plan:
+            if len(steps) >= self.max_steps or coverage >= self.threshold:
+                break
+            if (step["query"], step["search_depth"], tuple(step.get("source_types") or ())) in exhausted:
+                continue
+            record = dict(step)
+            try:
+                results = await self.search(step)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Adaptive search step failed for '{step['query']}': {e}")
+                record["error"] = str(e)
+                steps.append(record)
+                continue
+
+            valid = [r for r in results if "error" not in r]
+            if len(valid) < step["top_k"]:
+                exhausted.add((step["query"], step["search_depth"], tuple(step.get("source_types") or ())))
+            before = len(merged)
+            self.merge(merged, valid, step["query"])
+            coverage = self.measure(list(merged.values()))
+            record.update({"new_results": len(merged) - before, "coverage": round(coverage, 3)})
+            steps.append(record)
+            logger.info(
+                f"Adaptive search step {len(steps)}: '{step['query']}' top_k={step['top_k']} "
+                f"depth={step['search_depth']} sources={step.get('source_types')} -> coverage {coverage:.3f}"
+            )
+
+        return {
+            "coverage": round(coverage, 3),
+            "threshold": self.threshold,
+            "met": coverage >= self.threshold,
+            "steps": steps,
+            "results": list(merged.values()),
+        }
@@ -0,0 +1,67 @@
+"""
+Blob plugin for reading large tool results by handle.
+"""
+import json
+import logging
+from typing import Optional
+
+from semantic_kernel.functions import kernel_function
+
+from plugins.blob_store import BlobStore, get_blob_store
+
+logger = logging.getLogger(__name__)
+
+# Default slice sizes: list items, or characters for non-list content
+DEFAULT_ITEMS = 5
+DEFAULT_CHARS = 4000
+
+
+class BlobPlugin:
+    """Plugin for reading slices of tool results stored out of band."""
+
+    def __init__(self, store: Optional[BlobStore] = None):
+        """
+        Initialize the blob plugin.
+
+        Args:
+            store: Optional blob store (default is shared process-wide)
+        """
+        self.store = store if store is not None else get_blob_store()
+        logger.info("BlobPlugin initialized")
+
+    @kernel_function(
+        name="read_blob",
+        description=(
+            "Read part of a large tool result that was replaced by a blob handle "
+            "(e.g. {\"blob\": \"blob:...\"}). For list results, start and count select items; "
+            "otherwise they select characters."
+        )
+    )
+    def read_blob(self, handle: str, start: Optional[int] = None, count: Optional[int] = None) -> str:
+        """
+        Return a slice of a stored result.
+
+        Args:
+            handle: Blob handle from a tool result
+            start: First item (or character) to return (default 0)
+            count: Number of items (default 5) or characters (default 4000)
+
+        Returns:
+            str: JSON list of the selected items, or the selected text
+        """
+        content = self.store.get(handle)
+        if content is None:
+            return json.dumps([{"error": f"Unknown blob handle: {handle}"}], ensure_ascii=False)
+        start = max(0, start or 0)
+        try:
+            parsed = json.loads(content)
+        except ValueError:
+            parsed = None
+
+        if isinstance(parsed, list):
+            items = parsed[start:start + (count or DEFAULT_ITEMS)]
+            logger.info(f"Read items {start}-{start + len(items)} of {len(parsed)} from {handle}")
+            return json.dumps(items, ensure_ascii=False, separators=(",", ":"))
+        text = content[start:start + (count or DEFAULT_CHARS)]
+        logger.info(f"Read {len(text)} of {len(content)} chars from {handle}")
+        return text
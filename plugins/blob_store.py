@@ -0,0 +1,166 @@
+"""
+Content-addressed store for large tool results.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+HANDLE_PREFIX = "blob:"
+# Hex digits of the SHA-256 digest kept in a handle
+HANDLE_DIGITS = 16
+
+
+class BlobStore:
+    """Store blobs by content hash, in memory or under a directory.
+
+    Identical results map to the same handle, so re-running a search never
+    stores a second copy. The in-memory mode keeps the most recent
+    ``max_entries`` blobs.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_entries: int = 512):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory for blob files (default keeps blobs in memory)
+            max_entries: Maximum blobs kept in memory mode
+        """
+        self.root = root
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        if root:
+            os.makedirs(root, exist_ok=True)
+        logger.info(f"BlobStore initialized {'at ' + root if root else 'in memory'}")
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}.blob")
+
+    def put(self, content: str) -> str:
+        """
+        Store content and return its handle.
+
+        Args:
+            content: Text to store
+
+        Returns:
+            str: Handle such as "blob:3f2a9c0d1b7e4a55"
+        """
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:HANDLE_DIGITS]
+        if self.root:
+            path = self._path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write then rename so readers never see a partial blob
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+        else:
+            with self._lock:
+                self._memory[digest] = content
+                self._memory.move_to_end(digest)
+                while len(self._memory) > self.max_entries:
+                    self._memory.popitem(last=False)
+        return f"{HANDLE_PREFIX}{digest}"
+
+    def get(self, handle: str) -> Optional[str]:
+        """Return the content behind a handle, or None if it is unknown."""
+        digest = handle.strip()
+        if digest.startswith(HANDLE_PREFIX):
+            digest = digest[len(HANDLE_PREFIX):]
+        if not digest or not all(c in "0123456789abcdef" for c in digest):
+            return None
+        if self.root:
+            try:
+                with open(self._path(digest), encoding="utf-8") as f:
+                    return f.read()
+            except OSError:
+                return None
+        with self._lock:
+            return self._memory.get(digest)
+
+    def clear(self) -> None:
+        """Drop blobs held in memory (files on disk are left in place)."""
+        with self._lock:
+            self._memory.clear()
+
+
+def summarize_results(results: List[Dict[str, Any]], max_titles: int = 3) -> str:
+    """
+    Build a one-line summary of search results.
+
+    Args:
+        results: Processed search results
+        max_titles: Number of leading titles to mention
+
+    Returns:
+        str: Summary such as "8 results (2 errors) from 6 domains; top: ..."
+    """
+    hits = [r for r in results if "error" not in r]
+    errors = len(results) - len(hits)
+    domains = {r.get("domain") or urlparse(r.get("url", "")).netloc for r in hits}
+    domains.discard("")
+    images = sum(len(r.get("images") or []) for r in hits)
+    summary = f"{len(hits)} results"
+    if errors:
+        summary += f" ({errors} errors)"
+    summary += f" from {len(domains)} domains"
+    if images:
+        summary += f", {images} images"
+    titles = [r.get("title") for r in hits if r.get("title")][:max_titles]
+    if titles:
+        summary += "; top: " + " | ".join(titles)
+    return summary
+
+
+def offload_if_large(output: str, summary: str, threshold: int, store: Optional[BlobStore] = None) -> str:
+    """
+    Replace a large tool output with a blob handle and a summary line.
+
+    Args:
+        output: Serialized tool output
+        summary: One-line description of the output
+        threshold: Size in characters above which the output is offloaded (0 disables)
+        store: Blob store (default is shared process-wide)
+
+    Returns:
+        str: The output itself, or a small JSON object with the handle and summary
+    """
+    if threshold <= 0 or len(output) <= threshold:
+        return output
+    store = store or get_blob_store()
+    handle = store.put(output)
+    try:
+        parsed = json.loads(output)
+        items = len(parsed) if isinstance(parsed, list) else None
+    except ValueError:
+        items = None
+    reference = {"blob": handle, "chars": len(output), "summary": summary}
+    if items is not None:
+        reference["items"] = items
+    reference["hint"] = "Call read_blob(handle, start, count) to read items from this result."
+    logger.info(f"Offloaded {len(output)} chars of tool output to {handle}")
+    return json.dumps(reference, ensure_ascii=False, separators=(",", ":"))
+
+
+_store: Optional[BlobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """Return the process-wide blob store (BLOB_STORE_PATH, or in memory if unset)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BlobStore(os.getenv("BLOB_STORE_PATH") or None)
+        return _store
@@ -0,0 +1,191 @@
+"""
+Deterministic credibility pre-scoring of search results.
+"""
+import datetime as dt
+import logging
+import math
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Source tiers from CREDIBILITY_CRITIC_PROMPT. Keys are domains or domain suffixes;
+# a host matches the longest suffix present (e.g. "news.bbc.co.uk" -> "bbc.co.uk").
+SOURCE_TIERS: Dict[str, int] = {
+    # Tier 1: wire services and newspapers of record
+    "reuters.com": 1, "bloomberg.com": 1, "bbc.com": 1, "bbc.co.uk": 1, "apnews.com": 1,
+    "theguardian.com": 1, "nytimes.com": 1, "wsj.com": 1,
+    # Tier 2: major broadcasters and national papers
+    "cnn.com": 2, "npr.org": 2, "abcnews.go.com": 2, "cbsnews.com": 2, "nbcnews.com": 2,
+    "thetimes.co.uk": 2, "thetimes.com": 2,
+    # Tier 3: academic and government sources
+    "edu": 3, "gov": 3, "mil": 3, "ac.uk": 3, "gov.uk": 3, "edu.cn": 3, "gov.cn": 3, "ac.jp": 3,
+    "go.jp": 3, "edu.au": 3, "gov.au": 3, "europa.eu": 3, "arxiv.org": 3,
+    "pubmed.ncbi.nlm.nih.gov": 3, "nature.com": 3, "science.org": 3, "acm.org": 3, "ieee.org": 3,
+}
+
+# Credibility weight per tier; tier 0 is reserved for preferred authoritative sources
+TIER_SCORES: Dict[Optional[int], float] = {0: 1.0, 1: 0.95, 2: 0.8, 3: 0.85, None: 0.4}
+
+# Results at least this credible count towards coverage
+CREDIBLE_THRESHOLD = 0.75
+
+# Coverage at which CREDIBILITY_CRITIC_PROMPT considers a topic sufficiently sourced
+COVERAGE_THRESHOLD = 0.75
+
+
+def _default_extract_domain(url: str) -> str:
+    try:
+        return urlparse(url).netloc
+    except Exception:
+        return ""
+
+
+def _parse_date(value: Any) -> Optional[dt.datetime]:
+    """Parse the date formats Tavily returns for published_date."""
+    if not value or not isinstance(value, str):
+        return None
+    for parser in (dt.datetime.fromisoformat,
+                   lambda v: dt.datetime.strptime(v, "%a, %d %b %Y %H:%M:%S %Z")):
+        try:
+            parsed = parser(value.strip())
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=dt.timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+class CredibilityScorer:
+    """Attach tier, recency and credibility scores to results and estimate coverage.
+
+    The tier table is compiled once into a suffix map, so scoring a result is a
+    handful of dictionary lookups on the host's labels.
+    """
+
+    def __init__(
+        self,
+        extract_domain: Optional[Callable[[str], str]] = None,
+        preferred_domains: Iterable[str] = (),
+        recency_half_life_days: float = 365.0,
+        target_sources: int = 8
+    ):
+        """
+        Initialize the scorer.
+
+        Args:
+            extract_domain: Function mapping a URL to its host (e.g. SearchPlugin._extract_domain)
+            preferred_domains: Domains the task names as authoritative; scored above tier 1
+            recency_half_life_days: Age at which the recency score halves
+            target_sources: Credible, distinct-domain sources needed for full coverage
+        """
+        self.extract_domain = extract_domain or _default_extract_domain
+        self.recency_half_life_days = recency_half_life_days
+        self.target_sources = target_sources
+        self._tiers = dict(SOURCE_TIERS)
+        for domain in preferred_domains:
+            self._tiers[domain.lower().lstrip(".")] = 0
+
+    def tier_for(self, host: str) -> Optional[int]:
+        """Return the tier of a host by longest matching suffix, or None if unknown."""
+        labels = host.lower().split(":")[0].strip(".").split(".")
+        for start in range(len(labels)):
+            tier = self._tiers.get(".".join(labels[start:]))
+            if tier is not None:
+                return tier
+        return None
+
+    def recency(self, published_date: Any, now: Optional[dt.datetime] = None) -> Optional[float]:
+        """Return a 0-1 recency score with exponential decay, or None if the date is unknown."""
+        published = _parse_date(published_date)
+        if published is None:
+            return None
+        now = now or dt.datetime.now(dt.timezone.utc)
+        age_days = max(0.0, (now - published).total_seconds() / 86400)
+        return round(math.pow(0.5, age_days / self.recency_half_life_days), 3)
+
+    def score_result(self, result: Dict[str, Any], now: Optional[dt.datetime] = None) -> Dict[str, Any]:
+        """
+        Score a single result.
+
+        Args:
+            result: Search result with at least a url
+            now: Reference time for recency
+
+        Returns:
+            Dict[str, Any]: tier, credibility, recency and needs_review
+        """
+        host = result.get("domain") or self.extract_domain(result.get("url", ""))
+        tier = self.tier_for(host) if host else None
+        recency = self.recency(result.get("published_date"), now)
+        credibility = TIER_SCORES[tier]
+        if recency is not None:
+            # Recency adjusts credibility by at most ten percent
+            credibility *= 0.9 + 0.1 * recency
+        return {
+            "domain": host,
+            "tier": tier,
+            "credibility": round(credibility, 3),
+            "recency": recency,
+            "needs_review": tier is None,
+        }
+
+    def annotate(self, results: List[Dict[str, Any]], now: Optional[dt.datetime] = None) -> List[Dict[str, Any]]:
+        """Add tier and credibility fields to each result in place and return the list."""
+        for result in results:
+            if "error" in result or result.get("seen_before") or not result.get("url"):
+                continue
+            score = self.score_result(result, now)
+            result["tier"] = score["tier"]
+            result["credibility"] = score["credibility"]
+        return results
+
+    def assess(self, results: List[Dict[str, Any]], now: Optional[dt.datetime] = None) -> Dict[str, Any]:
+        """
+        Score results and estimate coverage.
+
+        Coverage blends average credibility (50%), the share of distinct domains
+        (25%) and how close the number of credible distinct domains is to
+        ``target_sources`` (25%).
+
+        Args:
+            results: Search results
+            now: Reference time for recency
+
+        Returns:
+            Dict[str, Any]: Per-result scores, coverage and supporting metrics
+        """
+        scored = [
+            {"url": r.get("url", ""), **self.score_result(r, now)}
+            for r in results
+            if r.get("url") and "error" not in r
+        ]
+        if not scored:
+            return {"coverage": 0.0, "results": [], "metrics": {"sources": 0}}
+
+        domains = {s["domain"] for s in scored if s["domain"]}
+        credible_domains = {s["domain"] for s in scored if s["domain"] and s["credibility"] >= CREDIBLE_THRESHOLD}
+        average_credibility = sum(s["credibility"] for s in scored) / len(scored)
+        diversity = len(domains) / len(scored)
+        depth = min(1.0, len(credible_domains) / self.target_sources)
+        coverage = 0.5 * average_credibility + 0.25 * diversity + 0.25 * depth
+        dated = [s["recency"] for s in scored if s["recency"] is not None]
+
+        tier_counts: Dict[str, int] = {}
+        for s in scored:
+            label = "unknown" if s["tier"] is None else f"tier_{s['tier']}"
+            tier_counts[label] = tier_counts.get(label, 0) + 1
+
+        return {
+            "coverage": round(coverage, 3),
+            "results": scored,
+            "metrics": {
+                "sources": len(scored),
+                "distinct_domains": len(domains),
+                "credible_domains": len(credible_domains),
+                "average_credibility": round(average_credibility, 3),
+                "domain_diversity": round(diversity, 3),
+                "average_recency": round(sum(dated) / len(dated), 3) if dated else None,
+                "tiers": tier_counts,
+                "needs_review": sum(1 for s in scored if s["needs_review"]),
+            },
+        }
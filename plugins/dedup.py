@@ -0,0 +1,257 @@
+"""
+Session-level deduplication of search results.
+"""
+import hashlib
+import logging
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "ref_url", "spm", "_ga", "_gl", "cmpid", "ncid", "ocid", "sr_share",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_")
+
+# Host prefixes used by mobile and AMP mirrors of the same article
+MIRROR_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def clean_url(url: str) -> str:
+    """
+    Remove tracking parameters and fragments from a URL.
+
+    Args:
+        url: URL as returned by the search backend
+
+    Returns:
+        str: URL safe to cite, pointing at the same page
+    """
+    try:
+        parsed = urlparse(url.strip())
+    except Exception:
+        return url
+    if not parsed.netloc:
+        return url
+    query = [
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlunparse(parsed._replace(query=urlencode(query), fragment=""))
+
+
+def canonical_url_key(url: str) -> str:
+    """
+    Build a matching key that treats syndication variants of a URL as equal.
+
+    Scheme, mirror host prefixes, default ports, trailing slashes, AMP suffixes,
+    tracking parameters and parameter order are ignored.
+
+    Args:
+        url: URL to canonicalize
+
+    Returns:
+        str: Canonical key (not meant to be displayed)
+    """
+    cleaned = clean_url(url)
+    try:
+        parsed = urlparse(cleaned)
+    except Exception:
+        return cleaned.lower()
+    if not parsed.netloc:
+        return cleaned.lower()
+
+    host = (parsed.hostname or "").lower()
+    for prefix in MIRROR_HOST_PREFIXES:
+        # "amp.dev" and "m.me" are sites of their own, not mirrors of "dev" or "me"
+        if host.startswith(prefix) and "." in host[len(prefix):]:
+            host = host[len(prefix):]
+            break
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+
+    path = re.sub(r"/+", "/", parsed.path or "/")
+    path = re.sub(r"(/amp|/index\.html?)$", "", path)
+    path = path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def simhash(text: str, shingle_size: int = 3) -> Optional[int]:
+    """
+    Compute a 64-bit SimHash of word shingles.
+
+    Args:
+        text: Text to fingerprint
+        shingle_size: Number of words per shingle
+
+    Returns:
+        Optional[int]: Fingerprint, or None if the text is too short to compare
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < shingle_size:
+        return None
+    weights = [0] * SIMHASH_BITS
+    for i in range(len(words) - shingle_size + 1):
+        shingle = " ".join(words[i:i + shingle_size])
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Return the number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+class ResultDeduplicator:
+    """Drop repeated and near-duplicate results across every search in a session.
+
+    Results are matched on canonical URL and on SimHash fingerprints of their
+    snippets. Fingerprints are split into bands so candidates are found by bucket
+    lookup; with ``max_distance`` below the band count, any pair within the
+    distance shares at least one band, keeping the stage linear in results.
+    Merged hits keep their provenance in ``also_at`` and ``queries``.
+    """
+
+    def __init__(self, max_distance: int = 3, min_words: int = 12):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            max_distance: Maximum Hamming distance for snippets to count as near-duplicates
+            min_words: Minimum snippet length in words before fingerprints are compared
+        """
+        if max_distance >= SIMHASH_BANDS:
+            raise ValueError("max_distance must be smaller than the number of SimHash bands")
+        self.max_distance = max_distance
+        self.min_words = min_words
+        self.duplicates = 0
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._aliases: Dict[str, str] = {}
+        self._fingerprints: Dict[str, int] = {}
+        self._bands: List[Dict[int, List[str]]] = [{} for _ in range(SIMHASH_BANDS)]
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        mask = (1 << _BAND_BITS) - 1
+        return [(fingerprint >> (band * _BAND_BITS)) & mask for band in range(SIMHASH_BANDS)]
+
+    def _find_near_duplicate(self, fingerprint: Optional[int]) -> Optional[str]:
+        """Return the key of a previously seen result with a near-identical snippet."""
+        if fingerprint is None:
+            return None
+        for band, value in enumerate(self._band_values(fingerprint)):
+            for key in self._bands[band].get(value, ()):
+                if hamming_distance(fingerprint, self._fingerprints[key]) <= self.max_distance:
+                    return key
+        return None
+
+    def _register(self, key: str, fingerprint: Optional[int], record: Dict[str, Any]) -> None:
+        self._records[key] = record
+        if fingerprint is None:
+            return
+        self._fingerprints[key] = fingerprint
+        for band, value in enumerate(self._band_values(fingerprint)):
+            self._bands[band].setdefault(value, []).append(key)
+
+    def _fingerprint(self, snippet: str) -> Optional[int]:
+        if len(_WORD_RE.findall(snippet)) < self.min_words:
+            return None
+        return simhash(snippet)
+
+    def dedupe(self, results: List[Dict[str, Any]], query: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Remove duplicates from a batch of results.
+
+        Duplicates within the batch are merged into the first occurrence. Hits
+        already returned by an earlier search in the session are replaced by a
+        short ``seen_before`` reference instead of being repeated in full.
+
+        Args:
+            results: Processed search results (error entries pass through)
+            query: Query that produced the results, for provenance
+
+        Returns:
+            List[Dict[str, Any]]: Deduplicated results
+        """
+        output: List[Dict[str, Any]] = []
+        in_batch: Dict[str, Dict[str, Any]] = {}
+        referenced = set()
+
+        for result in results:
+            if "error" in result or not result.get("url"):
+                output.append(result)
+                continue
+
+            url = clean_url(result["url"])
+            url_key = canonical_url_key(url)
+            key = self._aliases.get(url_key, url_key)
+            queries = result.get("queries") or ([query] if query else [])
+            fingerprint = None
+            if key not in self._records:
+                fingerprint = self._fingerprint(result.get("snippet", ""))
+                near = self._find_near_duplicate(fingerprint)
+                if near is not None:
+                    key = near
+
+            record = self._records.get(key)
+            if record is None:
+                item = {**result, "url": url}
+                self._register(key, fingerprint, {"url": url, "title": result.get("title", ""), "also_at": [], "queries": list(queries)})
+                in_batch[key] = item
+                output.append(item)
+                continue
+
+            self.duplicates += 1
+            self._aliases[url_key] = key
+            self._add_provenance(record, url, queries)
+            if key in in_batch:
+                self._merge_into(in_batch[key], result, url, queries)
+            elif key not in referenced:
+                referenced.add(key)
+                output.append({"url": record["url"], "title": record["title"], "seen_before": True})
+
+        if len(output) < len(results):
+            logger.info(f"Deduplicated search results: {len(results)} in, {len(output)} out")
+        return output
+
+    def _add_provenance(self, record: Dict[str, Any], url: str, queries: List[str]) -> None:
+        if url != record["url"] and url not in record["also_at"]:
+            record["also_at"].append(url)
+        for q in queries:
+            if q not in record["queries"]:
+                record["queries"].append(q)
+
+    def _merge_into(self, item: Dict[str, Any], duplicate: Dict[str, Any], url: str, queries: List[str]) -> None:
+        """Fold a duplicate into the representative returned in the same batch."""
+        if url != item["url"]:
+            also_at = item.setdefault("also_at", [])
+            if url not in also_at:
+                also_at.append(url)
+        if queries:
+            merged_queries = item.setdefault("queries", [])
+            for q in queries:
+                if q not in merged_queries:
+                    merged_queries.append(q)
+        if (duplicate.get("score") or 0.0) > (item.get("score") or 0.0):
+            item["score"] = duplicate["score"]
+        if duplicate.get("images") and not item.get("images"):
+            item["images"] = duplicate["images"]
+
+    def provenance(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return every URL and query that produced the result at ``url``."""
+        url_key = canonical_url_key(url)
+        return self._records.get(self._aliases.get(url_key, url_key))
@@ -0,0 +1,251 @@
+"""
+In-process vector store of evidence passages (search snippets and page chunks).
+"""
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Protocol
+
+import numpy as np
+
+from plugins.rerank import tokenize
+
+logger = logging.getLogger(__name__)
+
+
+class Embedder(Protocol):
+    """Anything that maps texts to fixed-size vectors."""
+
+    dimension: int
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Return a len(texts) x dimension matrix."""
+        ...
+
+
+class HashingEmbedder:
+    """Local, dependency-free embedder using the hashing trick.
+
+    Terms (words and CJK bigrams) and adjacent term pairs are hashed into a
+    fixed number of signed buckets, weighted by log term frequency and
+    L2-normalized, so cosine similarity reduces to a dot product.
+    """
+
+    def __init__(self, dimension: int = 1024):
+        """
+        Initialize the embedder.
+
+        Args:
+            dimension: Number of hash buckets
+        """
+        self.dimension = dimension
+        self._buckets: Dict[str, tuple] = {}
+
+    def _bucket(self, feature: str) -> tuple:
+        bucket = self._buckets.get(feature)
+        if bucket is None:
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+            bucket = (digest % self.dimension, 1.0 if digest >> 63 else -1.0)
+            if len(self._buckets) < 200_000:
+                self._buckets[feature] = bucket
+        return bucket
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: len(texts) x dimension matrix of unit vectors (zero rows for empty texts)
+        """
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            terms = tokenize(text)
+            features = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+            for feature in features:
+                column, sign = self._bucket(feature)
+                vectors[row, column] += sign
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-9)
+
+
+class EvidenceStore:
+    """Thread-safe store of passages and their embeddings in one NumPy matrix.
+
+    Rows are appended into a preallocated matrix that doubles when full, and a
+    query is scored against every passage with a single matrix-vector product.
+    With a capacity limit, the oldest passages are evicted first.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        initial_capacity: int = 256,
+        max_passages: Optional[int] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            embedder: Embedder for passages and queries (default HashingEmbedder)
+            initial_capacity: Rows preallocated before the first resize
+            max_passages: Maximum number of passages kept (None or <= 0 is unbounded)
+        """
+        self.embedder = embedder or HashingEmbedder()
+        self.max_passages = max_passages if max_passages and max_passages > 0 else None
+        self._matrix = np.zeros((initial_capacity, self.embedder.dimension), dtype=np.float32)
+        self._passages: List[Dict[str, Any]] = []
+        self._keys: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._passages)
+
+    @staticmethod
+    def _key(passage: Dict[str, Any]) -> str:
+        payload = f"{passage.get('url', '')}\n{passage.get('text', '')}"
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def add(self, passages: List[Dict[str, Any]]) -> int:
+        """
+        Add passages, skipping ones already stored.
+
+        Args:
+            passages: Dicts with at least ``text``; ``url``, ``title``, ``source``
+                and ``chunk`` are kept as metadata
+
+        Returns:
+            int: Number of passages added
+        """
+        with self._lock:
+            fresh = {}
+            for passage in passages:
+                if not (passage.get("text") or "").strip():
+                    continue
+                key = self._key(passage)
+                if key not in self._keys and key not in fresh:
+                    fresh[key] = passage
+        if not fresh:
+            return 0
+
+        vectors = self.embedder.embed([p["text"] for p in fresh.values()])
+        with self._lock:
+            added = 0
+            for (key, passage), vector in zip(fresh.items(), vectors):
+                if key in self._keys:  # added concurrently while embedding
+                    continue
+                row = len(self._passages)
+                if row == self._matrix.shape[0]:
+                    grown = np.zeros((row * 2, self._matrix.shape[1]), dtype=np.float32)
+                    grown[:row] = self._matrix
+                    self._matrix = grown
+                self._matrix[row] = vector
+                self._passages.append({k: passage[k] for k in ("url", "title", "text", "source", "chunk") if k in passage})
+                self._keys[key] = row
+                added += 1
+            if self.max_passages and len(self._passages) > self.max_passages:
+                self._evict(len(self._passages) - self.max_passages)
+        if added:
+            logger.info(f"Evidence store: added {added} passage(s), {len(self._passages)} total")
+        return added
+
+    def _evict(self, count: int) -> None:
+        """Drop the oldest passages; the caller holds the lock."""
+        kept = len(self._passages) - count
+        self._matrix[:kept] = self._matrix[count:count + kept]
+        self._matrix[kept:count + kept] = 0
+        self._passages = self._passages[count:]
+        self._keys = {self._key(p): row for row, p in enumerate(self._passages)}
+        logger.debug(f"Evidence store: evicted {count} oldest passage(s)")
+
+    def add_results(self, results: List[Dict[str, Any]]) -> int:
+        """Add the snippets of processed search results."""
+        return self.add([
+            {"url": r["url"], "title": r.get("title", ""), "text": r.get("snippet", ""), "source": "snippet"}
+            for r in results
+            if r.get("url") and "error" not in r and not r.get("seen_before")
+        ])
+
+    def add_chunks(self, chunks: List[Dict[str, Any]], title: str = "") -> int:
+        """Add page chunks as returned by ChunkStore.get_chunks."""
+        return self.add([
+            {"url": c["url"], "title": title, "text": c["text"], "source": "page", "chunk": c["chunk"]}
+            for c in chunks
+        ])
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        urls: Optional[List[str]] = None,
+        min_score: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the passages most similar to a query.
+
+        Args:
+            query: Query text
+            top_k: Maximum number of passages
+            urls: Optional sources to restrict the search to
+            min_score: Minimum cosine similarity
+
+        Returns:
+            List[Dict[str, Any]]: Passages with a ``score`` field, best first
+        """
+        query_vector = self.embedder.embed([query])[0]
+        with self._lock:
+            count = len(self._passages)
+            if count == 0 or top_k <= 0:
+                return []
+            scores = self._matrix[:count] @ query_vector
+            passages = self._passages[:count]
+        if urls:
+            allowed = set(urls)
+            mask = np.fromiter((p.get("url") in allowed for p in passages), dtype=bool, count=count)
+            scores = np.where(mask, scores, -np.inf)
+
+        k = min(top_k, count)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [
+            {**passages[i], "score": round(float(scores[i]), 3)}
+            for i in best
+            if np.isfinite(scores[i]) and scores[i] > min_score
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of passages and distinct sources."""
+        with self._lock:
+            return {"passages": len(self._passages), "sources": len({p.get("url") for p in self._passages})}
+
+    def clear(self) -> None:
+        """Remove every passage."""
+        with self._lock:
+            self._matrix = np.zeros_like(self._matrix)
+            self._passages = []
+            self._keys = {}
+
+
+_store: Optional[EvidenceStore] = None
+_store_lock = threading.Lock()
+
+
+def create_evidence_store() -> EvidenceStore:
+    """Return a new, empty evidence store configured from the environment."""
+    return EvidenceStore(
+        HashingEmbedder(int(os.getenv("EVIDENCE_EMBEDDING_DIM", "1024"))),
+        max_passages=int(os.getenv("EVIDENCE_MAX_PASSAGES", "20000")),
+    )
+
+
+def get_evidence_store() -> EvidenceStore:
+    """Return the process-wide evidence store, used by agents created outside a research session."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = create_evidence_store()
+        return _store
@@ -0,0 +1,59 @@
+"""
+Evidence plugin for retrieving collected passages by similarity.
+"""
+import json
+import logging
+import os
+from typing import List, Optional
+
+from semantic_kernel.functions import kernel_function
+
+from plugins.evidence import EvidenceStore, get_evidence_store
+from utils.util import truncate_text
+
+logger = logging.getLogger(__name__)
+
+
+class EvidencePlugin:
+    """Plugin for pulling the passages relevant to a report section."""
+
+    def __init__(self, store: Optional[EvidenceStore] = None):
+        """
+        Initialize the evidence plugin.
+
+        Args:
+            store: Optional evidence store (default is shared with the search plugins)
+        """
+        self.store = store if store is not None else get_evidence_store()
+        logger.info("EvidencePlugin initialized")
+
+    @kernel_function(
+        name="retrieve_evidence",
+        description=(
+            "Retrieve the collected search snippets and page passages most relevant to a question "
+            "or report section, with their source URLs. Use this per section instead of re-reading "
+            "the conversation history."
+        )
+    )
+    def retrieve_evidence(self, query: str, top_k: Optional[int] = None, urls: Optional[List[str]] = None) -> str:
+        """
+        Return the passages most similar to a query.
+
+        Args:
+            query: Section topic, claim or question
+            top_k: Maximum number of passages (default from config)
+            urls: Optional sources to restrict retrieval to
+
+        Returns:
+            str: JSON list of passages with url, title, text and similarity score
+        """
+        if top_k is None:
+            top_k = int(os.getenv("EVIDENCE_TOP_K", "8"))
+        passages = self.store.search(query, top_k, urls)
+        logger.info(
+            f"Retrieved {len(passages)} evidence passage(s) for '{truncate_text(query, 50)}' "
+            f"from {len(self.store)} stored"
+        )
+        if not passages:
+            return json.dumps([{"error": "No matching evidence collected yet"}], ensure_ascii=False)
+        return json.dumps(passages, ensure_ascii=False, separators=(",", ":"))
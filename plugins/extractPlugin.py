@@ -0,0 +1,121 @@
+"""
+Extraction plugin exposing full-page content as chunks.
+"""
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from semantic_kernel.functions import kernel_function
+
+from plugins.blob_store import get_blob_store, offload_if_large
+from plugins.extraction import PageExtractor, get_page_extractor
+from plugins.rerank import bm25_scores
+from utils.util import truncate_text
+
+logger = logging.getLogger(__name__)
+
+# Characters of each chunk shown in the page outline
+OUTLINE_CHARS = 100
+
+
+class ExtractPlugin:
+    """Plugin for fetching full pages and reading them chunk by chunk."""
+
+    def __init__(self, extractor: Optional[PageExtractor] = None):
+        """
+        Initialize the extraction plugin.
+
+        Args:
+            extractor: Optional page extractor (default uses the shared chunk store)
+        """
+        self.extractor = extractor if extractor is not None else get_page_extractor()
+        self.store = self.extractor.store
+        self.blobs = get_blob_store()
+        self.blob_threshold = int(os.getenv("BLOB_THRESHOLD_CHARS", "0"))
+        logger.info("ExtractPlugin initialized")
+
+    @kernel_function(
+        name="extract_pages",
+        description=(
+            "Fetch the full content of web pages (e.g. the best search results), strip navigation "
+            "and ads, and split it into numbered chunks. Returns an outline of each page; use "
+            "read_chunks or search_chunks to read only the parts you need."
+        )
+    )
+    async def extract_pages(self, urls: List[str], max_concurrency: Optional[int] = None) -> str:
+        """
+        Extract pages and return their outlines.
+
+        Args:
+            urls: Page URLs to extract
+            max_concurrency: Maximum number of pages fetched at once (default from config)
+
+        Returns:
+            str: JSON list of pages with title, status, chunk count and a short preview per chunk
+        """
+        logger.info(f"Extracting {len(urls)} page(s)")
+        try:
+            pages = await self.extractor.extract(urls, max_concurrency)
+        except Exception as e:
+            error_msg = f"Page extraction failed: {str(e)}"
+            logger.error(error_msg)
+            return json.dumps([{"error": error_msg}], ensure_ascii=False)
+
+        for page in pages:
+            if page.get("chunks"):
+                page["outline"] = [
+                    truncate_text(" ".join(chunk["text"].split()), OUTLINE_CHARS)
+                    for chunk in self.store.get_chunks(page["url"])
+                ]
+        return json.dumps(pages, ensure_ascii=False, separators=(",", ":"))
+
+    @kernel_function(
+        name="read_chunks",
+        description="Read chunks of an extracted page by chunk number (all chunks if none are given)."
+    )
+    def read_chunks(self, url: str, chunk_ids: Optional[List[int]] = None) -> str:
+        """
+        Return selected chunks of an extracted page.
+
+        Args:
+            url: Page URL passed to extract_pages
+            chunk_ids: Chunk numbers to read (default all)
+
+        Returns:
+            str: JSON list of chunks with url, chunk number and text
+        """
+        if self.store.get_page(url) is None:
+            return json.dumps([{"error": f"Page not extracted: {url}. Call extract_pages first."}], ensure_ascii=False)
+        chunks = self.store.get_chunks(url, chunk_ids)
+        output = json.dumps(chunks, ensure_ascii=False, separators=(",", ":"))
+        return offload_if_large(output, f"{len(chunks)} chunks of {url}", self.blob_threshold, self.blobs)
+
+    @kernel_function(
+        name="search_chunks",
+        description="Find the extracted chunks most relevant to a question, across all extracted pages or the given URLs."
+    )
+    def search_chunks(self, query: str, urls: Optional[List[str]] = None, top_k: Optional[int] = None) -> str:
+        """
+        Rank stored chunks against a query with BM25.
+
+        Args:
+            query: Question or keywords
+            urls: Optional pages to search (default all extracted pages)
+            top_k: Maximum number of chunks to return (default 5)
+
+        Returns:
+            str: JSON list of the best chunks with url, chunk number, score and text
+        """
+        chunks = self.store.iter_chunks(urls)
+        if not chunks:
+            return json.dumps([], ensure_ascii=False)
+        scores = bm25_scores(query, [chunk["text"] for chunk in chunks])
+        ranked = sorted(range(len(chunks)), key=lambda i: scores[i], reverse=True)
+        best: List[Dict[str, Any]] = [
+            {**chunks[i], "score": round(float(scores[i]), 3)}
+            for i in ranked[:top_k or 5]
+            if scores[i] > 0
+        ]
+        logger.info(f"Chunk search for '{truncate_text(query, 50)}' matched {len(best)} of {len(chunks)} chunks")
+        return json.dumps(best, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,463 @@
+"""
+Full-page content extraction, boilerplate stripping and chunk storage.
+"""
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from plugins.evidence import EvidenceStore, get_evidence_store
+
+logger = logging.getLogger(__name__)
+
+# Elements that never carry article text
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "form", "button",
+    "select", "nav", "header", "footer", "aside", "menu",
+}
+# Elements that close a paragraph of text
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "table", "tr", "td", "th",
+    "blockquote", "pre", "h1", "h2", "h3", "h4", "h5", "h6", "br", "hr", "dd", "dt", "figcaption",
+}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+# class/id/role values that mark navigation, ads and other page chrome
+BOILERPLATE_ATTR_RE = re.compile(
+    r"(^|[\s_-])(nav|navbar|menu|sidebar|footer|header|banner|cookie|consent|subscribe|newsletter|"
+    r"advert|ads?|promo|share|social|related|comments?|breadcrumbs?|popup|modal)($|[\s_-])",
+    re.IGNORECASE
+)
+# Minimum article/main text length before it is preferred over the whole body
+MIN_MAIN_CHARS = 200
+
+
+class _TextExtractor(HTMLParser):
+    """Collect visible text, skipping page chrome and remembering article/main text."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self._in_title = False
+        self._stack: List[Tuple[str, bool, bool]] = []  # (tag, skipping, in_main)
+        self.body: List[str] = []
+        self.main: List[str] = []
+
+    def _skipping(self) -> bool:
+        return bool(self._stack) and self._stack[-1][1]
+
+    def _in_main(self) -> bool:
+        return bool(self._stack) and self._stack[-1][2]
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "title":
+            self._in_title = True
+        if tag in BLOCK_TAGS:
+            self._break()
+        if tag in VOID_TAGS:
+            return
+        attr_text = " ".join(value or "" for name, value in attrs if name in ("class", "id", "role"))
+        skipping = (
+            self._skipping() or tag in SKIP_TAGS
+            or (tag not in ("body", "html", "article", "main") and bool(BOILERPLATE_ATTR_RE.search(attr_text)))
+        )
+        in_main = self._in_main() or tag in ("article", "main")
+        self._stack.append((tag, skipping, in_main))
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        if tag in BLOCK_TAGS:
+            self._break()
+        # Pop to the matching tag; tolerate unclosed children in sloppy markup
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                del self._stack[i:]
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+            return
+        if self._skipping() or not data.strip():
+            return
+        self.body.append(data)
+        if self._in_main():
+            self.main.append(data)
+
+    def _break(self) -> None:
+        self.body.append("\n")
+        if self._in_main():
+            self.main.append("\n")
+
+
+def _normalize_text(parts: Iterable[str]) -> str:
+    """Collapse whitespace within paragraphs and drop empty lines."""
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def html_to_text(html: str) -> Tuple[str, str]:
+    """
+    Extract the title and main text of an HTML page.
+
+    Scripts, styles, navigation, headers, footers, sidebars and elements whose
+    class or id marks them as ads, menus or cookie banners are dropped. When the
+    page has an <article> or <main> element with enough text, only that is kept.
+
+    Args:
+        html: Page markup
+
+    Returns:
+        Tuple[str, str]: Page title and text, one paragraph per line
+    """
+    parser = _TextExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception as e:  # HTMLParser is lenient, but never let a page break extraction
+        logger.warning(f"HTML parsing stopped early: {e}")
+    main = _normalize_text(parser.main)
+    text = main if len(main) >= MIN_MAIN_CHARS else _normalize_text(parser.body)
+    return " ".join(parser.title.split()), text
+
+
+def chunk_text(text: str, max_chars: int = 1500, overlap: int = 150) -> List[str]:
+    """
+    Split text into chunks on paragraph boundaries.
+
+    Paragraphs are packed until ``max_chars``; longer paragraphs are split at
+    sentence or word boundaries. Each chunk after the first repeats up to
+    ``overlap`` trailing characters of the previous one for context.
+
+    Args:
+        text: Text with one paragraph per line
+        max_chars: Maximum chunk length in characters
+        overlap: Characters carried over from the previous chunk
+
+    Returns:
+        List[str]: Chunks in document order
+    """
+    pieces: List[str] = []
+    for paragraph in text.split("\n"):
+        paragraph = paragraph.strip()
+        while len(paragraph) > max_chars:
+            cut = max(paragraph.rfind(". ", 0, max_chars), paragraph.rfind(" ", 0, max_chars))
+            cut = cut + 1 if cut > max_chars // 2 else max_chars
+            pieces.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+        if paragraph:
+            pieces.append(paragraph)
+
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            chunks.append(current)
+            tail = current[-overlap:] if overlap > 0 else ""
+            space = tail.find(" ")
+            tail = tail[space + 1:] if 0 <= space < len(tail) - 1 else ""
+            current = f"{tail}\n{piece}" if tail and len(tail) + 1 + len(piece) <= max_chars else piece
+        else:
+            current = f"{current}\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class ChunkStore:
+    """SQLite store of extracted pages and their chunks."""
+
+    def __init__(self, path: str = ":memory:", ttl: int = 7 * 24 * 60 * 60, error_ttl: int = 15 * 60):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite database file (":memory:" for a private in-memory store)
+            ttl: Seconds an extracted page stays fresh before it is fetched again
+            error_ttl: Seconds before a failed fetch is retried
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                status TEXT NOT NULL,
+                chunk_count INTEGER NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                url TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (url, idx)
+            );
+            """
+        )
+        self._conn.commit()
+        logger.info(f"ChunkStore initialized at {path}")
+
+    def get_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return page metadata, or None if the page is missing, stale or failed longer than error_ttl ago."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, status, chunk_count, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        ttl = self.error_ttl if row[1].startswith("error") else self.ttl
+        if row[3] + ttl <= time.time():
+            return None
+        return {"url": url, "title": row[0], "status": row[1], "chunks": row[2]}
+
+    def put_page(self, url: str, title: str, status: str, chunks: List[str]) -> None:
+        """
+        Store a page and replace its chunks.
+
+        Args:
+            url: Page URL
+            title: Page title
+            status: "ok" or a short failure reason
+            chunks: Extracted chunks (empty for failed pages)
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks WHERE url = ?", (url,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, title, status, chunk_count, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, title, status, len(chunks), time.time())
+            )
+            self._conn.executemany(
+                "INSERT INTO chunks (url, idx, text) VALUES (?, ?, ?)",
+                [(url, i, chunk) for i, chunk in enumerate(chunks)]
+            )
+            self._conn.commit()
+
+    def get_chunks(self, url: str, ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Return chunks of a page.
+
+        Args:
+            url: Page URL
+            ids: Chunk indices to return (default all)
+
+        Returns:
+            List[Dict[str, Any]]: Chunks with url, chunk index and text
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, text FROM chunks WHERE url = ? ORDER BY idx", (url,)
+            ).fetchall()
+        wanted = set(ids) if ids is not None else None
+        return [{"url": url, "chunk": idx, "text": text} for idx, text in rows if wanted is None or idx in wanted]
+
+    def iter_chunks(self, urls: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Return every stored chunk, optionally limited to some pages."""
+        with self._lock:
+            if urls:
+                placeholders = ",".join("?" * len(urls))
+                rows = self._conn.execute(
+                    f"SELECT url, idx, text FROM chunks WHERE url IN ({placeholders}) ORDER BY url, idx", urls
+                ).fetchall()
+            else:
+                rows = self._conn.execute("SELECT url, idx, text FROM chunks ORDER BY url, idx").fetchall()
+        return [{"url": url, "chunk": idx, "text": text} for url, idx, text in rows]
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of stored pages and chunks."""
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            chunks = self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        return {"pages": pages, "chunks": chunks}
+
+    def clear(self) -> None:
+        """Remove every stored page."""
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.execute("DELETE FROM pages")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class PageExtractor:
+    """Fetch pages with a bounded worker pool and store their chunks."""
+
+    def __init__(
+        self,
+        store: ChunkStore,
+        max_concurrency: int = 4,
+        timeout: float = 15.0,
+        max_bytes: int = 2_000_000,
+        chunk_chars: int = 1500,
+        chunk_overlap: int = 150,
+        evidence: Optional[EvidenceStore] = None
+    ):
+        """
+        Initialize the extractor.
+
+        Args:
+            store: Store that receives extracted chunks
+            max_concurrency: Maximum number of pages fetched at once
+            timeout: Per-page fetch timeout in seconds
+            max_bytes: Maximum bytes read from a page
+            chunk_chars: Maximum chunk length in characters
+            chunk_overlap: Characters repeated between consecutive chunks
+            evidence: Optional evidence store that receives every extracted chunk
+        """
+        self.store = store
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.chunk_chars = chunk_chars
+        self.chunk_overlap = chunk_overlap
+        self.evidence = evidence
+
+    async def extract(self, urls: List[str], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch, clean and chunk pages, skipping pages already in the store.
+
+        Store reads and writes and evidence embedding run in worker threads so
+        the event loop keeps serving other agents.
+
+        Args:
+            urls: Page URLs
+            max_concurrency: Override of the worker pool size
+
+        Returns:
+            List[Dict[str, Any]]: Page metadata (url, title, status, chunks) in input order
+        """
+        urls = list(dict.fromkeys(u for u in urls if u))
+        stored = await asyncio.to_thread(self._get_pages, urls)
+        pending = [url for url, page in zip(urls, stored) if page is None]
+        if pending:
+            semaphore = asyncio.Semaphore(max(1, max_concurrency or self.max_concurrency))
+            async with httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": "Mozilla/5.0 (compatible; deep-research-extractor)"}
+            ) as client:
+                async def run(url: str) -> None:
+                    async with semaphore:
+                        await self._extract_one(client, url)
+
+                await asyncio.gather(*(run(url) for url in pending))
+            logger.info(f"Extracted {len(pending)} page(s), {len(urls) - len(pending)} already stored")
+            stored = await asyncio.to_thread(self._get_pages, urls)
+        pages = [page or {"url": url, "status": "error", "chunks": 0} for url, page in zip(urls, stored)]
+        if self.evidence is not None:
+            await asyncio.to_thread(self._add_evidence, pages)
+        return pages
+
+    def _get_pages(self, urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        return [self.store.get_page(url) for url in urls]
+
+    def _add_evidence(self, pages: List[Dict[str, Any]]) -> None:
+        for page in pages:
+            if page["chunks"]:
+                self.evidence.add_chunks(self.store.get_chunks(page["url"]), page.get("title", ""))
+
+    async def _extract_one(self, client: httpx.AsyncClient, url: str) -> None:
+        """Fetch one page and store its chunks or its failure status."""
+        title, status, chunks = "", "ok", []
+        try:
+            if not url.startswith(("http://", "https://")):
+                raise ValueError("unsupported URL scheme")
+            body, content_type = await self._fetch(client, url)
+            if "html" in content_type:
+                title, text = await asyncio.to_thread(html_to_text, body)
+            elif content_type.startswith("text/") or "json" in content_type:
+                text = body
+            else:
+                raise ValueError(f"unsupported content type {content_type or 'unknown'}")
+            chunks = chunk_text(text, self.chunk_chars, self.chunk_overlap)
+            if not chunks:
+                status = "empty"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            status = f"error: {str(e) or type(e).__name__}"
+            logger.warning(f"Page extraction failed for {url}: {status}")
+        await asyncio.to_thread(self.store.put_page, url, title, status, chunks)
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> Tuple[str, str]:
+        """Download at most max_bytes of a page and decode it."""
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "").lower()
+            data = bytearray()
+            async for block in response.aiter_bytes():
+                data.extend(block)
+                if len(data) >= self.max_bytes:
+                    break
+            encoding = response.encoding or "utf-8"
+        return bytes(data[:self.max_bytes]).decode(encoding, errors="replace"), content_type
+
+
+_stores: Dict[str, ChunkStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_chunk_store(path: Optional[str] = None) -> ChunkStore:
+    """
+    Return the process-wide chunk store for a path.
+
+    Args:
+        path: Database path (default from EXTRACT_STORE_PATH; in-memory if unset)
+
+    Returns:
+        ChunkStore: Shared store instance
+    """
+    path = path or os.getenv("EXTRACT_STORE_PATH") or ":memory:"
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = ChunkStore(
+                path,
+                ttl=int(os.getenv("EXTRACT_TTL_SECONDS", str(7 * 24 * 60 * 60))),
+                error_ttl=int(os.getenv("EXTRACT_ERROR_TTL_SECONDS", str(15 * 60))),
+            )
+            _stores[path] = store
+        return store
+
+
+def get_page_extractor(
+    store: Optional[ChunkStore] = None,
+    evidence: Optional[EvidenceStore] = None
+) -> PageExtractor:
+    """
+    Return an extractor configured from the environment.
+
+    Args:
+        store: Chunk store (default is shared process-wide)
+        evidence: Evidence store that receives extracted chunks (default is shared process-wide)
+
+    Returns:
+        PageExtractor: New extractor
+    """
+    return PageExtractor(
+        store or get_chunk_store(),
+        max_concurrency=int(os.getenv("EXTRACT_MAX_CONCURRENCY", "4")),
+        timeout=float(os.getenv("EXTRACT_TIMEOUT_SECONDS", "15")),
+        max_bytes=int(os.getenv("EXTRACT_MAX_BYTES", "2000000")),
+        chunk_chars=int(os.getenv("EXTRACT_CHUNK_CHARS", "1500")),
+        chunk_overlap=int(os.getenv("EXTRACT_CHUNK_OVERLAP", "150")),
+        evidence=evidence if evidence is not None else get_evidence_store(),
+    )
@@ -0,0 +1,376 @@
+"""
+Image deduplication, reachability checks and a local image cache.
+"""
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from plugins.dedup import canonical_url_key
+
+logger = logging.getLogger(__name__)
+
+# Images narrower or shorter than this are treated as icons or tracking pixels
+MIN_DIMENSION = 32
+THUMBNAIL_SIZE = 256
+
+
+def image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read width and height from PNG, GIF, JPEG or WebP headers.
+
+    Args:
+        data: Leading bytes of an image
+
+    Returns:
+        Optional[Tuple[int, int]]: (width, height), or None if the format is not recognized
+    """
+    if data.startswith(b"\x89PNG\r\n\x1a\n") and len(data) >= 24:
+        return struct.unpack(">II", data[16:24])
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        return struct.unpack("<HH", data[6:10])
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        if data[12:16] == b"VP8X":
+            return (int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1)
+        if data[12:16] == b"VP8 ":
+            width, height = struct.unpack("<HH", data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+    if data.startswith(b"\xff\xd8"):
+        offset = 2
+        while offset + 9 < len(data):
+            if data[offset] != 0xFF:
+                return None
+            marker = data[offset + 1]
+            length = struct.unpack(">H", data[offset + 2:offset + 4])[0]
+            # SOF0..SOF15 except DHT (C4), JPG (C8) and DAC (CC)
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">HH", data[offset + 5:offset + 9])
+                return width, height
+            offset += 2 + length
+    return None
+
+
+def make_thumbnail(data: bytes, max_bytes: int) -> Optional[bytes]:
+    """
+    Downscale an image when Pillow is installed; otherwise keep small originals.
+
+    Args:
+        data: Image bytes
+        max_bytes: Largest original kept when Pillow is unavailable
+
+    Returns:
+        Optional[bytes]: Thumbnail bytes, or None if none could be made
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return data if len(data) <= max_bytes else None
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+            output = io.BytesIO()
+            image.convert("RGB").save(output, format="JPEG", quality=80)
+            return output.getvalue()
+    except Exception as e:
+        logger.debug(f"Thumbnail creation failed: {e}")
+        return None
+
+
+class ImageCache:
+    """Image metadata and thumbnails keyed by URL hash, in memory or under a directory.
+
+    Failed checks are cached too, for a shorter time, so dead links are not
+    probed again by every search.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        ttl: int = 7 * 24 * 60 * 60,
+        error_ttl: int = 60 * 60,
+        max_entries: int = 2048
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Directory for cache files (default keeps entries in memory)
+            ttl: Seconds before a successful check is repeated
+            error_ttl: Seconds before a failed check is repeated
+            max_entries: Maximum entries kept in memory mode
+        """
+        self.root = root
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Tuple[Dict[str, Any], Optional[bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if root:
+            os.makedirs(root, exist_ok=True)
+        logger.info(f"ImageCache initialized {'at ' + root if root else 'in memory'}")
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Return the cache key of an image URL."""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.{suffix}")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Return cached metadata for an image URL if it has not expired.
+
+        Args:
+            url: Image URL
+
+        Returns:
+            Optional[Dict[str, Any]]: Metadata (status, content_type, bytes, width, height, digest, checked_at)
+        """
+        key = self.key(url)
+        if self.root:
+            try:
+                with open(self._path(key, "json"), encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                return None
+        else:
+            with self._lock:
+                entry = self._memory.get(key)
+                if entry is None:
+                    return None
+                self._memory.move_to_end(key)
+                meta = entry[0]
+        ttl = self.ttl if meta.get("status") == "ok" else self.error_ttl
+        if time.time() - meta.get("checked_at", 0) > ttl:
+            return None
+        return meta
+
+    def put(self, url: str, meta: Dict[str, Any], thumbnail: Optional[bytes] = None) -> None:
+        """
+        Store metadata and an optional thumbnail for an image URL.
+
+        Args:
+            url: Image URL
+            meta: Metadata from the reachability check
+            thumbnail: Thumbnail bytes
+        """
+        key = self.key(url)
+        if not self.root:
+            with self._lock:
+                self._memory[key] = (meta, thumbnail)
+                self._memory.move_to_end(key)
+                while len(self._memory) > self.max_entries:
+                    self._memory.popitem(last=False)
+            return
+        os.makedirs(os.path.dirname(self._path(key, "json")), exist_ok=True)
+        if thumbnail is not None:
+            self._write(self._path(key, "thumb"), thumbnail)
+        self._write(self._path(key, "json"), json.dumps(meta).encode("utf-8"))
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def thumbnail(self, url: str) -> Optional[bytes]:
+        """Return the cached thumbnail of an image URL, if any."""
+        key = self.key(url)
+        if self.root:
+            try:
+                with open(self._path(key, "thumb"), "rb") as f:
+                    return f.read()
+            except OSError:
+                return None
+        with self._lock:
+            entry = self._memory.get(key)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._memory.clear()
+        if self.root:
+            for directory, _, names in os.walk(self.root):
+                for name in names:
+                    if name.endswith((".json", ".thumb")):
+                        os.remove(os.path.join(directory, name))
+
+
+class ImageChecker:
+    """Hand out only live, unique images.
+
+    Images are deduplicated by canonical URL and by content digest, both
+    within a batch and against images returned earlier in the session.
+    Uncached URLs are fetched concurrently by a bounded pool; anything that
+    fails, is not an image, or is icon-sized is dropped.
+    """
+
+    def __init__(
+        self,
+        cache: ImageCache,
+        max_concurrency: int = 8,
+        timeout: float = 5.0,
+        max_bytes: int = 5_000_000,
+        thumbnail_max_bytes: int = 200_000,
+        min_dimension: int = MIN_DIMENSION
+    ):
+        """
+        Initialize the checker.
+
+        Args:
+            cache: Cache of check results and thumbnails
+            max_concurrency: Maximum images fetched at once
+            timeout: Per-request timeout in seconds
+            max_bytes: Maximum bytes downloaded per image
+            thumbnail_max_bytes: Largest original kept as thumbnail when Pillow is unavailable
+            min_dimension: Minimum width and height of a usable image
+        """
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.thumbnail_max_bytes = thumbnail_max_bytes
+        self.min_dimension = min_dimension
+        self._seen_urls: set = set()
+        self._seen_digests: set = set()
+
+    async def check(self, images: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Filter images to those that are reachable and not seen before.
+
+        Args:
+            images: Image entries with at least a "url"
+
+        Returns:
+            List[Dict[str, Any]]: Live, unique images in input order, with width and height when known
+        """
+        unique: List[Dict[str, Any]] = []
+        for image in images:
+            url = image.get("url", "")
+            key = canonical_url_key(url) if url else ""
+            if key and key not in self._seen_urls:
+                self._seen_urls.add(key)
+                unique.append(image)
+
+        checks: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        for image in unique:
+            meta = self.cache.get(image["url"])
+            if meta is None:
+                pending.append(image["url"])
+            else:
+                checks[image["url"]] = meta
+        if pending:
+            semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+            async with httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": "Mozilla/5.0 (compatible; deep-research-image-check)"}
+            ) as client:
+                async def run(url: str) -> None:
+                    async with semaphore:
+                        checks[url] = await self._check_one(client, url)
+
+                await asyncio.gather(*(run(url) for url in dict.fromkeys(pending)))
+
+        live = []
+        for image in unique:
+            meta = checks[image["url"]]
+            if meta["status"] != "ok" or meta.get("digest") in self._seen_digests:
+                continue
+            self._seen_digests.add(meta.get("digest"))
+            entry = dict(image)
+            if meta.get("width"):
+                entry["width"], entry["height"] = meta["width"], meta["height"]
+            live.append(entry)
+        logger.info(
+            f"Image check: {len(images)} in, {len(unique)} unique, {len(pending)} fetched, {len(live)} live"
+        )
+        return live
+
+    async def _check_one(self, client: httpx.AsyncClient, url: str) -> Dict[str, Any]:
+        """Fetch one image, cache its metadata and thumbnail, and return the metadata."""
+        meta: Dict[str, Any] = {"url": url, "status": "ok"}
+        thumbnail = None
+        try:
+            if not url.startswith(("http://", "https://")):
+                raise ValueError("unsupported URL scheme")
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                if content_type and not content_type.startswith("image/"):
+                    raise ValueError(f"not an image ({content_type})")
+                data = bytearray()
+                async for block in response.aiter_bytes():
+                    data.extend(block)
+                    if len(data) >= self.max_bytes:
+                        break
+            if not data:
+                raise ValueError("empty response")
+            data = bytes(data[:self.max_bytes])
+            size = image_size(data)
+            if size and min(size) < self.min_dimension:
+                raise ValueError(f"too small ({size[0]}x{size[1]})")
+            meta.update({
+                "content_type": content_type,
+                "bytes": len(data),
+                "digest": hashlib.sha256(data).hexdigest(),
+            })
+            if size:
+                meta["width"], meta["height"] = size
+            thumbnail = await asyncio.to_thread(make_thumbnail, data, self.thumbnail_max_bytes)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            meta["status"] = f"error: {str(e) or type(e).__name__}"
+            logger.info(f"Dropping image {url}: {meta['status']}")
+        meta["checked_at"] = time.time()
+        self.cache.put(url, meta, thumbnail)
+        return meta
+
+
+_caches: Dict[str, ImageCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_image_cache(root: Optional[str] = None) -> ImageCache:
+    """
+    Return the process-wide image cache for a directory.
+
+    Args:
+        root: Cache directory (default from IMAGE_CACHE_PATH; in memory if unset)
+
+    Returns:
+        ImageCache: Shared cache instance
+    """
+    root = root or os.getenv("IMAGE_CACHE_PATH") or ""
+    with _caches_lock:
+        cache = _caches.get(root)
+        if cache is None:
+            cache = ImageCache(root or None, ttl=int(os.getenv("IMAGE_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60))))
+            _caches[root] = cache
+        return cache
+
+
+def get_image_checker(cache: Optional[ImageCache] = None) -> ImageChecker:
+    """Return a checker over the shared image cache, configured from the environment."""
+    return ImageChecker(
+        cache or get_image_cache(),
+        max_concurrency=int(os.getenv("IMAGE_CHECK_MAX_CONCURRENCY", "8")),
+        timeout=float(os.getenv("IMAGE_CHECK_TIMEOUT_SECONDS", "5")),
+        max_bytes=int(os.getenv("IMAGE_CHECK_MAX_BYTES", "5000000")),
+        min_dimension=int(os.getenv("IMAGE_MIN_DIMENSION", str(MIN_DIMENSION))),
+    )
@@ -0,0 +1,481 @@
+"""
+On-disk inverted index over a local document corpus.
+
+Usage:
+    python -m plugins.local_index ingest <directory> [--index PATH] [--rebuild]
+    python -m plugins.local_index search "<query>" [--index PATH] [--top-k N]
+"""
+import argparse
+import bisect
+import datetime as dt
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from plugins.extraction import chunk_text, html_to_text
+from plugins.rerank import tokenize
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+TEXT_EXTENSIONS = {".md", ".markdown", ".txt", ".rst"}
+HTML_EXTENSIONS = {".html", ".htm"}
+PDF_EXTENSIONS = {".pdf"}
+SUPPORTED_EXTENSIONS = TEXT_EXTENSIONS | HTML_EXTENSIONS | PDF_EXTENSIONS
+# Compact into a single segment once an update would exceed this many segments
+MAX_SEGMENTS = 8
+
+
+def _read_pdf(path: str) -> Tuple[str, str]:
+    """Extract title and text from a PDF when pypdf is installed."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        logger.warning(f"Skipping {path}: install pypdf to index PDF files")
+        return "", ""
+    reader = PdfReader(path)
+    title = (reader.metadata.title if reader.metadata else None) or ""
+    return title, "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def read_document(path: str) -> Tuple[str, str]:
+    """
+    Read a document and return its title and plain text.
+
+    Args:
+        path: File path with a supported extension
+
+    Returns:
+        Tuple[str, str]: Title (file name if none is found) and text, one paragraph per line
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in PDF_EXTENSIONS:
+        title, text = _read_pdf(path)
+    else:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            raw = f.read()
+        if extension in HTML_EXTENSIONS:
+            title, text = html_to_text(raw)
+        else:
+            title, text = "", raw
+            for line in raw.splitlines():
+                if line.startswith("# "):
+                    title = line[2:].strip()
+                    break
+    # Join hard-wrapped lines so paragraphs survive chunking
+    paragraphs = [" ".join(p.split()) for p in text.replace("\r", "").split("\n\n")]
+    return title or os.path.basename(path), "\n".join(p for p in paragraphs if p)
+
+
+def _file_sha1(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_json(path: str, data: Any) -> None:
+    """Write JSON atomically."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class _Segment:
+    """One immutable, memory-mapped slice of the index."""
+
+    def __init__(self, path: str, base: int):
+        self.path = path
+        self.base = base
+        with open(os.path.join(path, "terms.json"), encoding="utf-8") as f:
+            self.terms: Dict[str, List[int]] = json.load(f)
+        with open(os.path.join(path, "passages.json"), encoding="utf-8") as f:
+            self.passages: List[List[Any]] = json.load(f)  # [file, title, chunk]
+        self.postings = np.load(os.path.join(path, "postings.npy"), mmap_mode="r")
+        self.lengths = np.load(os.path.join(path, "lengths.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r")
+        self.text = np.memmap(os.path.join(path, "text.bin"), dtype=np.uint8, mode="r") \
+            if os.path.getsize(os.path.join(path, "text.bin")) else np.zeros(0, dtype=np.uint8)
+
+    def passage_text(self, local_id: int) -> str:
+        start, end = int(self.offsets[local_id]), int(self.offsets[local_id + 1])
+        return bytes(self.text[start:end]).decode("utf-8")
+
+    @staticmethod
+    def write(path: str, passages: List[Tuple[str, str, int, str]]) -> None:
+        """
+        Build a segment from passages.
+
+        Args:
+            path: Segment directory to create
+            passages: (file path, title, chunk number, text) tuples
+        """
+        os.makedirs(path)
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths = np.zeros(len(passages), dtype=np.int32)
+        offsets = np.zeros(len(passages) + 1, dtype=np.int64)
+        with open(os.path.join(path, "text.bin"), "wb") as text_file:
+            for local_id, (_, title, _, text) in enumerate(passages):
+                terms = tokenize(f"{title} {text}")
+                lengths[local_id] = len(terms)
+                for term, tf in Counter(terms).items():
+                    postings.setdefault(term, []).append((local_id, tf))
+                encoded = text.encode("utf-8")
+                text_file.write(encoded)
+                offsets[local_id + 1] = offsets[local_id] + len(encoded)
+
+        table = np.zeros((sum(len(p) for p in postings.values()), 2), dtype=np.int32)
+        terms_index: Dict[str, List[int]] = {}
+        cursor = 0
+        for term in sorted(postings):
+            entries = postings[term]
+            table[cursor:cursor + len(entries)] = entries
+            terms_index[term] = [cursor, len(entries)]
+            cursor += len(entries)
+
+        np.save(os.path.join(path, "postings.npy"), table)
+        np.save(os.path.join(path, "lengths.npy"), lengths)
+        np.save(os.path.join(path, "offsets.npy"), offsets)
+        with open(os.path.join(path, "terms.json"), "w", encoding="utf-8") as f:
+            json.dump(terms_index, f, ensure_ascii=False)
+        with open(os.path.join(path, "passages.json"), "w", encoding="utf-8") as f:
+            json.dump([[file, title, chunk] for file, title, chunk, _ in passages], f, ensure_ascii=False)
+
+
+class LocalIndex:
+    """Segmented BM25 inverted index of local documents.
+
+    Each ingest writes a new immutable segment for added or changed files and
+    tombstones the passages of changed or deleted files, so updates only read
+    the files that changed. Postings, passage lengths and passage text are
+    memory-mapped, making cold start cheap and queries a handful of array
+    operations.
+    """
+
+    def __init__(self, path: str, chunk_chars: int = 1000):
+        """
+        Open (or prepare) an index directory.
+
+        Args:
+            path: Index directory
+            chunk_chars: Maximum passage length used when ingesting
+        """
+        self.path = path
+        self.chunk_chars = chunk_chars
+        self._lock = threading.Lock()
+        self._manifest_mtime = None
+        self._segments: List[_Segment] = []
+        self._deleted = np.zeros(0, dtype=bool)
+        self._manifest: Dict[str, Any] = {"version": INDEX_VERSION, "segments": [], "files": {}, "next_id": 0}
+        self._load()
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.path, "manifest.json")
+
+    def _load(self) -> None:
+        """(Re)load the manifest and segments if the manifest changed on disk."""
+        try:
+            mtime = os.stat(self._manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._manifest_mtime:
+            return
+        with open(self._manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported local index version {manifest.get('version')} at {self.path}")
+        segments = [_Segment(os.path.join(self.path, name), base) for name, base in manifest["segments"]]
+        deleted = np.ones(manifest["next_id"], dtype=bool)
+        for entry in manifest["files"].values():
+            deleted[entry["ids"][0]:entry["ids"][1]] = False
+        self._manifest, self._segments, self._deleted = manifest, segments, deleted
+        self._manifest_mtime = mtime
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of files, live passages and segments."""
+        with self._lock:
+            self._load()
+            return {
+                "files": len(self._manifest["files"]),
+                "passages": int((~self._deleted).sum()),
+                "segments": len(self._segments),
+            }
+
+    def ingest(self, directory: str, rebuild: bool = False) -> Dict[str, int]:
+        """
+        Index the supported files under a directory, updating incrementally.
+
+        Args:
+            directory: Directory to scan recursively
+            rebuild: Discard the existing index and re-read every file
+
+        Returns:
+            Dict[str, int]: Counts of added, updated, removed and unchanged files
+        """
+        directory = os.path.abspath(directory)
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            self._load()
+            manifest = json.loads(json.dumps(self._manifest))
+            if rebuild:
+                manifest = {"version": INDEX_VERSION, "segments": [], "files": {}, "next_id": 0}
+
+            found = {}
+            for root, _, names in os.walk(directory):
+                for name in sorted(names):
+                    if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                        file_path = os.path.join(root, name)
+                        stat = os.stat(file_path)
+                        found[file_path] = (stat.st_mtime, stat.st_size)
+
+            counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+            changed: List[str] = []
+            for file_path, (mtime, size) in found.items():
+                entry = manifest["files"].get(file_path)
+                if entry is not None and (entry["mtime"], entry["size"]) == (mtime, size):
+                    counts["unchanged"] += 1
+                    continue
+                sha1 = _file_sha1(file_path)
+                if entry is not None and entry["sha1"] == sha1:
+                    entry["mtime"], entry["size"] = mtime, size
+                    counts["unchanged"] += 1
+                    continue
+                counts["updated" if entry is not None else "added"] += 1
+                changed.append(file_path)
+                manifest["files"][file_path] = {"mtime": mtime, "size": size, "sha1": sha1, "ids": [0, 0]}
+
+            for file_path in [p for p in manifest["files"] if p.startswith(directory + os.sep) and p not in found]:
+                del manifest["files"][file_path]
+                counts["removed"] += 1
+
+            passages: List[Tuple[str, str, int, str]] = []
+            for file_path in changed:
+                try:
+                    title, text = read_document(file_path)
+                except OSError as e:
+                    logger.warning(f"Skipping {file_path}: {e}")
+                    title, text = os.path.basename(file_path), ""
+                chunks = chunk_text(text, self.chunk_chars, overlap=0)
+                start = manifest["next_id"] + len(passages)
+                passages.extend((file_path, title, i, chunk) for i, chunk in enumerate(chunks))
+                manifest["files"][file_path]["ids"] = [start, start + len(chunks)]
+                manifest["files"][file_path]["title"] = title
+
+            if passages:
+                name = f"seg-{int(time.time() * 1000):x}-{os.urandom(4).hex()}"
+                _Segment.write(os.path.join(self.path, name), passages)
+                manifest["segments"].append([name, manifest["next_id"]])
+                manifest["next_id"] += len(passages)
+
+            obsolete = []
+            if rebuild:
+                obsolete = [name for name, _ in self._manifest["segments"]]
+            _write_json(self._manifest_path, manifest)
+            for name in obsolete:
+                shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+            self._manifest_mtime = None
+            self._load()
+
+        logger.info(f"Local index update for {directory}: {counts}, {len(passages)} new passages")
+        if len(self._segments) > MAX_SEGMENTS:
+            self.compact()
+        return counts
+
+    def compact(self) -> None:
+        """Merge the live passages of every segment into a single segment.
+
+        Passages are copied from the existing segments rather than re-read from
+        disk, so files from every ingested directory are kept.
+        """
+        with self._lock:
+            self._load()
+            manifest = json.loads(json.dumps(self._manifest))
+            segments = sorted(self._segments, key=lambda seg: seg.base)
+            bases = [seg.base for seg in segments]
+
+            passages: List[Tuple[str, str, int, str]] = []
+            for file_path, entry in manifest["files"].items():
+                start = len(passages)
+                for global_id in range(*entry["ids"]):
+                    segment = segments[bisect.bisect_right(bases, global_id) - 1]
+                    local_id = global_id - segment.base
+                    _, title, chunk = segment.passages[local_id]
+                    passages.append((file_path, title, chunk, segment.passage_text(local_id)))
+                entry["ids"] = [start, len(passages)]
+
+            manifest["segments"] = []
+            if passages:
+                name = f"seg-{int(time.time() * 1000):x}-{os.urandom(4).hex()}"
+                _Segment.write(os.path.join(self.path, name), passages)
+                manifest["segments"].append([name, 0])
+            manifest["next_id"] = len(passages)
+
+            obsolete = [name for name, _ in self._manifest["segments"]]
+            _write_json(self._manifest_path, manifest)
+            for name in obsolete:
+                shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+            self._manifest_mtime = None
+            self._load()
+        logger.info(f"Compacted local index into {len(self._segments)} segment(s), {len(passages)} passages")
+
+    def search(self, query: str, top_k: int = 5, k1: float = 1.2, b: float = 0.75) -> List[Dict[str, Any]]:
+        """
+        Search the index with BM25, returning the best passage per file.
+
+        Args:
+            query: Query text
+            top_k: Maximum number of files returned
+            k1: Term-frequency saturation
+            b: Length normalization
+
+        Returns:
+            List[Dict[str, Any]]: Tavily-shaped results (url, title, content, score, published_date)
+        """
+        with self._lock:
+            self._load()
+            segments, deleted, files = self._segments, self._deleted, self._manifest["files"]
+        terms = list(dict.fromkeys(tokenize(query)))
+        total = len(deleted)
+        if not terms or not total or deleted.all():
+            return []
+
+        lengths = np.zeros(total, dtype=np.float64)
+        for segment in segments:
+            lengths[segment.base:segment.base + len(segment.lengths)] = segment.lengths
+        live = ~deleted
+        average_length = lengths[live].mean() or 1.0
+        live_count = int(live.sum())
+
+        scores = np.zeros(total, dtype=np.float64)
+        for term in terms:
+            ids_parts, tf_parts = [], []
+            for segment in segments:
+                entry = segment.terms.get(term)
+                if entry:
+                    block = np.asarray(segment.postings[entry[0]:entry[0] + entry[1]])
+                    ids_parts.append(block[:, 0].astype(np.int64) + segment.base)
+                    tf_parts.append(block[:, 1].astype(np.float64))
+            if not ids_parts:
+                continue
+            ids, tf = np.concatenate(ids_parts), np.concatenate(tf_parts)
+            keep = live[ids]
+            ids, tf = ids[keep], tf[keep]
+            if not len(ids):
+                continue
+            idf = np.log1p((live_count - len(ids) + 0.5) / (len(ids) + 0.5))
+            scores[ids] += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[ids] / average_length))
+
+        candidates = np.flatnonzero(scores > 0)
+        if not len(candidates):
+            return []
+        candidates = candidates[np.argsort(-scores[candidates])]
+
+        results, seen_files = [], set()
+        best = scores[candidates[0]]
+        for global_id in candidates:
+            segment = next(s for s in reversed(segments) if s.base <= global_id)
+            local_id = int(global_id - segment.base)
+            file_path, title, chunk = segment.passages[local_id]
+            if file_path in seen_files:
+                continue
+            seen_files.add(file_path)
+            mtime = files.get(file_path, {}).get("mtime")
+            results.append({
+                "url": f"file://{file_path}",
+                "title": title,
+                "content": segment.passage_text(local_id),
+                "score": round(float(scores[global_id] / best), 3),
+                "published_date": dt.datetime.fromtimestamp(mtime, dt.timezone.utc).isoformat() if mtime else "",
+                "chunk": chunk,
+            })
+            if len(results) >= top_k:
+                break
+        return results
+
+
+class LocalIndexBackend:
+    """Search backend over a LocalIndex, producing Tavily-shaped responses."""
+
+    name = "local"
+
+    def __init__(self, index: LocalIndex):
+        """
+        Initialize the backend.
+
+        Args:
+            index: Local index to search
+        """
+        self.index = index
+
+    async def search(self, **params: Any) -> Dict[str, Any]:
+        """Search the local index; queries take milliseconds and never touch the network."""
+        results = self.index.search(params.get("query", ""), int(params.get("max_results") or 5))
+        return {"query": params.get("query", ""), "results": results, "images": []}
+
+
+_indexes: Dict[str, LocalIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_local_index(path: Optional[str] = None) -> LocalIndex:
+    """
+    Return the process-wide index for a path.
+
+    Args:
+        path: Index directory (default from LOCAL_INDEX_PATH)
+
+    Returns:
+        LocalIndex: Shared index instance
+    """
+    path = os.path.abspath(path or os.getenv("LOCAL_INDEX_PATH", ".cache/local_index"))
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = LocalIndex(path, chunk_chars=int(os.getenv("LOCAL_INDEX_CHUNK_CHARS", "1000")))
+            _indexes[path] = index
+        return index
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    """Command-line entry point for ingesting and querying the local index."""
+    parser = argparse.ArgumentParser(description="Local document index for the research agents")
+    parser.add_argument("--index", default=None, help="Index directory (default LOCAL_INDEX_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="Index or update the documents under a directory")
+    ingest.add_argument("directory")
+    ingest.add_argument("--rebuild", action="store_true", help="Re-read every file and compact the index")
+    search = commands.add_parser("search", help="Query the index")
+    search.add_argument("query")
+    search.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    index = get_local_index(args.index)
+    if args.command == "ingest":
+        start = time.perf_counter()
+        counts = index.ingest(args.directory, rebuild=args.rebuild)
+        print(json.dumps({**counts, **index.stats(), "seconds": round(time.perf_counter() - start, 3)}))
+    else:
+        start = time.perf_counter()
+        results = index.search(args.query, args.top_k)
+        for result in results:
+            result["content"] = result["content"][:200]
+        print(json.dumps({"results": results, "ms": round((time.perf_counter() - start) * 1000, 2)},
+                         ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
@@ -0,0 +1,296 @@
+"""
+Process-wide rate limiting and circuit breaking for the search backend.
+"""
+import asyncio
+import email.utils
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from tavily import BadRequestError, InvalidAPIKeyError, MissingAPIKeyError, UsageLimitExceededError
+
+try:
+    from tavily.errors import ForbiddenError
+except ImportError:  # older tavily-python releases
+    ForbiddenError = InvalidAPIKeyError
+
+logger = logging.getLogger(__name__)
+
+# Errors that retrying cannot fix
+NON_RETRYABLE_ERRORS = (BadRequestError, InvalidAPIKeyError, MissingAPIKeyError, ForbiddenError)
+
+
+class SearchUnavailableError(Exception):
+    """Raised when a search is rejected without reaching the backend."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket usable from any event loop."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token, going into debt if necessary.
+
+        Returns:
+            float: Seconds the caller must wait before using the token
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def refund(self) -> None:
+        """Return a token taken by ``reserve`` that was not used."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for ``seconds`` (e.g. after a 429 with Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a half-open probe."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before letting one probe through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                logger.info("Search circuit half-open, probing backend")
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self.state = self.CLOSED
+
+    def release(self) -> None:
+        """End a probe that recorded no outcome (e.g. cancelled), so the next call can probe again."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic() - self.reset_timeout
+
+    def record_failure(self) -> None:
+        """Count a failure and open the circuit past the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Search circuit opened after {self._failures} consecutive failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Extract a Retry-After hint from a search error.
+
+    Args:
+        error: Exception raised by the search client
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the error carries no hint
+    """
+    seconds = getattr(error, "retry_after_seconds", None)
+    if seconds is not None:
+        return float(seconds)
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    value = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        parsed = email.utils.parsedate_to_datetime(value)
+        return max(0.0, parsed.timestamp() - time.time()) if parsed else None
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """Return True if the error signals rate limiting or quota exhaustion."""
+    if isinstance(error, UsageLimitExceededError):
+        return True
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None) -> float:
+    """
+    Compute a full-jitter exponential backoff delay.
+
+    Args:
+        attempt: Zero-based attempt number
+        base: Base delay in seconds
+        cap: Maximum delay in seconds
+        retry_after: Server-provided minimum delay, if any
+
+    Returns:
+        float: Seconds to sleep before the next attempt
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class SearchGuard:
+    """Rate limiter, circuit breaker and metrics shared by every search in the process."""
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: float = 10.0,
+        max_wait: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0
+    ):
+        """
+        Initialize the guard.
+
+        Args:
+            rate: Searches per second allowed on average
+            burst: Maximum burst of searches
+            max_wait: Longest a caller will queue for a token before being rejected
+            failure_threshold: Consecutive backend failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before probing
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_wait = max_wait
+        self._counters = {"calls": 0, "throttled": 0, "rejected": 0, "rate_limited": 0, "failures": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    async def acquire(self) -> None:
+        """
+        Wait for permission to call the backend.
+
+        Raises:
+            SearchUnavailableError: If the circuit is open or the queue wait exceeds max_wait
+        """
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise SearchUnavailableError("Search backend circuit is open; failing fast")
+
+        wait = self.bucket.reserve()
+        if wait > self.max_wait:
+            self.bucket.refund()
+            self._count("rejected")
+            raise SearchUnavailableError(f"Search rate limit queue too long ({wait:.1f}s)")
+        if wait > 0:
+            self._count("throttled")
+            await asyncio.sleep(wait)
+        self._count("calls")
+
+    def record_success(self) -> None:
+        """Record a successful backend call."""
+        self.breaker.record_success()
+
+    def release(self) -> None:
+        """Record that an admitted call ended without a success or failure to report."""
+        self.breaker.release()
+
+    def record_failure(self, error: BaseException) -> Optional[float]:
+        """
+        Record a failed backend call.
+
+        Throttling responses pause the shared bucket so every caller backs off
+        together instead of retrying in lockstep.
+
+        Args:
+            error: Exception raised by the backend
+
+        Returns:
+            Optional[float]: Retry-After hint in seconds, if the backend sent one
+        """
+        retry_after = retry_after_seconds(error)
+        if is_throttle_error(error):
+            self._count("rate_limited")
+            if retry_after:
+                self.bucket.pause(retry_after)
+        else:
+            self._count("failures")
+            self.breaker.record_failure()
+        return retry_after
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return counters for throttled, rejected and failed calls."""
+        with self._lock:
+            return {**self._counters, "circuit_state": self.breaker.state}
+
+    def reset(self) -> None:
+        """Reset counters, bucket and breaker to their initial state."""
+        with self._lock:
+            self._counters = {name: 0 for name in self._counters}
+        self.bucket = TokenBucket(self.bucket.rate, self.bucket.capacity)
+        self.breaker = CircuitBreaker(self.breaker.failure_threshold, self.breaker.reset_timeout)
+
+
+_guard: Optional[SearchGuard] = None
+_guard_lock = threading.Lock()
+
+
+def get_search_guard() -> SearchGuard:
+    """Return the process-wide search guard configured from the environment."""
+    global _guard
+    with _guard_lock:
+        if _guard is None:
+            _guard = SearchGuard(
+                rate=float(os.getenv("SEARCH_RATE_LIMIT_PER_SECOND", "5")),
+                burst=float(os.getenv("SEARCH_RATE_LIMIT_BURST", "10")),
+                max_wait=float(os.getenv("SEARCH_RATE_LIMIT_MAX_WAIT", "30")),
+                failure_threshold=int(os.getenv("SEARCH_CIRCUIT_FAILURE_THRESHOLD", "5")),
+                reset_timeout=float(os.getenv("SEARCH_CIRCUIT_RESET_SECONDS", "30")),
+            )
+        return _guard
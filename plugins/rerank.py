@@ -0,0 +1,177 @@
+"""
+Local lexical reranking and diversity selection of search results.
+"""
+import logging
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_LATIN_RE = re.compile(r"[a-z0-9]+")
+_CJK_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lexical terms.
+
+    Latin text is split into lowercase words; CJK runs, which have no spaces,
+    are split into overlapping character bigrams.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List[str]: Terms
+    """
+    text = (text or "").lower()
+    tokens = _LATIN_RE.findall(text)
+    for run in _CJK_RE.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def _term_matrix(docs: List[List[str]], vocabulary: Dict[str, int]) -> np.ndarray:
+    """Build a documents x vocabulary term-frequency matrix."""
+    matrix = np.zeros((len(docs), len(vocabulary)), dtype=np.float64)
+    for row, doc in enumerate(docs):
+        for term, count in Counter(doc).items():
+            column = vocabulary.get(term)
+            if column is not None:
+                matrix[row, column] = count
+    return matrix
+
+
+def bm25_scores(query: str, documents: List[str], k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    """
+    Score documents against a query with Okapi BM25.
+
+    Args:
+        query: Query text
+        documents: Document texts
+        k1: Term-frequency saturation
+        b: Length normalization
+
+    Returns:
+        np.ndarray: One score per document
+    """
+    docs = [tokenize(d) for d in documents]
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not docs or not terms:
+        return np.zeros(len(docs))
+
+    tf = _term_matrix(docs, {term: i for i, term in enumerate(terms)})
+    lengths = np.array([len(d) for d in docs], dtype=np.float64)
+    avg_length = lengths.mean() or 1.0
+    df = (tf > 0).sum(axis=0)
+    idf = np.log1p((len(docs) - df + 0.5) / (df + 0.5))
+    denominator = tf + k1 * (1 - b + b * lengths[:, None] / avg_length)
+    return (idf * tf * (k1 + 1) / np.maximum(denominator, 1e-9)).sum(axis=1)
+
+
+def tfidf_similarity(documents: List[str]) -> np.ndarray:
+    """
+    Compute pairwise cosine similarity of TF-IDF document vectors.
+
+    Args:
+        documents: Document texts
+
+    Returns:
+        np.ndarray: Symmetric documents x documents similarity matrix
+    """
+    docs = [tokenize(d) for d in documents]
+    vocabulary = {term: i for i, term in enumerate(dict.fromkeys(t for d in docs for t in d))}
+    if not vocabulary:
+        return np.zeros((len(docs), len(docs)))
+    tf = _term_matrix(docs, vocabulary)
+    idf = np.log1p(len(docs) / (1 + (tf > 0).sum(axis=0))) + 1.0
+    vectors = tf * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.maximum(norms, 1e-9)
+    return vectors @ vectors.T
+
+
+def mmr_select(relevance: np.ndarray, similarity: np.ndarray, top_n: int, diversity: float = 0.3) -> List[int]:
+    """
+    Pick indices by Maximal Marginal Relevance.
+
+    Args:
+        relevance: Relevance score per candidate, in [0, 1]
+        similarity: Candidate x candidate similarity matrix
+        top_n: Number of candidates to select
+        diversity: Weight of the redundancy penalty (0 = pure relevance)
+
+    Returns:
+        List[int]: Selected indices in selection order
+    """
+    count = len(relevance)
+    selected: List[int] = []
+    if count == 0:
+        return selected
+    remaining = np.ones(count, dtype=bool)
+    max_similarity = np.zeros(count)
+    for _ in range(min(top_n, count)):
+        scores = (1 - diversity) * relevance - diversity * max_similarity
+        scores[~remaining] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        remaining[best] = False
+        max_similarity = np.maximum(max_similarity, similarity[best])
+    return selected
+
+
+def _normalize(scores: np.ndarray) -> np.ndarray:
+    """Scale scores into [0, 1]."""
+    if scores.size == 0:
+        return scores
+    low, high = scores.min(), scores.max()
+    if high - low < 1e-12:
+        return np.ones_like(scores) if high > 0 else np.zeros_like(scores)
+    return (scores - low) / (high - low)
+
+
+def rerank_results(
+    results: List[Dict[str, Any]],
+    task: str,
+    top_n: Optional[int] = None,
+    diversity: float = 0.3,
+    backend_weight: float = 0.3
+) -> List[Dict[str, Any]]:
+    """
+    Rerank results against the research task and select a diverse top-N.
+
+    Relevance blends BM25 over title and snippet with the backend's own score.
+    Error entries and ``seen_before`` references are not ranked and are kept
+    after the selected results.
+
+    Args:
+        results: Processed search results
+        task: Research task or query to rank against
+        top_n: Maximum number of results to keep (default keeps all, reordered)
+        diversity: MMR redundancy weight
+        backend_weight: Weight of the backend score in the relevance blend
+
+    Returns:
+        List[Dict[str, Any]]: Selected results with a ``rerank_score`` field
+    """
+    candidates = [r for r in results if "error" not in r and not r.get("seen_before")]
+    passthrough = [r for r in results if "error" in r or r.get("seen_before")]
+    if len(candidates) < 2:
+        return results
+
+    texts = [f"{r.get('title', '')} {r.get('snippet', '')}" for r in candidates]
+    lexical = _normalize(bm25_scores(task, texts))
+    backend = np.array([float(r.get("score") or 0.0) for r in candidates])
+    relevance = (1 - backend_weight) * lexical + backend_weight * _normalize(backend)
+
+    selected = mmr_select(relevance, tfidf_similarity(texts), top_n or len(candidates), diversity)
+    ranked = [{**candidates[i], "rerank_score": round(float(relevance[i]), 3)} for i in selected]
+    if len(ranked) < len(candidates):
+        logger.info(f"Reranker kept {len(ranked)} of {len(candidates)} results")
+    return ranked + passthrough
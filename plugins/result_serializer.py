@@ -0,0 +1,139 @@
+"""
+Token-aware serialization of search results for tool output.
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_encoding: Any = None
+_encoding_loaded = False
+
+OUTPUT_FORMATS = ("pretty", "compact")
+
+# Fields kept in compact mode; crawled_at and domain are derivable or unused downstream
+COMPACT_FIELDS = (
+    "url", "title", "snippet", "score", "published_date", "tier", "credibility", "chunks", "queries",
+    "backends", "also_at", "seen_before", "images", "error", "query"
+)
+COMPACT_IMAGE_FIELDS = ("url", "description")
+
+# Snippets are never trimmed below this many characters
+MIN_SNIPPET_CHARS = 80
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens in text.
+
+    Uses tiktoken when available and falls back to a four-characters-per-token estimate.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Token count
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def _get_encoding() -> Any:
+    """Load the tiktoken encoding once, or None if it is unavailable."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:  # tiktoken missing or encoding files unavailable offline
+            logger.info("tiktoken unavailable, estimating token counts")
+            _encoding = None
+    return _encoding
+
+
+def _project(result: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """Keep only the selected, non-empty fields of a result."""
+    projected = {}
+    for field in fields:
+        value = result.get(field)
+        if value in (None, "", []):
+            continue
+        if field == "images":
+            value = [{k: image[k] for k in COMPACT_IMAGE_FIELDS if image.get(k)} for image in value]
+        elif field == "score" and isinstance(value, float):
+            value = round(value, 3)
+        projected[field] = value
+    return projected
+
+
+def _trim_snippets(results: List[Dict[str, Any]], token_budget: int) -> None:
+    """Shorten snippets proportionally so the encoded results fit the token budget."""
+    encoded = json.dumps(results, ensure_ascii=False, separators=(",", ":"))
+    total = count_tokens(encoded)
+    if total <= token_budget:
+        return
+
+    snippet_tokens = sum(count_tokens(r.get("snippet", "")) for r in results)
+    if not snippet_tokens:
+        return
+    # Tokens left for snippets once the fixed overhead is paid
+    available = max(0, snippet_tokens - (total - token_budget))
+    ratio = available / snippet_tokens
+    for result in results:
+        snippet = result.get("snippet")
+        if not snippet:
+            continue
+        keep = max(MIN_SNIPPET_CHARS, int(len(snippet) * ratio))
+        if keep < len(snippet):
+            result["snippet"] = snippet[:max(0, keep - 3)] + "..."
+
+
+def serialize_results(
+    results: List[Dict[str, Any]],
+    output_format: str = "pretty",
+    token_budget: Optional[int] = None,
+    fields: Sequence[str] = COMPACT_FIELDS
+) -> Tuple[str, Dict[str, int]]:
+    """
+    Serialize search results for tool output.
+
+    "pretty" reproduces the indented JSON the plugin always returned. "compact"
+    minifies the JSON, projects each result onto ``fields`` and, when a token
+    budget is given, trims snippets proportionally to fit it. Both formats are a
+    JSON list of result objects.
+
+    Args:
+        results: Processed search results
+        output_format: "pretty" or "compact"
+        token_budget: Optional maximum number of tokens for the compact output
+        fields: Fields kept in compact mode
+
+    Returns:
+        Tuple[str, Dict[str, int]]: Serialized JSON and token statistics
+            (pretty_tokens, output_tokens, tokens_saved; only measured in compact mode)
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    pretty = json.dumps(results, ensure_ascii=False, indent=2)
+    if output_format == "pretty":
+        return pretty, {"pretty_tokens": 0, "output_tokens": 0, "tokens_saved": 0}
+
+    compact_results = [_project(r, fields) for r in results]
+    if token_budget:
+        _trim_snippets(compact_results, token_budget)
+    compact = json.dumps(compact_results, ensure_ascii=False, separators=(",", ":"))
+
+    pretty_tokens = count_tokens(pretty)
+    output_tokens = count_tokens(compact)
+    stats = {
+        "pretty_tokens": pretty_tokens,
+        "output_tokens": output_tokens,
+        "tokens_saved": pretty_tokens - output_tokens,
+    }
+    logger.info(f"Compact search output: {output_tokens} tokens ({stats['tokens_saved']} saved)")
+    return compact, stats
@@ -1,39 +1,141 @@
 """
 Search plugin for Tavily API integration.
 """
+import asyncio
 import datetime as dt
+import inspect
 import json
 import logging
 from typing import Any, Dict, List, Optional
 
 from semantic_kernel.functions import kernel_function
-from tavily import TavilyClient
+from semantic_kernel.kernel_pydantic import KernelBaseModel
 import os
+from plugins.search_cache import (MemorySearchCache, SearchCache, get_memory_cache,
+                                  get_search_cache, get_single_flight, make_cache_key)
+from plugins.search_backends import SearchBackend, TavilySearchBackend, build_federated_backend, get_search_backend
+from plugins.rate_limit import NON_RETRYABLE_ERRORS, backoff_delay, get_search_guard
+from plugins.result_serializer import serialize_results
+from plugins.dedup import ResultDeduplicator
+from plugins.rerank import rerank_results
+from plugins.credibility import COVERAGE_THRESHOLD, CredibilityScorer
+from plugins.adaptive_search import AdaptiveSearchController, build_escalation_plan
+from plugins.extraction import PageExtractor, get_page_extractor
+from plugins.evidence import EvidenceStore, get_evidence_store
+from plugins.blob_store import get_blob_store, offload_if_large, summarize_results
+from plugins.image_check import ImageChecker, get_image_checker
+from plugins.semantic_cache import SemanticQueryCache, get_query_cache
+from plugins.source_filters import filter_results, resolve_domain_filters
 from utils.util import truncate_text, validate_search_results
 
 logger = logging.getLogger(__name__)
 
 
+class SearchQuery(KernelBaseModel):
+    """A single query in a batched search request."""
+
+    query: str
+    top_k: Optional[int] = None
+    time_range: Optional[str] = None
+    topic: Optional[str] = None
+    search_depth: Optional[str] = None
+    include_image_descriptions: Optional[bool] = None
+    include_domains: Optional[List[str]] = None
+    exclude_domains: Optional[List[str]] = None
+    source_types: Optional[List[str]] = None
+
+
 class SearchPlugin:
     """Plugin for performing web searches using Tavily API."""
 
-    def __init__(self):
-        """Initialize the search plugin."""
-        self.client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+    def __init__(
+        self,
+        cache: Optional[SearchCache] = None,
+        memory_cache: Optional[MemorySearchCache] = None,
+        deduplicator: Optional[ResultDeduplicator] = None,
+        research_task: Optional[str] = None,
+        extractor: Optional[PageExtractor] = None,
+        evidence: Optional[EvidenceStore] = None,
+        backend: Optional[SearchBackend] = None,
+        image_checker: Optional[ImageChecker] = None,
+        query_cache: Optional[SemanticQueryCache] = None,
+        session_results: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
+        """
+        Initialize the search plugin.
+
+        Args:
+            cache: Optional persistent result cache (default from SEARCH_CACHE_PATH)
+            memory_cache: Optional in-memory result cache (default is shared process-wide)
+            deduplicator: Optional session deduplicator; share one between plugins to
+                dedupe across agents (default is one per plugin)
+            research_task: Optional research task that results are reranked against
+            extractor: Optional page extractor for full-page content (default uses the shared chunk store)
+            evidence: Optional evidence store that receives result snippets (default is shared process-wide)
+            backend: Optional search backend (default from SEARCH_BACKEND)
+            image_checker: Optional image checker (default uses the shared image cache;
+                disabled when SEARCH_CHECK_IMAGES is false)
+            query_cache: Optional paraphrase index over cached searches (default is shared
+                process-wide; disabled when SEARCH_SEMANTIC_CACHE is false)
+            session_results: Optional mapping of URL to result fields that assess_credibility
+                reads; share one between plugins so every agent of a session assesses the same
+                results (default is one per plugin)
+        """
+        self.client = backend if backend is not None else get_search_backend()
+        self.cache = cache if cache is not None else get_search_cache()
+        self.memory_cache = memory_cache if memory_cache is not None else get_memory_cache()
+        if query_cache is None and os.getenv("SEARCH_SEMANTIC_CACHE", "true").lower() == "true":
+            query_cache = get_query_cache()
+        self.query_cache = query_cache
+        self.single_flight = get_single_flight()
+        self.guard = get_search_guard()
+        self.max_retries = int(os.getenv("MAX_RETRIES", "3"))
+        self.timeout = float(os.getenv("SEARCH_TIMEOUT_SECONDS", "60"))
+        self.backoff_base = float(os.getenv("SEARCH_BACKOFF_BASE_SECONDS", "1"))
+        self.backoff_cap = float(os.getenv("SEARCH_BACKOFF_MAX_SECONDS", "30"))
+        self.tokens_saved = 0
+        self.deduplicator = deduplicator if deduplicator is not None else ResultDeduplicator(
+            max_distance=int(os.getenv("SEARCH_DEDUP_MAX_DISTANCE", "3"))
+        )
+        self.research_task = research_task
+        self.rerank_top_n = int(os.getenv("SEARCH_RERANK_TOP_N", "10"))
+        self.rerank_diversity = float(os.getenv("SEARCH_RERANK_DIVERSITY", "0.3"))
+        self.credibility = CredibilityScorer(
+            extract_domain=self._extract_domain,
+            preferred_domains=[d.strip() for d in os.getenv("SEARCH_PREFERRED_DOMAINS", "").split(",") if d.strip()]
+        )
+        self.session_results: Dict[str, Dict[str, Any]] = session_results if session_results is not None else {}
+        self.section_coverage: Dict[str, float] = {}
+        self.coverage_threshold = float(os.getenv("SEARCH_COVERAGE_THRESHOLD", str(COVERAGE_THRESHOLD)))
+        self.adaptive_max_steps = int(os.getenv("SEARCH_ADAPTIVE_MAX_STEPS", "6"))
+        self.adaptive_max_results = int(os.getenv("SEARCH_ADAPTIVE_MAX_RESULTS", "20"))
+        self.extractor = extractor if extractor is not None else get_page_extractor()
+        self.extract_top_n = int(os.getenv("SEARCH_EXTRACT_TOP_N", "0"))
+        self.evidence = evidence if evidence is not None else get_evidence_store()
+        self.blobs = get_blob_store()
+        self.blob_threshold = int(os.getenv("BLOB_THRESHOLD_CHARS", "0"))
+        if image_checker is None and os.getenv("SEARCH_CHECK_IMAGES", "true").lower() == "true":
+            image_checker = get_image_checker()
+        self.image_checker = image_checker
         logger.info("SearchPlugin initialized")
 
     @kernel_function(
         name="tavily_search",
         description="Perform comprehensive web search using Tavily API with advanced filtering and image support"
     )
-    def tavily_search(
+    async def tavily_search(
         self,
         query: str,
         top_k: int = None,
         time_range: Optional[str] = None,
         topic: str = "general",
         search_depth: str = "basic",
-        include_image_descriptions: bool = False
+        include_image_descriptions: bool = False,
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
+        source_types: Optional[List[str]] = None,
+        output_format: Optional[str] = None,
+        token_budget: Optional[int] = None
     ) -> str:
         """
         Perform web search using Tavily API with enhanced error handling.
@@ -45,6 +147,12 @@ class SearchPlugin:
             topic: Search topic ("general", "news", "finance")
             search_depth: Search depth ("basic", "advanced")
             include_image_descriptions: Include query-related images and descriptions
+            include_domains: Optional domains to restrict results to, e.g. ["anthropic.com"]
+            exclude_domains: Optional domains to drop from results
+            source_types: Optional source presets ("official_docs", "academic", "news",
+                "government", "code") added to include_domains
+            output_format: "pretty" or "compact" JSON (default from config)
+            token_budget: Optional token budget for compact output; snippets are trimmed to fit
 
         Returns:
             str: JSON string containing search results
@@ -54,28 +162,533 @@ class SearchPlugin:
         logger.info(
             f"Performing Tavily search - Query: '{truncate_text(query, 50)}', "
             f"Results: {top_k}, Time: {time_range}, Topic: {topic}, "
-            f"Depth: {search_depth}, Images: {include_image_descriptions}"
+            f"Depth: {search_depth}, Images: {include_image_descriptions}, "
+            f"Include: {include_domains}, Exclude: {exclude_domains}, Sources: {source_types}"
         )
 
         try:
-            # Build search parameters
-            search_params = self._build_search_params(
-                query, top_k, time_range, topic, search_depth, include_image_descriptions
+            results = await self._search(
+                query, top_k, time_range, topic, search_depth, include_image_descriptions,
+                include_domains, exclude_domains, source_types
             )
-            # Execute search with retry logic
-            response = self._execute_search_with_retry(search_params)
-
-            # Process and validate response
-            results = self._process_search_response(response, include_image_descriptions)
+            results = self.deduplicator.dedupe(results, query)
+            results = self._rerank(results, query, top_k)
+            self._annotate(results)
+            await self._extract_top(results)
+            await self._check_images(results)
 
             logger.info(f"Search completed successfully. Found {len(results)} results")
-            return json.dumps(results, ensure_ascii=False, indent=2)
+            return self._serialize(results, output_format, token_budget)
 
         except Exception as e:
             error_msg = f"Tavily search failed: {str(e)}"
             logger.error(error_msg)
             return json.dumps([{"error": error_msg}], ensure_ascii=False)
 
+    @kernel_function(
+        name="tavily_multi_search",
+        description=(
+            "Run several Tavily searches concurrently in a single call and return one merged, "
+            "deduplicated result list. Each query may set its own top_k, time_range, topic, "
+            "search_depth, include_image_descriptions, include_domains, exclude_domains and source_types."
+        )
+    )
+    async def tavily_multi_search(
+        self,
+        queries: List[SearchQuery],
+        max_concurrency: Optional[int] = None,
+        output_format: Optional[str] = None,
+        token_budget: Optional[int] = None
+    ) -> str:
+        """
+        Perform several web searches concurrently and merge the results.
+
+        Args:
+            queries: List of search specs, e.g. [{"query": "...", "time_range": "month"}].
+                Dictionaries, a JSON string or plain query strings are also accepted.
+            max_concurrency: Maximum number of searches in flight (default from config)
+            output_format: "pretty" or "compact" JSON (default from config)
+            token_budget: Optional token budget for compact output; snippets are trimmed to fit
+
+        Returns:
+            str: JSON string containing merged search results; each result records the
+                queries that returned it, and failed queries are reported as error entries
+        """
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("SEARCH_MAX_CONCURRENCY", "4"))
+
+        try:
+            specs = self._normalize_query_specs(queries)
+        except ValueError as e:
+            error_msg = f"Tavily multi search failed: {str(e)}"
+            logger.error(error_msg)
+            return json.dumps([{"error": error_msg}], ensure_ascii=False)
+
+        logger.info(f"Performing Tavily multi search - {len(specs)} queries, concurrency {max_concurrency}")
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                top_k = spec.get("top_k")
+                if top_k is None:
+                    top_k = int(os.getenv("DEFAULT_MAX_RESULTS", "5"))
+                return await self._search(
+                    spec["query"],
+                    int(top_k),
+                    spec.get("time_range"),
+                    spec.get("topic") or "general",
+                    spec.get("search_depth") or "basic",
+                    bool(spec.get("include_image_descriptions", False)),
+                    spec.get("include_domains"),
+                    spec.get("exclude_domains"),
+                    spec.get("source_types")
+                )
+
+        outcomes = await asyncio.gather(*(run(spec) for spec in specs), return_exceptions=True)
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        errors = []
+        for spec, outcome in zip(specs, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, Exception):
+                error_msg = f"Tavily search failed for '{truncate_text(spec['query'], 50)}': {str(outcome)}"
+                logger.error(error_msg)
+                errors.append({"error": error_msg, "query": spec["query"]})
+                continue
+            self._merge_results(merged, outcome, spec["query"])
+
+        results = sorted(merged.values(), key=lambda r: r.get("score") or 0.0, reverse=True)
+        results = self.deduplicator.dedupe(results)
+        requested = sum(int(spec.get("top_k") or os.getenv("DEFAULT_MAX_RESULTS", "5")) for spec in specs)
+        results = self._rerank(results, " ".join(spec["query"] for spec in specs), requested)
+        self._annotate(results)
+        await self._extract_top(results)
+        await self._check_images(results)
+        logger.info(
+            f"Multi search completed. {len(results)} unique results from {len(specs)} queries, "
+            f"{len(errors)} failed"
+        )
+        return self._serialize(results + errors, output_format, token_budget)
+
+    @kernel_function(
+        name="federated_search",
+        description=(
+            "Search several backends at once (e.g. Tavily web search and the local document index) "
+            "under one deadline and return a single fused, deduplicated result list. Use for "
+            "important sections that need more recall than one web search."
+        )
+    )
+    async def federated_search(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        backends: Optional[List[str]] = None,
+        deadline_seconds: Optional[float] = None,
+        output_format: Optional[str] = None,
+        token_budget: Optional[int] = None
+    ) -> str:
+        """
+        Search several backends concurrently and fuse the results with reciprocal-rank fusion.
+
+        Args:
+            query: Search query string
+            top_k: Maximum number of fused results (default from config)
+            backends: Registered backend names (default from SEARCH_FEDERATED_BACKENDS)
+            deadline_seconds: Time to wait for slow backends (default from config)
+            output_format: "pretty" or "compact" JSON (default from config)
+            token_budget: Optional token budget for compact output; snippets are trimmed to fit
+
+        Returns:
+            str: JSON string containing fused results; each records the backends that returned it,
+                and backends that failed or missed the deadline are reported as error entries
+        """
+        if top_k is None:
+            top_k = int(os.getenv("DEFAULT_MAX_RESULTS", "5"))
+
+        try:
+            federation = build_federated_backend(backends, deadline_seconds)
+            logger.info(
+                f"Performing federated search - Query: '{truncate_text(query, 50)}', "
+                f"Backends: {', '.join(federation.backends)}, Deadline: {federation.deadline}s"
+            )
+            search_params = self._build_search_params(query, top_k, None, "general", "basic", False)
+            response = await self._execute_cached_search(search_params, federation)
+            results = self._process_search_response(response, False)
+            results = self.deduplicator.dedupe(results, query)
+            results = self._rerank(results, query, top_k)
+            self._annotate(results)
+            await self._extract_top(results)
+            await self._check_images(results)
+        except Exception as e:
+            error_msg = f"Federated search failed: {str(e)}"
+            logger.error(error_msg)
+            return json.dumps([{"error": error_msg}], ensure_ascii=False)
+
+        errors = [
+            {"error": f"Backend {name} {status}", "query": query}
+            for name, status in (response.get("backends") or {}).items()
+            if status != "ok"
+        ]
+        logger.info(f"Federated search completed. {len(results)} results, {len(errors)} backend(s) missing")
+        return self._serialize(results + errors, output_format, token_budget)
+
+    @kernel_function(
+        name="adaptive_search",
+        description=(
+            "Research one outline section with as few searches as possible: start with a cheap basic "
+            "search and escalate (more results, advanced depth, sub_queries, then official docs, academic "
+            "and news sources) only while the section's measured coverage is below the 0.75 threshold."
+        )
+    )
+    async def adaptive_search(
+        self,
+        section: str,
+        query: Optional[str] = None,
+        sub_queries: Optional[List[str]] = None,
+        time_range: Optional[str] = None,
+        topic: str = "general",
+        output_format: Optional[str] = None,
+        token_budget: Optional[int] = None
+    ) -> str:
+        """
+        Search for an outline section, escalating only until coverage is met.
+
+        Args:
+            section: Outline section title
+            query: Main query for the section (default is the section title)
+            sub_queries: Optional narrower queries tried once the main query is exhausted
+            time_range: Optional time filter ("day", "week", "month", "year")
+            topic: Search topic ("general", "news", "finance")
+            output_format: "pretty" or "compact" JSON (default from config)
+            token_budget: Optional token budget for compact output; snippets are trimmed to fit
+
+        Returns:
+            str: JSON object with the section's coverage, whether it met the threshold,
+                the steps taken and the results
+        """
+        query = query or section
+        plan = build_escalation_plan(
+            query,
+            int(os.getenv("DEFAULT_MAX_RESULTS", "5")),
+            sub_queries,
+            max_top_k=self.adaptive_max_results
+        )
+
+        async def search(step: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return await self._search(
+                step["query"], step["top_k"], time_range, topic, step["search_depth"], False,
+                source_types=step.get("source_types")
+            )
+
+        def best_sources(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            # Weak early hits must not drag down a section that later searches have covered,
+            # so coverage is measured on, and results are returned from, the most credible sources
+            best = sorted(results, key=lambda r: self.credibility.score_result(r)["credibility"], reverse=True)
+            return best[:self.rerank_top_n] if self.rerank_top_n > 0 else best
+
+        def measure(results: List[Dict[str, Any]]) -> float:
+            return self.credibility.assess(best_sources(results))["coverage"]
+
+        controller = AdaptiveSearchController(
+            search, measure, merge=self._merge_results,
+            threshold=self.coverage_threshold, max_steps=self.adaptive_max_steps
+        )
+        logger.info(f"Performing adaptive search - Section: '{truncate_text(section, 50)}', {len(plan)} planned steps")
+
+        try:
+            outcome = await controller.run(plan)
+            results = best_sources(outcome["results"])
+            results = sorted(results, key=lambda r: r.get("score") or 0.0, reverse=True)
+            results = self.deduplicator.dedupe(results)
+            results = self._rerank(results, query)
+            self._annotate(results)
+            await self._extract_top(results)
+            await self._check_images(results)
+        except Exception as e:
+            error_msg = f"Adaptive search failed: {str(e)}"
+            logger.error(error_msg)
+            return json.dumps([{"error": error_msg}], ensure_ascii=False)
+
+        self.section_coverage[section] = outcome["coverage"]
+        logger.info(
+            f"Adaptive search completed for '{truncate_text(section, 50)}': coverage {outcome['coverage']} "
+            f"after {len(outcome['steps'])} step(s), threshold {'met' if outcome['met'] else 'not met'}"
+        )
+        return json.dumps({
+            "section": section,
+            "coverage": outcome["coverage"],
+            "threshold": outcome["threshold"],
+            "met": outcome["met"],
+            "steps": outcome["steps"],
+            "results": json.loads(self._serialize(results, output_format, token_budget)),
+        }, ensure_ascii=False, separators=(",", ":"))
+
+    def _rerank(self, results: List[Dict[str, Any]], query: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Rerank results against the query and research task, keeping a diverse top-N.
+
+        The caller's top_k is never cut short: at least that many results are kept.
+        """
+        if self.rerank_top_n <= 0:
+            return results
+        task = " ".join(part for part in (query, self.research_task) if part)
+        return rerank_results(results, task, max(top_k or 0, self.rerank_top_n), self.rerank_diversity)
+
+    def _serialize(
+        self,
+        results: List[Dict[str, Any]],
+        output_format: Optional[str],
+        token_budget: Optional[int]
+    ) -> str:
+        """Serialize results in the requested format, track tokens saved and offload large outputs."""
+        output_format = output_format or os.getenv("SEARCH_OUTPUT_FORMAT", "pretty")
+        if token_budget is None and os.getenv("SEARCH_TOKEN_BUDGET"):
+            token_budget = int(os.getenv("SEARCH_TOKEN_BUDGET"))
+        try:
+            output, stats = serialize_results(results, output_format, token_budget)
+        except ValueError as e:
+            logger.warning(f"{e}; falling back to pretty output")
+            output, stats = serialize_results(results, "pretty")
+        self.tokens_saved += stats["tokens_saved"]
+        return offload_if_large(output, summarize_results(results), self.blob_threshold, self.blobs)
+
+    @kernel_function(
+        name="assess_credibility",
+        description=(
+            "Deterministically score source credibility (tier, recency) and estimate coverage "
+            "(0.0-1.0) for search results. Pass the URLs to assess, or nothing to assess every "
+            "result returned in this research session so far. Results flagged needs_review have unknown "
+            "sources and need manual judgement."
+        )
+    )
+    def assess_credibility(self, urls: Optional[List[str]] = None) -> str:
+        """
+        Score credibility and estimate coverage without an LLM.
+
+        Args:
+            urls: URLs to assess (default: every result returned in this session)
+
+        Returns:
+            str: JSON object with coverage, per-result scores and metrics
+        """
+        if urls:
+            results = [self.session_results.get(url, {"url": url}) for url in urls]
+        else:
+            results = list(self.session_results.values())
+        assessment = self.credibility.assess(results)
+        logger.info(
+            f"Credibility assessment: coverage {assessment['coverage']} over "
+            f"{assessment['metrics']['sources']} sources"
+        )
+        return json.dumps(assessment, ensure_ascii=False, separators=(",", ":"))
+
+    def _annotate(self, results: List[Dict[str, Any]]) -> None:
+        """Attach credibility fields, remember results for assessment and store snippets as evidence."""
+        self.credibility.annotate(results)
+        self.evidence.add_results(results)
+        for result in results:
+            if result.get("url") and "error" not in result and not result.get("seen_before"):
+                self.session_results[result["url"]] = {
+                    "url": result["url"],
+                    "published_date": result.get("published_date", ""),
+                    "domain": result.get("domain", ""),
+                }
+
+    async def _extract_top(self, results: List[Dict[str, Any]]) -> None:
+        """Extract full content of the top results and record their chunk counts."""
+        if self.extract_top_n <= 0:
+            return
+        top = [r for r in results if r.get("url") and "error" not in r and not r.get("seen_before")]
+        top = top[:self.extract_top_n]
+        try:
+            pages = await self.extractor.extract([r["url"] for r in top])
+        except Exception as e:
+            logger.warning(f"Page extraction skipped: {e}")
+            return
+        chunk_counts = {page["url"]: page.get("chunks", 0) for page in pages}
+        for result in top:
+            if chunk_counts.get(result["url"]):
+                result["chunks"] = chunk_counts[result["url"]]
+
+    async def _check_images(self, results: List[Dict[str, Any]]) -> None:
+        """Keep only live images not already returned in this session.
+
+        The images of all results are checked concurrently; images of a result
+        whose check fails are dropped rather than passed on unverified.
+        """
+        if self.image_checker is None:
+            return
+        with_images = [result for result in results if result.get("images")]
+        outcomes = await asyncio.gather(
+            *(self.image_checker.check(result["images"]) for result in with_images), return_exceptions=True
+        )
+        for result, images in zip(with_images, outcomes):
+            if isinstance(images, asyncio.CancelledError):
+                raise images
+            if isinstance(images, Exception):
+                logger.warning(f"Image check failed for {result.get('url', 'result')}, dropping its images: {images}")
+                images = []
+            if images:
+                result["images"] = images
+            else:
+                del result["images"]
+
+    async def _search(
+        self,
+        query: str,
+        top_k: int,
+        time_range: Optional[str],
+        topic: str,
+        search_depth: str,
+        include_image_descriptions: bool,
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
+        source_types: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Build parameters, execute the search and process the response."""
+        search_params = self._build_search_params(
+            query, top_k, time_range, topic, search_depth, include_image_descriptions,
+            include_domains, exclude_domains, source_types
+        )
+        # Execute search through the cache with retry logic
+        response = await self._execute_cached_search(search_params)
+
+        # Process and validate response
+        results = self._process_search_response(response, include_image_descriptions)
+        return filter_results(
+            results, search_params.get("include_domains", []), search_params.get("exclude_domains", [])
+        )
+
+    async def _execute_cached_search(
+        self,
+        search_params: Dict[str, Any],
+        backend: Optional[SearchBackend] = None
+    ) -> Dict[str, Any]:
+        """Serve the search from memory, an identical in-flight call, or the persistent cache."""
+        backend = backend if backend is not None else self.client
+        cache_params = self._cache_params(search_params, backend)
+        response = self.memory_cache.get(cache_params)
+        if response is not None:
+            logger.info(f"Search memory cache hit for '{truncate_text(search_params.get('query', ''), 50)}'")
+            self._record_cache("exact")
+            return response
+
+        response = await self._lookup_paraphrase(cache_params)
+        if response is not None:
+            return response
+
+        return await self.single_flight.do(
+            make_cache_key(cache_params),
+            lambda: self._fetch_and_cache(search_params, cache_params, backend)
+        )
+
+    async def _fetch_and_cache(
+        self,
+        search_params: Dict[str, Any],
+        cache_params: Dict[str, Any],
+        backend: SearchBackend
+    ) -> Dict[str, Any]:
+        """Fetch from the persistent cache or the backend and populate the caches."""
+        response = None
+        if self.cache is not None:
+            response = await asyncio.to_thread(self.cache.get, cache_params)
+            if response is not None:
+                logger.info(f"Search cache hit for '{truncate_text(search_params.get('query', ''), 50)}'")
+                self._record_cache("exact")
+
+        if response is None:
+            self._record_cache("miss")
+            response = await self._execute_search_with_retry(search_params, backend)
+            if response.get("partial"):
+                # Do not pin results that are missing a backend
+                return response
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.set, cache_params, response)
+
+        self.memory_cache.set(cache_params, response)
+        if self.query_cache is not None:
+            self.query_cache.add(cache_params)
+        return response
+
+    async def _lookup_paraphrase(self, cache_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Serve a cached response of an equivalent, differently worded search."""
+        if self.query_cache is None:
+            return None
+        match = self.query_cache.lookup(cache_params)
+        if match is None:
+            return None
+        response = self.memory_cache.get(match.params)
+        if response is None and self.cache is not None:
+            response = await asyncio.to_thread(self.cache.get, match.params)
+        if response is None:
+            return None
+        logger.info(
+            f"Search {match.kind} cache hit for '{truncate_text(cache_params.get('query', ''), 50)}' "
+            f"via '{truncate_text(match.params.get('query', ''), 50)}' ({match.similarity:.2f})"
+        )
+        self.query_cache.record(match.kind)
+        self.memory_cache.set(cache_params, response)
+        return response
+
+    def _record_cache(self, kind: str) -> None:
+        if self.query_cache is not None:
+            self.query_cache.record(kind)
+
+    def _cache_params(self, search_params: Dict[str, Any], backend: SearchBackend) -> Dict[str, Any]:
+        """Key cache entries by backend so fixture, federated and live responses never mix."""
+        name = getattr(backend, "name", "tavily")
+        if not isinstance(name, str) or name == "tavily":
+            return search_params
+        if isinstance(getattr(backend, "backends", None), dict):
+            name = f"{name}:{','.join(sorted(backend.backends))}"
+        return {**search_params, "backend": name}
+
+    def _normalize_query_specs(self, queries: Any) -> List[Dict[str, Any]]:
+        """Turn the queries argument into a list of search spec dictionaries."""
+        if isinstance(queries, str):
+            try:
+                queries = json.loads(queries)
+            except json.JSONDecodeError:
+                queries = [queries]
+        if isinstance(queries, dict):
+            queries = [queries]
+        if not isinstance(queries, list) or not queries:
+            raise ValueError("queries must be a non-empty list")
+
+        specs = []
+        for item in queries:
+            if isinstance(item, SearchQuery):
+                item = item.model_dump(exclude_none=True)
+            elif isinstance(item, str):
+                item = {"query": item}
+            if not isinstance(item, dict) or not str(item.get("query", "")).strip():
+                raise ValueError(f"Invalid query spec: {item}")
+            specs.append(item)
+        return specs
+
+    def _merge_results(
+        self,
+        merged: Dict[str, Dict[str, Any]],
+        results: List[Dict[str, Any]],
+        query: str
+    ) -> None:
+        """Merge results into ``merged`` keyed by URL, keeping the best scored copy."""
+        for result in results:
+            key = result.get("url") or f"{result.get('title', '')}|{result.get('snippet', '')}"
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = {**result, "queries": [query]}
+                continue
+            if query not in existing["queries"]:
+                existing["queries"].append(query)
+            if (result.get("score") or 0.0) > (existing.get("score") or 0.0):
+                images = existing.get("images")
+                existing.update({k: v for k, v in result.items() if k != "images"})
+                if images and "images" not in result:
+                    existing["images"] = images
+            elif result.get("images") and not existing.get("images"):
+                existing["images"] = result["images"]
+
     def _build_search_params(
         self,
         query: str,
@@ -83,9 +696,17 @@ class SearchPlugin:
         time_range: Optional[str],
         topic: str,
         search_depth: str,
-        include_image_descriptions: bool
+        include_image_descriptions: bool,
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
+        source_types: Optional[List[str]] = None
     ) -> Dict[str, Any]:
-        """Build search parameters dictionary."""
+        """Build search parameters dictionary.
+
+        Raises:
+            ValueError: If a domain is invalid, a source type is unknown, or a domain
+                is both included and excluded
+        """
         search_params = {
             "query": query,
             "max_results": min(top_k, 50),  # Limit to reasonable maximum
@@ -101,15 +722,31 @@ class SearchPlugin:
         valid_time_ranges = ["day", "week", "month", "year"]
         if time_range and time_range in valid_time_ranges:
             search_params["time_range"] = time_range
+        include, exclude = resolve_domain_filters(include_domains, exclude_domains, source_types)
+        if include:
+            search_params["include_domains"] = include
+        if exclude:
+            search_params["exclude_domains"] = exclude
         return search_params
 
-    def _execute_search_with_retry(self, search_params: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute search with retry logic."""
+    async def _execute_search_with_retry(
+        self,
+        search_params: Dict[str, Any],
+        backend: Optional[SearchBackend] = None
+    ) -> Dict[str, Any]:
+        """Execute search with retry logic.
+
+        Every attempt passes through the process-wide SearchGuard (token bucket and
+        circuit breaker) and reports its outcome; an attempt without one releases the guard. Backoff is jittered, honours Retry-After, and uses
+        ``asyncio.sleep`` so other agents keep running while a search waits.
+        """
         last_exception = None
 
-        for attempt in range(int(os.getenv("MAX_RETRIES", 3))):
+        for attempt in range(self.max_retries):
+            await self.guard.acquire()
+            settled = False
             try:
-                response = self.client.search(**search_params)
+                response = await asyncio.wait_for(self._call_client(search_params, backend), timeout=self.timeout)
 
                 # Handle string response
                 if isinstance(response, str):
@@ -121,19 +758,55 @@ class SearchPlugin:
                 if not isinstance(response, dict):
                     raise ValueError(f"Unexpected response type: {type(response)}")
 
+                if self._guarded_backend_answered(response):
+                    self.guard.record_success()
+                    settled = True
                 return response
 
+            except asyncio.CancelledError:
+                logger.info("Search cancelled")
+                raise
+            except NON_RETRYABLE_ERRORS:
+                raise
             except Exception as e:
                 last_exception = e
+                retry_after = self.guard.record_failure(e)
+                settled = True
                 logger.warning(f"Search attempt {attempt + 1} failed: {e}")
 
-                if attempt < int(os.getenv("MAX_RETRIES", 3)) - 1:
-                    # Exponential backoff
-                    import time
-                    time.sleep(2 ** attempt)
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(
+                        backoff_delay(attempt, self.backoff_base, self.backoff_cap, retry_after)
+                    )
+            finally:
+                # A half-open probe that was cancelled or proved nothing must not hold the circuit shut
+                if not settled:
+                    self.guard.release()
 
         raise last_exception
 
+    @staticmethod
+    def _guarded_backend_answered(response: Dict[str, Any]) -> bool:
+        """Return False if a federated response shows that Tavily, which the guard protects, did not answer."""
+        statuses = response.get("backends")
+        if not isinstance(statuses, dict):
+            return True
+        return statuses.get(TavilySearchBackend.name) == "ok"
+
+    async def _call_client(self, search_params: Dict[str, Any], backend: Optional[SearchBackend] = None) -> Any:
+        """Call the search client without blocking the event loop.
+
+        Async clients are awaited directly; a synchronous client is pushed to a
+        worker thread so it cannot stall other agents.
+        """
+        search = (backend if backend is not None else self.client).search
+        if inspect.iscoroutinefunction(search):
+            return await search(**search_params)
+        response = await asyncio.to_thread(search, **search_params)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
     def _process_search_response(
         self,
         response: Dict[str, Any],
@@ -157,6 +830,8 @@ class SearchPlugin:
                 "published_date": result.get('published_date', ''),
                 "domain": self._extract_domain(result.get('url', ''))
             }
+            if result.get('backends'):
+                result_data['backends'] = result['backends']
             # Add additional metadata if available
             if 'raw_content' in result and result['raw_content'] is not None:
                 result_data['raw_content'] = truncate_text(result['raw_content'], 500)
@@ -203,6 +878,6 @@ class SearchPlugin:
         try:
             from urllib.parse import urlparse
             parsed = urlparse(url)
-            return parsed.netloc
+            return "local" if parsed.scheme == "file" else parsed.netloc
         except Exception:
             return ""
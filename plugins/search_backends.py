@@ -0,0 +1,395 @@
+"""
+Search backends behind SearchPlugin: Tavily, recorded fixtures, a local index, a recorder and federation.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+from typing import Any, Callable, Dict, List, Optional, Protocol, runtime_checkable
+
+from plugins.dedup import canonical_url_key
+from plugins.local_index import LocalIndexBackend, get_local_index
+from plugins.rerank import tokenize
+from plugins.search_clients import SharedTavilyClient
+
+logger = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class SearchBackend(Protocol):
+    """A search source returning Tavily-shaped responses.
+
+    ``search`` receives the parameters built by SearchPlugin._build_search_params
+    and returns ``{"results": [{"url", "title", "content", "score", ...}], "images": [...]}``.
+    """
+
+    name: str
+
+    async def search(self, **params: Any) -> Dict[str, Any]:
+        """Run a search."""
+        ...
+
+
+class TavilySearchBackend(SharedTavilyClient):
+    """Tavily API backend using the process-wide pooled client."""
+
+    name = "tavily"
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(str(query).lower().split())
+
+
+class FixtureSearchBackend:
+    """Offline backend serving recorded responses.
+
+    Responses are looked up by normalized query. Unknown queries are answered
+    from the pool of every recorded result, ranked by term overlap, so load
+    tests with arbitrary queries still get plausible results. Latency and
+    failures can be injected to exercise timeouts, retries and the circuit
+    breaker deterministically.
+    """
+
+    name = "fixture"
+
+    def __init__(
+        self,
+        responses: Optional[Dict[str, Dict[str, Any]]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        fail_first: int = 0,
+        error_factory: Optional[Callable[[], BaseException]] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            responses: Recorded responses keyed by query
+            latency: Seconds added to every call
+            jitter: Maximum extra random latency in seconds
+            error_rate: Probability that a call raises an injected error
+            fail_first: Number of initial calls that always fail
+            error_factory: Builds the injected exception (default ConnectionError)
+            seed: Seed for reproducible jitter and error injection
+        """
+        self.responses = {_normalize_query(q): r for q, r in (responses or {}).items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.error_factory = error_factory or (lambda: ConnectionError("Injected fixture backend failure"))
+        self.calls = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs: Any) -> "FixtureSearchBackend":
+        """
+        Load recorded responses from a JSONL file written by RecordingSearchBackend.
+
+        Args:
+            path: JSONL file with one {"query", "response"} object per line
+            **kwargs: Other constructor arguments
+
+        Returns:
+            FixtureSearchBackend: Backend serving the recorded responses
+        """
+        responses: Dict[str, Dict[str, Any]] = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    responses[record["query"]] = record["response"]
+        logger.info(f"Loaded {len(responses)} recorded search responses from {path}")
+        return cls(responses, **kwargs)
+
+    async def search(self, **params: Any) -> Dict[str, Any]:
+        """Serve a recorded response after the configured latency, or raise an injected error."""
+        with self._lock:
+            self.calls += 1
+            fail = self.calls <= self.fail_first or self._random.random() < self.error_rate
+            delay = self.latency + self._random.uniform(0, self.jitter) if self.jitter else self.latency
+            if fail:
+                self.errors += 1
+        if delay:
+            await asyncio.sleep(delay)
+        if fail:
+            raise self.error_factory()
+
+        query = params.get("query", "")
+        max_results = int(params.get("max_results") or 5)
+        response = self.responses.get(_normalize_query(query))
+        if response is None:
+            return {"query": query, "results": self._rank_pool(query, max_results), "images": []}
+        response = json.loads(json.dumps(response))  # callers may mutate the result
+        response["results"] = response.get("results", [])[:max_results]
+        if not params.get("include_images"):
+            response["images"] = []
+        return response
+
+    def _rank_pool(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Rank every recorded result by query term overlap."""
+        terms = set(tokenize(query))
+        seen, scored = set(), []
+        for response in self.responses.values():
+            for result in response.get("results", []):
+                url = result.get("url")
+                if not url or url in seen:
+                    continue
+                seen.add(url)
+                text = set(tokenize(f"{result.get('title', '')} {result.get('content', '')}"))
+                overlap = len(terms & text) / len(terms) if terms else 0.0
+                if overlap:
+                    scored.append({**result, "score": round(overlap, 3)})
+        scored.sort(key=lambda r: r["score"], reverse=True)
+        return scored[:max_results]
+
+
+class RecordingSearchBackend:
+    """Wrap a backend and append every response to a JSONL fixture file.
+
+    Attributes other than ``search`` (such as a federation's ``backends``)
+    are read from the wrapped backend.
+    """
+
+    def __init__(self, inner: SearchBackend, path: str):
+        """
+        Initialize the recorder.
+
+        Args:
+            inner: Backend that serves the searches
+            path: JSONL file to append recorded responses to
+        """
+        self.inner = inner
+        self.path = path
+        self.name = getattr(inner, "name", "recording")
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    async def search(self, **params: Any) -> Dict[str, Any]:
+        """Run the search on the wrapped backend and record the response."""
+        response = await self.inner.search(**params)
+        line = json.dumps({"query": params.get("query", ""), "params": params, "response": response}, ensure_ascii=False)
+        await asyncio.to_thread(self._append, line)
+        return response
+
+    def _append(self, line: str) -> None:
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+
+def reciprocal_rank_fusion(
+    ranked: Dict[str, List[Dict[str, Any]]],
+    k: int = 60,
+    weights: Optional[Dict[str, float]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fuse ranked result lists with reciprocal-rank fusion.
+
+    Each result earns ``weight / (k + rank)`` from every list it appears in;
+    results are matched on canonical URL so mirrors and tracking variants merge.
+
+    Args:
+        ranked: Result lists in rank order, keyed by backend name
+        k: RRF damping constant
+        weights: Optional per-backend weights (default 1.0)
+
+    Returns:
+        List[Dict[str, Any]]: Fused results, best first, each with ``rrf_score``
+            and the ``backends`` that returned it
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for backend, results in ranked.items():
+        weight = (weights or {}).get(backend, 1.0)
+        for rank, result in enumerate(results, start=1):
+            url = result.get("url")
+            if not url:
+                continue
+            key = canonical_url_key(url)
+            entry = fused.get(key)
+            if entry is None:
+                entry = fused[key] = {**result, "rrf_score": 0.0, "backends": []}
+            elif (result.get("score") or 0.0) > (entry.get("score") or 0.0):
+                entry.update({k_: v for k_, v in result.items() if k_ not in ("url", "rrf_score", "backends")})
+            entry["rrf_score"] += weight / (k + rank)
+            if backend not in entry["backends"]:
+                entry["backends"].append(backend)
+    results = sorted(fused.values(), key=lambda r: r["rrf_score"], reverse=True)
+    for result in results:
+        result["rrf_score"] = round(result["rrf_score"], 5)
+    return results
+
+
+class FederatedSearchBackend:
+    """Query several backends concurrently under one deadline and fuse the results.
+
+    Latency is that of the slowest backend within the deadline. Backends that
+    miss the deadline or fail are reported in ``backends`` and the response is
+    marked ``partial``; only when every backend fails is an error raised.
+    """
+
+    name = "federated"
+
+    def __init__(
+        self,
+        backends: Dict[str, SearchBackend],
+        deadline: float = 8.0,
+        rrf_k: int = 60,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize the federation.
+
+        Args:
+            backends: Backends keyed by name
+            deadline: Seconds to wait for all backends before returning partial results
+            rrf_k: Reciprocal-rank fusion constant
+            weights: Optional per-backend fusion weights
+        """
+        if not backends:
+            raise ValueError("FederatedSearchBackend needs at least one backend")
+        self.backends = backends
+        self.deadline = deadline
+        self.rrf_k = rrf_k
+        self.weights = weights
+
+    async def search(self, **params: Any) -> Dict[str, Any]:
+        """Run the search on every backend and fuse what arrives before the deadline."""
+        tasks = {
+            name: asyncio.ensure_future(backend.search(**params))
+            for name, backend in self.backends.items()
+        }
+        pending = set(tasks.values())
+        try:
+            _, pending = await asyncio.wait(pending, timeout=self.deadline)
+        finally:
+            # Also reached when the caller is cancelled: never leave backend calls running
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        ranked: Dict[str, List[Dict[str, Any]]] = {}
+        statuses: Dict[str, str] = {}
+        images: List[Any] = []
+        errors: List[BaseException] = []
+        for name, task in tasks.items():
+            if task in pending:
+                statuses[name] = "timeout"
+                continue
+            error = task.exception()
+            if error is not None:
+                statuses[name] = f"error: {error}"
+                errors.append(error)
+                continue
+            response = task.result() or {}
+            ranked[name] = [r for r in response.get("results") or [] if isinstance(r, dict)]
+            images.extend(response.get("images") or [])
+            statuses[name] = "ok"
+
+        if not ranked:
+            if errors:
+                raise errors[0]
+            raise asyncio.TimeoutError(f"No search backend answered within {self.deadline}s")
+        if len(ranked) < len(tasks):
+            logger.warning(f"Federated search returned partial results: {statuses}")
+
+        max_results = int(params.get("max_results") or 5)
+        fused = reciprocal_rank_fusion(ranked, self.rrf_k, self.weights)[:max_results]
+        # Backend scores are not comparable; expose the fused rank as the score
+        best = fused[0]["rrf_score"] if fused else 1.0
+        for result in fused:
+            result["score"] = round(result["rrf_score"] / best, 3)
+        return {
+            "query": params.get("query", ""),
+            "results": fused,
+            "images": images,
+            "backends": statuses,
+            "partial": len(ranked) < len(tasks),
+        }
+
+
+_factories: Dict[str, Callable[[], SearchBackend]] = {}
+
+
+def register_search_backend(name: str, factory: Callable[[], SearchBackend]) -> None:
+    """
+    Register a backend factory under a name usable in SEARCH_BACKEND.
+
+    Args:
+        name: Backend name
+        factory: Zero-argument callable returning a backend
+    """
+    _factories[name] = factory
+
+
+def _fixture_backend() -> FixtureSearchBackend:
+    path = os.getenv("SEARCH_FIXTURE_PATH")
+    kwargs = {
+        "latency": float(os.getenv("SEARCH_FIXTURE_LATENCY_MS", "0")) / 1000,
+        "jitter": float(os.getenv("SEARCH_FIXTURE_JITTER_MS", "0")) / 1000,
+        "error_rate": float(os.getenv("SEARCH_FIXTURE_ERROR_RATE", "0")),
+        "seed": int(os.environ["SEARCH_FIXTURE_SEED"]) if os.getenv("SEARCH_FIXTURE_SEED") else None,
+    }
+    return FixtureSearchBackend.from_file(path, **kwargs) if path else FixtureSearchBackend(**kwargs)
+
+
+def build_federated_backend(names: Optional[List[str]] = None, deadline: Optional[float] = None) -> FederatedSearchBackend:
+    """
+    Create a federation over registered backends.
+
+    Args:
+        names: Registered backend names (default from SEARCH_FEDERATED_BACKENDS)
+        deadline: Seconds to wait for backends (default from SEARCH_FEDERATED_DEADLINE_SECONDS)
+
+    Returns:
+        FederatedSearchBackend: Federation over the named backends
+    """
+    if not names:
+        names = [n.strip() for n in os.getenv("SEARCH_FEDERATED_BACKENDS", "tavily").split(",") if n.strip()]
+    names = [n for n in dict.fromkeys(names) if n != FederatedSearchBackend.name]
+    if deadline is None:
+        deadline = float(os.getenv("SEARCH_FEDERATED_DEADLINE_SECONDS", "8"))
+    return FederatedSearchBackend({name: get_search_backend(name) for name in names}, deadline=deadline)
+
+
+register_search_backend("tavily", TavilySearchBackend)
+register_search_backend("fixture", _fixture_backend)
+register_search_backend("federated", build_federated_backend)
+register_search_backend("local", lambda: LocalIndexBackend(get_local_index()))
+
+
+def get_search_backend(name: Optional[str] = None) -> SearchBackend:
+    """
+    Create the configured search backend.
+
+    Args:
+        name: Registered backend name (default from SEARCH_BACKEND, "tavily" if unset)
+
+    Returns:
+        SearchBackend: Backend instance, wrapped in a recorder when SEARCH_RECORD_PATH is set
+            (a federation is not wrapped; its member backends are)
+
+    Raises:
+        ValueError: If no backend is registered under the name
+    """
+    name = name or os.getenv("SEARCH_BACKEND", "tavily")
+    factory = _factories.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown search backend: {name} (registered: {', '.join(sorted(_factories))})")
+    backend = factory()
+    record_path = os.getenv("SEARCH_RECORD_PATH")
+    # A federation's members are recorded individually; recording the fused response too would duplicate them
+    if record_path and not isinstance(backend, FederatedSearchBackend):
+        backend = RecordingSearchBackend(backend, record_path)
+    return backend
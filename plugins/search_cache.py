@@ -0,0 +1,329 @@
+"""
+Persistent search result cache backed by SQLite.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached response stays fresh, keyed by the search's time_range.
+# Narrow time windows go stale quickly; unbounded searches change slowly.
+DEFAULT_TTLS: Dict[Optional[str], int] = {
+    "day": 60 * 60,
+    "week": 6 * 60 * 60,
+    "month": 24 * 60 * 60,
+    "year": 3 * 24 * 60 * 60,
+    None: 7 * 24 * 60 * 60,
+}
+
+
+def normalize_search_params(search_params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize search parameters so equivalent requests share a cache key.
+
+    Args:
+        search_params: Parameters as built by SearchPlugin._build_search_params
+
+    Returns:
+        Dict[str, Any]: Normalized copy with a canonical query and no empty values
+    """
+    normalized = {}
+    for key, value in search_params.items():
+        if value is None or value is False:
+            continue
+        if key == "query":
+            value = " ".join(str(value).lower().split())
+        elif isinstance(value, (list, tuple, set)):
+            value = sorted(str(v).lower() for v in value)
+        normalized[key] = value
+    return normalized
+
+
+def make_cache_key(search_params: Dict[str, Any]) -> str:
+    """Build a stable cache key from search parameters."""
+    payload = json.dumps(normalize_search_params(search_params), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """SQLite-backed cache of raw search responses with time_range aware TTLs."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 5000,
+        ttls: Optional[Dict[Optional[str], int]] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file (":memory:" for a private in-memory cache)
+            max_entries: Maximum number of cached responses before LRU eviction
+            ttls: Optional override of DEFAULT_TTLS
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_access ON search_cache(last_access)")
+        self._conn.commit()
+        logger.info(f"SearchCache initialized at {path}")
+
+    def ttl_for(self, search_params: Dict[str, Any]) -> int:
+        """Return the TTL in seconds for the given search parameters."""
+        return self.ttls.get(search_params.get("time_range"), self.ttls[None])
+
+    def get(self, search_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            search_params: Search parameters
+
+        Returns:
+            Optional[Dict[str, Any]]: Cached response, or None if missing or expired
+        """
+        key = make_cache_key(search_params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, search_params: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """
+        Store a response and evict the least recently used entries beyond max_entries.
+
+        Args:
+            search_params: Search parameters
+            response: Raw search response
+        """
+        key = make_cache_key(search_params)
+        now = time.time()
+        payload = json.dumps(response, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, response, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, now, now + self.ttl_for(search_params), now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then the least recently used ones over capacity."""
+        self._conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+        count = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM search_cache WHERE key IN "
+                "(SELECT key FROM search_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+            self.evictions += overflow
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current number of entries."""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": size,
+        }
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class MemorySearchCache:
+    """Thread-safe in-memory LRU of raw search responses with time_range aware TTLs."""
+
+    def __init__(self, max_entries: int = 1000, ttls: Optional[Dict[Optional[str], int]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of responses kept in memory (0 disables the cache)
+            ttls: Optional override of DEFAULT_TTLS
+        """
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, search_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached response or None."""
+        key = make_cache_key(search_params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, search_params: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """Store a response, evicting the least recently used entries over capacity."""
+        if self.max_entries <= 0:
+            return
+        key = make_cache_key(search_params)
+        ttl = self.ttls.get(search_params.get("time_range"), self.ttls[None])
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current number of entries."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        """Remove every cached entry and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class SingleFlight:
+    """Collapse concurrent identical searches into one upstream call.
+
+    The shared call runs as its own task, so a caller that is cancelled does
+    not cancel the search for the other callers waiting on it.
+    """
+
+    def __init__(self):
+        """Initialize the in-flight registry."""
+        self.shared = 0
+        self._inflight: Dict[Tuple[int, str], "asyncio.Task[Any]"] = {}
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``factory`` once per key among concurrent callers on the same event loop.
+
+        Args:
+            key: Request key
+            factory: Coroutine factory performing the upstream call
+
+        Returns:
+            Any: The shared result
+        """
+        loop = asyncio.get_running_loop()
+        inflight_key = (id(loop), key)
+        task = self._inflight.get(inflight_key)
+        if task is None or task.done():
+            task = loop.create_task(factory())
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda t: self._forget(inflight_key, t))
+        else:
+            self.shared += 1
+            logger.info("Joining in-flight search for identical request")
+        return await asyncio.shield(task)
+
+    def _forget(self, inflight_key: Tuple[int, str], task: "asyncio.Task[Any]") -> None:
+        """Drop a finished task and mark its exception as retrieved."""
+        if self._inflight.get(inflight_key) is task:
+            del self._inflight[inflight_key]
+        if not task.cancelled():
+            task.exception()
+
+
+_memory_cache: Optional[MemorySearchCache] = None
+_single_flight = SingleFlight()
+_caches: Dict[str, SearchCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_search_cache(path: Optional[str] = None) -> Optional[SearchCache]:
+    """
+    Return the process-wide cache for a path.
+
+    Args:
+        path: Database path (default from SEARCH_CACHE_PATH; caching is disabled if unset)
+
+    Returns:
+        Optional[SearchCache]: Shared cache instance, or None when caching is disabled
+    """
+    path = path or os.getenv("SEARCH_CACHE_PATH")
+    if not path:
+        return None
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = SearchCache(path, max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000")))
+            _caches[path] = cache
+        return cache
+
+
+def get_memory_cache() -> MemorySearchCache:
+    """Return the process-wide in-memory search cache."""
+    global _memory_cache
+    with _caches_lock:
+        if _memory_cache is None:
+            _memory_cache = MemorySearchCache(
+                max_entries=int(os.getenv("SEARCH_MEMORY_CACHE_MAX_ENTRIES", "1000"))
+            )
+        return _memory_cache
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide single-flight registry."""
+    return _single_flight
@@ -0,0 +1,101 @@
+"""
+Shared, connection-pooled search clients.
+"""
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from tavily import AsyncTavilyClient
+
+logger = logging.getLogger(__name__)
+
+
+def _pool_limits() -> httpx.Limits:
+    """Build connection pool limits from the environment."""
+    return httpx.Limits(
+        max_connections=int(os.getenv("SEARCH_POOL_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("SEARCH_POOL_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=float(os.getenv("SEARCH_POOL_KEEPALIVE_EXPIRY", "30")),
+    )
+
+
+class SearchClientRegistry:
+    """Registry of pooled Tavily clients shared by every plugin in the process.
+
+    httpx connections belong to the event loop that opened them, so one pooled
+    client is kept per (event loop, API key). Within a loop every SearchPlugin and
+    orchestration reuses the same keep-alive connections.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Tuple[AsyncTavilyClient, httpx.AsyncClient]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, api_key: Optional[str] = None) -> AsyncTavilyClient:
+        """
+        Return the pooled client for the running event loop.
+
+        Args:
+            api_key: Tavily API key (default from TAVILY_API_KEY)
+
+        Returns:
+            AsyncTavilyClient: Shared client backed by a keep-alive connection pool
+        """
+        loop = asyncio.get_running_loop()
+        api_key = api_key or os.getenv("TAVILY_API_KEY") or ""
+        with self._lock:
+            clients = self._clients.setdefault(loop, {})
+            entry = clients.get(api_key)
+            if entry is None:
+                http_client = httpx.AsyncClient(limits=_pool_limits())
+                entry = (AsyncTavilyClient(api_key=api_key or None, client=http_client), http_client)
+                clients[api_key] = entry
+                logger.info("Created pooled Tavily client")
+            return entry[0]
+
+    async def close(self) -> None:
+        """Close every pooled client opened on the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.pop(loop, {})
+        for _, http_client in clients.values():
+            await http_client.aclose()
+        if clients:
+            logger.info(f"Closed {len(clients)} pooled Tavily client(s)")
+
+
+_registry = SearchClientRegistry()
+
+
+class SharedTavilyClient:
+    """Client facade that routes each call to the pooled client of the running loop."""
+
+    def __init__(self, api_key: Optional[str] = None):
+        """
+        Initialize the facade.
+
+        Args:
+            api_key: Tavily API key (default from TAVILY_API_KEY)
+        """
+        self.api_key = api_key
+
+    async def search(self, **kwargs: Any) -> Dict[str, Any]:
+        """Perform a search on the shared client."""
+        return await _registry.get(self.api_key).search(**kwargs)
+
+
+def get_tavily_client(api_key: Optional[str] = None) -> SharedTavilyClient:
+    """Return a facade over the process-wide pooled Tavily client."""
+    return SharedTavilyClient(api_key)
+
+
+async def close_search_clients() -> None:
+    """Shutdown hook: close pooled search connections opened on the running loop."""
+    await _registry.close()
@@ -0,0 +1,329 @@
+"""
+Paraphrase-tolerant lookup of cached searches.
+"""
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from plugins.search_cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.+#][a-z0-9]+)*[+#]*|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+_CJK_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+
+# Function words and filler that do not change what a search engine returns
+STOPWORDS: Set[str] = {
+    "a", "about", "an", "and", "are", "as", "at", "be", "by", "can", "details", "do", "does", "explained",
+    "for", "from", "guide", "how", "in", "info", "information", "intro", "introduction", "is", "it", "of",
+    "on", "or", "overview", "summary", "the", "to", "vs", "what", "whats", "when", "where", "which", "who",
+    "why", "with",
+}
+CJK_STOPWORDS: Tuple[str, ...] = (
+    "什么是", "是什么", "关于", "什么", "如何", "怎么", "怎样", "介绍", "概述", "简介",
+    "的", "了", "是", "和", "与", "及", "在", "有", "吗", "呢", "之",
+)
+# Words ending in "s" that are not plurals ("news" is not "new")
+SINGULAR_S_WORDS: Set[str] = {
+    "alias", "analysis", "aws", "basis", "bias", "canvas", "chaos", "corpus", "diagnosis", "ethics",
+    "gas", "kubernetes", "lens", "mars", "news", "series", "species", "status", "synthesis", "thesis",
+    "windows", "redis", "nodejs", "nextjs", "vuejs",
+}
+# Suffixes removed to match morphological variants ("evaluation" / "evaluate", "pricing" / "price")
+VARIANT_SUFFIXES: Tuple[str, ...] = (
+    "ational", "ations", "ation", "ative", "ating", "ated", "ates", "ate", "ings", "ing", "ments", "ment",
+    "ities", "ity", "ions", "ion", "ers", "er", "ed", "es", "ly", "al",
+)
+
+# Words that flip the meaning of a query; they must appear in both queries or neither
+NEGATIONS: Set[str] = {"no", "non", "not", "never", "without", "except", "excluding", "against"}
+# Prefixes that turn a word into its opposite ("install" / "uninstall")
+NEGATION_PREFIXES: Tuple[str, ...] = ("un", "non", "dis", "de", "in", "im", "ir", "il", "anti", "mis")
+ANTONYMS: Set[frozenset] = {
+    frozenset(pair) for pair in (
+        ("before", "after"), ("increase", "decrease"), ("best", "worst"), ("pro", "con"),
+        ("upgrade", "downgrade"), ("min", "max"), ("minimum", "maximum"), ("old", "new"),
+        ("oldest", "newest"), ("first", "last"), ("enable", "disable"), ("import", "export"),
+        ("upload", "download"), ("buy", "sell"), ("cheap", "expensive"), ("fast", "slow"),
+    )
+}
+
+
+def normalize_query(query: str) -> List[str]:
+    """
+    Reduce a query to the terms that decide its results.
+
+    Case, whitespace, punctuation, stopwords and plural endings are dropped.
+    CJK text, which has no spaces, is segmented into character bigrams after
+    removing function words.
+
+    Args:
+        query: Search query
+
+    Returns:
+        List[str]: Terms in query order without duplicates
+    """
+    terms: List[str] = []
+    for token in _TOKEN_RE.findall((query or "").lower()):
+        if _CJK_RE.match(token):
+            for word in CJK_STOPWORDS:
+                token = token.replace(word, " ")
+            for run in token.split():
+                terms.extend([run] if len(run) == 1 else [run[i:i + 2] for i in range(len(run) - 1)])
+        elif token not in STOPWORDS:
+            if (len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is", "ics"))
+                    and token not in SINGULAR_S_WORDS):
+                token = token[:-1]
+            terms.append(token)
+    return list(dict.fromkeys(terms))
+
+
+def _collapse_acronyms(terms: List[str], other: List[str]) -> Tuple[List[str], Set[Tuple[str, str]]]:
+    """Replace runs of words in ``terms`` spelled out by an acronym in ``other``.
+
+    Returns the collapsed terms and the (acronym, last word) pairs collapsed,
+    so the other query can drop a redundant "protocol" after "mcp".
+    """
+    collapsed = set()
+    for acronym in other:
+        if not (2 <= len(acronym) <= 6 and acronym.isalpha()) or acronym in terms:
+            continue
+        size = len(acronym)
+        for start in range(len(terms) - size + 1):
+            run = terms[start:start + size]
+            if all(word.isalpha() for word in run) and "".join(word[0] for word in run) == acronym:
+                terms = terms[:start] + [acronym] + terms[start + size:]
+                collapsed.add((acronym, run[-1]))
+                break
+    return terms, collapsed
+
+
+def _drop_repeated(terms: List[str], collapsed: Set[Tuple[str, str]]) -> List[str]:
+    return [t for i, t in enumerate(terms) if not (i and (terms[i - 1], t) in collapsed)]
+
+
+def _ngrams(terms: List[str], n: int) -> Counter:
+    text = f" {' '.join(sorted(terms))} "
+    return Counter(text[i:i + n] for i in range(max(1, len(text) - n + 1)))
+
+
+def ngram_similarity(a: List[str], b: List[str], n: int = 3) -> float:
+    """
+    Cosine similarity of the character n-grams of two normalized queries.
+
+    Args:
+        a: Normalized terms of the first query
+        b: Normalized terms of the second query
+        n: N-gram length
+
+    Returns:
+        float: Similarity in [0, 1]; term order does not matter
+    """
+    if not a or not b:
+        return 0.0
+    x, y = _ngrams(a, n), _ngrams(b, n)
+    dot = sum(count * y[gram] for gram, count in x.items())
+    norm = math.sqrt(sum(c * c for c in x.values())) * math.sqrt(sum(c * c for c in y.values()))
+    return dot / norm if norm else 0.0
+
+
+def align_queries(a: List[str], b: List[str]) -> Tuple[List[str], List[str]]:
+    """Align two normalized queries so that acronyms and their expansions compare equal."""
+    a, from_a = _collapse_acronyms(a, b)
+    b, from_b = _collapse_acronyms(b, a)
+    return _drop_repeated(a, from_b), _drop_repeated(b, from_a)
+
+
+def _is_opposite(x: str, y: str) -> bool:
+    if frozenset((x, y)) in ANTONYMS:
+        return True
+    short, long = sorted((x, y), key=len)
+    return any(long == prefix + short or long == prefix + "-" + short for prefix in NEGATION_PREFIXES)
+
+
+def variant_stem(term: str) -> str:
+    """Reduce a normalized term to a stem shared by its morphological variants."""
+    if not term.isalpha() or len(term) <= 4:
+        return term
+    for suffix in VARIANT_SUFFIXES:
+        if term.endswith(suffix) and len(term) - len(suffix) >= 4:
+            term = term[:-len(suffix)]
+            break
+    return term[:-1] if term.endswith("e") and len(term) > 4 else term
+
+
+def same_terms(a: List[str], b: List[str]) -> bool:
+    """
+    Return True if two aligned queries use the same content terms.
+
+    Order and morphological variants may differ, but a term in one query with
+    no counterpart in the other (a qualifier such as "in africa" or "ibm")
+    narrows or changes the search, so the queries are not equivalent.
+
+    Args:
+        a: Aligned terms of the first query
+        b: Aligned terms of the second query
+
+    Returns:
+        bool: True if every term of each query has a variant in the other
+    """
+    return {variant_stem(t) for t in a} == {variant_stem(t) for t in b}
+
+
+def conflicting_terms(a: List[str], b: List[str]) -> bool:
+    """
+    Return True if two aligned queries differ in a term that changes what they ask for.
+
+    Terms with digits (years, versions, model numbers) and negations must
+    match exactly, and neither query may contain the opposite of a term of the
+    other ("install" / "uninstall", "before" / "after"). Such pairs look alike
+    to n-gram similarity but return different results.
+
+    Args:
+        a: Aligned terms of the first query
+        b: Aligned terms of the second query
+
+    Returns:
+        bool: True if the queries must not share cached results
+    """
+    only_a, only_b = set(a) - set(b), set(b) - set(a)
+    for term in only_a | only_b:
+        if term in NEGATIONS or any(ch.isdigit() for ch in term):
+            return True
+    return any(_is_opposite(x, y) for x in only_a for y in only_b)
+
+
+class QueryMatch(NamedTuple):
+    """A cached search that can serve a new query."""
+
+    params: Dict[str, Any]
+    kind: str
+    similarity: float
+
+
+class SemanticQueryCache:
+    """Index of cached searches by normalized query, for paraphrase hits.
+
+    Only the query may differ between a request and the search that serves
+    it, and only in word order, stopwords, acronyms and morphological
+    variants: never in a content term, number, version, negation or opposite
+    word. Every other parameter (time range, topic, depth, result count,
+    backend) must match exactly. Responses stay in the regular caches and
+    keep their TTLs; this index only maps a new query to the parameters of
+    an equivalent cached search.
+    """
+
+    def __init__(self, threshold: float = 0.85, max_entries: int = 2000, ngram: int = 3):
+        """
+        Initialize the index.
+
+        Args:
+            threshold: Minimum n-gram similarity for a semantic hit (above 1 allows normalized hits only)
+            max_entries: Maximum indexed searches before LRU eviction
+            ngram: Character n-gram length
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ngram = ngram
+        self.counts: Counter = Counter()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[List[str], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(params: Dict[str, Any]) -> str:
+        return make_cache_key({k: v for k, v in params.items() if k != "query"})
+
+    def add(self, params: Dict[str, Any]) -> None:
+        """
+        Index the parameters of a search whose response is now cached.
+
+        Args:
+            params: Cache parameters of the search
+        """
+        terms = normalize_query(params.get("query", ""))
+        if not terms:
+            return
+        key = (self._signature(params), " ".join(sorted(terms)))
+        with self._lock:
+            self._entries[key] = (terms, params)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def lookup(self, params: Dict[str, Any]) -> Optional[QueryMatch]:
+        """
+        Find a cached search equivalent to the given parameters.
+
+        Args:
+            params: Cache parameters of the new search
+
+        Returns:
+            Optional[QueryMatch]: Parameters of the best cached search, with "normalized"
+                or "semantic" kind, or None below the threshold
+        """
+        terms = normalize_query(params.get("query", ""))
+        if not terms:
+            return None
+        signature = self._signature(params)
+        with self._lock:
+            exact = self._entries.get((signature, " ".join(sorted(terms))))
+            if exact is not None:
+                return QueryMatch(exact[1], "normalized", 1.0)
+            candidates = [entry for (sig, _), entry in self._entries.items() if sig == signature]
+
+        best: Optional[QueryMatch] = None
+        for cached_terms, cached_params in candidates:
+            a, b = align_queries(terms, cached_terms)
+            if conflicting_terms(a, b) or not same_terms(a, b):
+                continue
+            similarity = 1.0 if sorted(a) == sorted(b) else ngram_similarity(a, b, self.ngram)
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = QueryMatch(cached_params, "semantic", similarity)
+        return best
+
+    def record(self, kind: str) -> None:
+        """Count a lookup outcome: "exact", "normalized", "semantic" or "miss"."""
+        with self._lock:
+            self.counts[kind] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit counters by kind, the overall hit rate and the number of indexed searches."""
+        with self._lock:
+            counts = dict(self.counts)
+            size = len(self._entries)
+        hits = sum(v for k, v in counts.items() if k != "miss")
+        lookups = hits + counts.get("miss", 0)
+        return {
+            "exact_hits": counts.get("exact", 0),
+            "normalized_hits": counts.get("normalized", 0),
+            "semantic_hits": counts.get("semantic", 0),
+            "misses": counts.get("miss", 0),
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": size,
+        }
+
+    def clear(self) -> None:
+        """Remove every indexed search and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.counts.clear()
+
+
+_query_cache: Optional[SemanticQueryCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> SemanticQueryCache:
+    """Return the process-wide semantic query index."""
+    global _query_cache
+    with _query_cache_lock:
+        if _query_cache is None:
+            _query_cache = SemanticQueryCache(
+                threshold=float(os.getenv("SEARCH_SEMANTIC_CACHE_THRESHOLD", "0.85")),
+                max_entries=int(os.getenv("SEARCH_SEMANTIC_CACHE_MAX_ENTRIES", "2000")),
+            )
+        return _query_cache
@@ -0,0 +1,154 @@
+"""
+Domain allow/deny lists and source-type presets for searches.
+"""
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Domains or domain suffixes per source type. A host matches an entry when it
+# equals it or ends with "." + entry, so "edu" covers every .edu site.
+SOURCE_PRESETS: Dict[str, List[str]] = {
+    "official_docs": [
+        "learn.microsoft.com", "docs.anthropic.com", "platform.openai.com", "docs.python.org",
+        "developer.mozilla.org", "cloud.google.com", "docs.aws.amazon.com", "developer.apple.com",
+        "kubernetes.io", "modelcontextprotocol.io", "huggingface.co", "readthedocs.io",
+    ],
+    "academic": [
+        "arxiv.org", "acm.org", "ieee.org", "nature.com", "science.org", "pubmed.ncbi.nlm.nih.gov",
+        "semanticscholar.org", "openreview.net", "aclanthology.org", "springer.com",
+        "sciencedirect.com", "edu", "ac.uk", "edu.cn", "ac.jp", "edu.au",
+    ],
+    "news": [
+        "reuters.com", "apnews.com", "bloomberg.com", "bbc.com", "bbc.co.uk", "theguardian.com",
+        "nytimes.com", "wsj.com", "ft.com", "npr.org", "cnn.com", "techcrunch.com", "theverge.com",
+        "arstechnica.com", "wired.com",
+    ],
+    "government": ["gov", "gov.uk", "gov.cn", "gov.au", "go.jp", "europa.eu", "mil", "who.int", "un.org"],
+    "code": ["github.com", "gitlab.com", "stackoverflow.com", "pypi.org", "npmjs.com"],
+}
+
+# Request limits of the Tavily API
+MAX_INCLUDE_DOMAINS = 300
+MAX_EXCLUDE_DOMAINS = 150
+
+_DOMAIN_RE = re.compile(r"^(?=.{1,253}$)([a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?)(\.[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?)*$")
+
+
+def normalize_domain(value: str) -> str:
+    """
+    Reduce a URL or domain to a bare lowercase host without "www.".
+
+    Args:
+        value: Domain, URL or wildcard such as "*.example.com"
+
+    Returns:
+        str: Normalized domain
+
+    Raises:
+        ValueError: If the value is not a valid domain
+    """
+    text = str(value or "").strip().lower()
+    if "://" in text:
+        text = urlparse(text).netloc
+    text = text.split("/", 1)[0].split(":", 1)[0].lstrip("*.").rstrip(".")
+    if text.startswith("www."):
+        text = text[4:]
+    if not _DOMAIN_RE.match(text):
+        raise ValueError(f"Invalid domain: {value!r}")
+    return text
+
+
+def _as_list(value: Any) -> List[str]:
+    """Accept a list, a comma-separated string or None."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [v for v in (part.strip() for part in value.split(",")) if v]
+    return [str(v) for v in value if str(v).strip()]
+
+
+def resolve_domain_filters(
+    include_domains: Optional[Iterable[str]] = None,
+    exclude_domains: Optional[Iterable[str]] = None,
+    source_types: Optional[Iterable[str]] = None
+) -> Tuple[List[str], List[str]]:
+    """
+    Validate and combine domain lists and source-type presets.
+
+    Args:
+        include_domains: Domains to restrict results to
+        exclude_domains: Domains to drop from results
+        source_types: Preset names from SOURCE_PRESETS, added to the include list less any excluded domains
+
+    Returns:
+        Tuple[List[str], List[str]]: Sorted include and exclude domains
+
+    Raises:
+        ValueError: On invalid domains, unknown presets, conflicting lists or too many domains
+    """
+    include = {normalize_domain(d) for d in _as_list(include_domains)}
+    exclude = {normalize_domain(d) for d in _as_list(exclude_domains)}
+    conflicts = include & exclude
+    if conflicts:
+        raise ValueError(f"Domains both included and excluded: {', '.join(sorted(conflicts))}")
+
+    presets: Set[str] = set()
+    for source_type in _as_list(source_types):
+        preset = SOURCE_PRESETS.get(source_type.strip().lower().replace(" ", "_").replace("-", "_"))
+        if preset is None:
+            raise ValueError(
+                f"Unknown source type {source_type!r} (available: {', '.join(sorted(SOURCE_PRESETS))})"
+            )
+        presets.update(preset)
+    # An explicit exclude narrows a preset ("academic, but not arxiv.org")
+    narrowed = presets - exclude
+    if presets and not narrowed and not include:
+        raise ValueError("The excluded domains remove every domain of the requested source types")
+    include |= narrowed
+    if len(include) > MAX_INCLUDE_DOMAINS or len(exclude) > MAX_EXCLUDE_DOMAINS:
+        raise ValueError(
+            f"Too many domains (at most {MAX_INCLUDE_DOMAINS} included and {MAX_EXCLUDE_DOMAINS} excluded)"
+        )
+    return sorted(include), sorted(exclude)
+
+
+def domain_matches(host: str, domains: Iterable[str]) -> bool:
+    """Return True if a host equals or is a subdomain of any listed domain."""
+    host = host.lower().split(":", 1)[0]
+    if host.startswith("www."):
+        host = host[4:]
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def filter_results(
+    results: List[Dict[str, Any]],
+    include_domains: List[str],
+    exclude_domains: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    Enforce domain filters on processed results.
+
+    Tavily applies the filters server-side; this keeps the fixture, local and
+    federated backends, which ignore them, consistent.
+
+    Args:
+        results: Processed results with a "domain" field
+        include_domains: Allowed domains (empty allows all)
+        exclude_domains: Denied domains
+
+    Returns:
+        List[Dict[str, Any]]: Results passing both lists
+    """
+    if not include_domains and not exclude_domains:
+        return results
+    kept = [
+        r for r in results
+        if (not include_domains or domain_matches(r.get("domain", ""), include_domains))
+        and not domain_matches(r.get("domain", ""), exclude_domains)
+    ]
+    if len(kept) < len(results):
+        logger.info(f"Domain filters removed {len(results) - len(kept)} of {len(results)} results")
+    return kept
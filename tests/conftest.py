@@ -0,0 +1,37 @@
+"""
+Shared pytest fixtures.
+"""
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins import blob_store, evidence, rate_limit, search_cache, semantic_cache
+from plugins.extraction import get_chunk_store
+from plugins.image_check import get_image_cache
+
+# Settings a developer's .env (loaded by utils.util at import) may set; tests run on the defaults
+ISOLATED_ENV_PREFIXES = (
+    "SEARCH_", "EXTRACT_", "EVIDENCE_", "BLOB_", "IMAGE_", "LOCAL_INDEX_", "OUTPUT_SINK", "STREAM_",
+    "USAGE_LEDGER_", "HUMAN_INPUT_", "DEFAULT_MAX_RESULTS", "MAX_RETRIES",
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_search_state(monkeypatch):
+    """Keep process-wide search state, and the developer's caches on disk, out of the tests."""
+    for name in list(os.environ):
+        if name.startswith(ISOLATED_ENV_PREFIXES):
+            monkeypatch.delenv(name)
+    # Image URLs in test responses are fake; tests that check images opt in explicitly
+    monkeypatch.setenv("SEARCH_CHECK_IMAGES", "false")
+    # Singletons are rebuilt from the cleaned environment
+    for module, name in ((blob_store, "_store"), (evidence, "_store"), (rate_limit, "_guard"),
+                         (search_cache, "_memory_cache"), (semantic_cache, "_query_cache")):
+        monkeypatch.setattr(module, name, None)
+    get_image_cache().clear()
+    get_chunk_store().clear()
+    yield
@@ -0,0 +1,101 @@
+"""
+Unit tests for coverage-driven adaptive search.
+"""
+import asyncio
+import json
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.adaptive_search import AdaptiveSearchController, build_escalation_plan
+from plugins.search_cache import MemorySearchCache
+from plugins.searchPlugin import SearchPlugin
+
+BLOGS = [f"https://blog{i}.net/post" for i in range(5)]
+CREDIBLE = ["https://www.reuters.com/a", "https://www.bbc.com/b", "https://mit.edu/c",
+            "https://www.nature.com/d", "https://apnews.com/e", "https://stanford.edu/f",
+            "https://www.nytimes.com/g", "https://arxiv.org/h", "https://www.wsj.com/i"]
+
+
+class DepthBackend:
+    """Returns blogs for basic searches and credible sources for advanced ones."""
+
+    name = "tavily"
+
+    def __init__(self, basic_urls):
+        self.basic_urls = basic_urls
+        self.calls = []
+
+    async def search(self, **params):
+        self.calls.append((params["query"], params["max_results"], params["search_depth"]))
+        urls = self.basic_urls if params["search_depth"] == "basic" else CREDIBLE
+        return {"results": [
+            {"url": url, "title": f"{params['query']} {i}", "content": f"{params['query']} coverage from {url}",
+             "score": 0.9 - i * 0.05}
+            for i, url in enumerate(urls[:params["max_results"]])
+        ]}
+
+
+class TestAdaptiveSearch:
+    """Test cases for the escalation plan, the controller and adaptive_search."""
+
+    def test_plan_escalates_from_cheap_to_expensive(self):
+        """Steps widen, deepen, then add sub-queries and source presets."""
+        plan = build_escalation_plan("mcp", 5, ["mcp security", "mcp"])
+        assert [(s["top_k"], s["search_depth"]) for s in plan[:3]] == [(5, "basic"), (10, "basic"), (10, "advanced")]
+        assert plan[3]["query"] == "mcp security"
+        assert [s["source_types"] for s in plan[4:]] == [["official_docs"], ["academic"], ["news"]]
+
+    def test_controller_stops_when_coverage_met(self):
+        """No further searches run once the threshold is reached."""
+        calls = []
+
+        async def search(step):
+            calls.append(step["query"])
+            return [{"url": f"https://{step['query']}.com/{i}"} for i in range(step["top_k"])]
+
+        controller = AdaptiveSearchController(search, lambda results: len(results) / 10, threshold=0.75)
+        outcome = asyncio.run(controller.run([
+            {"query": "a", "top_k": 5, "search_depth": "basic"},
+            {"query": "b", "top_k": 5, "search_depth": "basic"},
+            {"query": "c", "top_k": 5, "search_depth": "basic"},
+        ]))
+        assert calls == ["a", "b"]
+        assert outcome["met"] is True
+        assert [s["new_results"] for s in outcome["steps"]] == [5, 5]
+
+    def test_controller_skips_exhausted_queries_and_survives_errors(self):
+        """Asking for more of a query that came up short is skipped; failed steps are recorded."""
+        calls = []
+
+        async def search(step):
+            calls.append((step["query"], step["top_k"], step["search_depth"]))
+            if step["query"] == "broken":
+                raise ConnectionError("down")
+            return [{"url": "https://only.com"}]
+
+        controller = AdaptiveSearchController(search, lambda results: 0.1, max_steps=10)
+        outcome = asyncio.run(controller.run(build_escalation_plan("q", 5, ["broken"], presets=())))
+        assert calls == [("q", 5, "basic"), ("q", 10, "advanced"), ("broken", 5, "advanced")]
+        assert outcome["steps"][-1]["error"] == "down"
+        assert outcome["met"] is False
+
+    def test_plugin_escalates_weak_sections_only(self):
+        """A poorly covered section escalates to advanced depth; a well covered one stops at once."""
+        weak = DepthBackend(BLOGS)
+        plugin = SearchPlugin(backend=weak, memory_cache=MemorySearchCache())
+        outcome = json.loads(asyncio.run(plugin.adaptive_search("MCP adoption")))
+        assert weak.calls == [("MCP adoption", 5, "basic"), ("MCP adoption", 10, "basic"),
+                              ("MCP adoption", 10, "advanced")]
+        assert outcome["met"] is True
+        assert outcome["coverage"] >= 0.75 > outcome["steps"][0]["coverage"]
+        assert {r["url"] for r in outcome["results"]} >= set(CREDIBLE)
+        assert plugin.section_coverage["MCP adoption"] == outcome["coverage"]
+
+        strong = DepthBackend(CREDIBLE)
+        plugin = SearchPlugin(backend=strong, memory_cache=MemorySearchCache())
+        outcome = json.loads(asyncio.run(plugin.adaptive_search("MCP history", query="Model Context Protocol history")))
+        assert strong.calls == [("Model Context Protocol history", 5, "basic")]
+        assert outcome["met"] is True
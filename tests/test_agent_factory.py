@@ -0,0 +1,91 @@
+"""
+Unit tests for the agent factory.
+"""
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.agent_factory import ResearchSession, credibility_critic, data_feeder, report_writer
+from plugins.evidence import get_evidence_store
+
+URLS = ["https://www.reuters.com/mcp", "https://arxiv.org/abs/mcp", "https://blog.example.net/mcp"]
+
+
+class FixedBackend:
+    """Backend returning the same results for every query."""
+
+    name = "tavily"
+
+    async def search(self, **params):
+        return {"results": [
+            {"url": url, "title": f"MCP {i}", "content": f"Model Context Protocol source {i}", "score": 0.9 - i / 10}
+            for i, url in enumerate(URLS)
+        ]}
+
+
+@pytest.fixture
+def azure_env(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com/")
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("AZURE_OPENAI_API_VERSION", "2024-10-21")
+
+
+async def _invoke(agent, plugin, function, **arguments):
+    result = await agent.kernel.invoke(agent.kernel.get_function(plugin, function), **arguments)
+    return json.loads(str(result))
+
+
+class TestAgentFactory:
+    """Test cases for state shared between the agents of a research session."""
+
+    @patch('plugins.searchPlugin.get_search_backend', return_value=FixedBackend())
+    def test_critic_assesses_the_feeders_results(self, _, azure_env):
+        """assess_credibility() on the critic covers what the feeder found in the same session."""
+        session = ResearchSession()
+        feeder, critic = data_feeder("MCP", session), credibility_critic("MCP", session)
+
+        async def run():
+            await _invoke(feeder, "SearchPlugin", "tavily_search", query="Model Context Protocol", top_k=5)
+            return await _invoke(critic, "SearchPlugin", "assess_credibility")
+
+        assessment = asyncio.run(run())
+        assert assessment["metrics"]["sources"] == len(URLS)
+        assert assessment["coverage"] > 0
+
+        other = credibility_critic("MCP", ResearchSession())
+        assert asyncio.run(_invoke(other, "SearchPlugin", "assess_credibility"))["metrics"]["sources"] == 0
+
+    @patch('plugins.searchPlugin.get_search_backend', return_value=FixedBackend())
+    def test_runs_do_not_share_evidence(self, _, azure_env):
+        """The report writer retrieves what its own run collected and nothing from another run."""
+        first, second = ResearchSession(), ResearchSession()
+
+        async def run():
+            await _invoke(data_feeder("MCP", first), "SearchPlugin", "tavily_search",
+                          query="Model Context Protocol", top_k=5)
+            return (
+                await _invoke(report_writer(first), "EvidencePlugin", "retrieve_evidence",
+                              query="Model Context Protocol source", top_k=5),
+                await _invoke(report_writer(second), "EvidencePlugin", "retrieve_evidence",
+                              query="Model Context Protocol source", top_k=5),
+            )
+
+        own, other = asyncio.run(run())
+        assert {p["url"] for p in own} == set(URLS)
+        assert "error" in other[0] and len(second.evidence) == 0
+
+    @patch('plugins.searchPlugin.get_search_backend', return_value=FixedBackend())
+    def test_critic_searches_feed_the_session_evidence(self, _, azure_env):
+        """Results the critic fetches itself go to its session's evidence, not the process-wide store."""
+        session = ResearchSession()
+        asyncio.run(_invoke(credibility_critic("MCP", session), "SearchPlugin", "tavily_search",
+                            query="Model Context Protocol", top_k=5))
+        assert session.evidence.stats()["sources"] == len(URLS)
+        assert len(get_evidence_store()) == 0
@@ -0,0 +1,93 @@
+"""
+Unit tests for out-of-band blob handles.
+"""
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.blobPlugin import BlobPlugin
+from plugins.blob_store import BlobStore, offload_if_large, summarize_results
+from plugins.searchPlugin import SearchPlugin
+
+
+class TestBlobStore:
+    """Test cases for the blob store and blob plugin."""
+
+    def test_content_addressed_handles(self, tmp_path):
+        """Identical content gets the same handle, in memory and on disk."""
+        for store in (BlobStore(), BlobStore(str(tmp_path / "blobs"))):
+            handle = store.put("hello")
+            assert handle.startswith("blob:")
+            assert store.put("hello") == handle
+            assert store.put("world") != handle
+            assert store.get(handle) == "hello"
+            assert store.get("blob:0000000000000000") is None
+            assert store.get("../../etc/passwd") is None
+
+    def test_memory_store_is_bounded(self):
+        """The in-memory store keeps only the most recent blobs."""
+        store = BlobStore(max_entries=2)
+        first = store.put("a")
+        store.put("b")
+        store.put("c")
+        assert store.get(first) is None
+
+    def test_offload_threshold(self):
+        """Only outputs above the threshold are replaced by a reference."""
+        store = BlobStore()
+        output = json.dumps([{"url": f"https://e{i}.com", "snippet": "x" * 100} for i in range(10)])
+        assert offload_if_large(output, "summary", 0, store) == output
+        assert offload_if_large(output, "summary", len(output), store) == output
+
+        reference = json.loads(offload_if_large(output, "10 results", 100, store))
+        assert reference["items"] == 10
+        assert reference["summary"] == "10 results"
+        assert store.get(reference["blob"]) == output
+
+    def test_summarize_results(self):
+        """The summary line counts results, errors, domains and images."""
+        summary = summarize_results([
+            {"url": "https://a.com/1", "title": "A", "images": [{"url": "i"}]},
+            {"url": "https://a.com/2", "title": "B"},
+            {"error": "failed"},
+        ])
+        assert summary == "2 results (1 errors) from 1 domains, 1 images; top: A | B"
+
+    def test_read_blob_slices(self):
+        """List blobs are sliced by item and text blobs by character."""
+        store = BlobStore()
+        plugin = BlobPlugin(store)
+        items = store.put(json.dumps(list(range(20))))
+        assert json.loads(plugin.read_blob(items)) == [0, 1, 2, 3, 4]
+        assert json.loads(plugin.read_blob(items, start=18, count=5)) == [18, 19]
+
+        text = store.put("abcdefghij")
+        assert plugin.read_blob(text, start=2, count=3) == "cde"
+        assert "error" in json.loads(plugin.read_blob("blob:ffffffffffffffff"))[0]
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_search_output_offloaded(self, mock_tavily_client):
+        """Large search output is replaced by a handle that read_blob can expand."""
+        class DummyAsyncClient:
+            async def search(self, **kwargs):
+                return {"results": [
+                    {"url": f"https://site{i}.com", "title": f"Title {i}", "content": f"topic{i} " * 200, "score": 0.5}
+                    for i in range(5)
+                ]}
+
+        with patch.dict(os.environ, {"BLOB_THRESHOLD_CHARS": "2000"}):
+            plugin = SearchPlugin()
+        plugin.client = DummyAsyncClient()
+
+        reference = json.loads(asyncio.run(plugin.tavily_search("anything")))
+        assert reference["blob"].startswith("blob:")
+        assert reference["items"] == 5
+        assert reference["summary"].startswith("5 results from 5 domains")
+
+        results = json.loads(BlobPlugin().read_blob(reference["blob"], count=10))
+        assert len(results) == 5
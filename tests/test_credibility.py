@@ -0,0 +1,98 @@
+"""
+Unit tests for deterministic credibility pre-scoring.
+"""
+import asyncio
+import datetime as dt
+import json
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.credibility import CredibilityScorer
+from plugins.searchPlugin import SearchPlugin
+
+NOW = dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
+
+
+class TestCredibility:
+    """Test cases for the credibility scorer."""
+
+    def test_tier_lookup_uses_longest_suffix(self):
+        """Subdomains and academic suffixes resolve to their tier."""
+        scorer = CredibilityScorer()
+        assert scorer.tier_for("www.reuters.com") == 1
+        assert scorer.tier_for("news.bbc.co.uk") == 1
+        assert scorer.tier_for("www.npr.org") == 2
+        assert scorer.tier_for("cs.stanford.edu") == 3
+        assert scorer.tier_for("www.ox.ac.uk") == 3
+        assert scorer.tier_for("random-blog.net") is None
+
+    def test_preferred_domains_outrank_tier_one(self):
+        """Domains named by the task are scored above wire services."""
+        scorer = CredibilityScorer(preferred_domains=["modelcontextprotocol.io"])
+        preferred = scorer.score_result({"url": "https://modelcontextprotocol.io/spec"})
+        wire = scorer.score_result({"url": "https://www.reuters.com/tech"})
+        assert preferred["tier"] == 0
+        assert preferred["credibility"] > wire["credibility"]
+
+    def test_recency_decays(self):
+        """Older articles get a lower recency score; unknown dates are None."""
+        scorer = CredibilityScorer(recency_half_life_days=365)
+        assert scorer.recency("2025-01-01", NOW) == 1.0
+        assert scorer.recency("2024-01-02", NOW) == 0.5
+        assert scorer.recency("Wed, 01 Jan 2025 00:00:00 GMT", NOW) == 1.0
+        assert scorer.recency("", NOW) is None
+
+    def test_assess_coverage(self):
+        """Credible, diverse sources yield higher coverage than unknown blogs."""
+        scorer = CredibilityScorer(target_sources=3)
+        strong = scorer.assess([
+            {"url": "https://www.reuters.com/a"},
+            {"url": "https://www.bbc.com/b"},
+            {"url": "https://mit.edu/c"},
+        ], NOW)
+        weak = scorer.assess([
+            {"url": "https://blog-one.net/a"},
+            {"url": "https://blog-one.net/b"},
+            {"url": "https://blog-two.net/c"},
+        ], NOW)
+
+        assert strong["coverage"] > 0.75 > weak["coverage"]
+        assert strong["metrics"]["credible_domains"] == 3
+        assert weak["metrics"]["needs_review"] == 3
+        assert weak["metrics"]["distinct_domains"] == 2
+
+    def test_assess_skips_errors(self):
+        """Error entries are ignored and an empty set has zero coverage."""
+        assessment = CredibilityScorer().assess([{"error": "Tavily search failed"}])
+        assert assessment["coverage"] == 0.0
+        assert assessment["results"] == []
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_plugin_annotates_and_assesses(self, mock_tavily_client):
+        """Search results carry tier and credibility, and the session can be assessed."""
+        class DummyAsyncClient:
+            async def search(self, **kwargs):
+                return {"results": [
+                    {"url": "https://www.reuters.com/mcp", "title": "MCP", "content": "MCP news", "score": 0.8},
+                    {"url": "https://someblog.net/mcp", "title": "MCP blog", "content": "MCP opinion", "score": 0.7},
+                ]}
+
+        plugin = SearchPlugin()
+        plugin.client = DummyAsyncClient()
+
+        results = json.loads(asyncio.run(plugin.tavily_search("MCP")))
+        by_url = {r["url"]: r for r in results}
+        assert by_url["https://www.reuters.com/mcp"]["tier"] == 1
+        assert by_url["https://someblog.net/mcp"]["tier"] is None
+        assert by_url["https://www.reuters.com/mcp"]["credibility"] > by_url["https://someblog.net/mcp"]["credibility"]
+
+        assessment = json.loads(plugin.assess_credibility())
+        assert assessment["metrics"]["sources"] == 2
+        assert assessment["metrics"]["needs_review"] == 1
+
+        single = json.loads(plugin.assess_credibility(["https://www.reuters.com/mcp"]))
+        assert single["metrics"]["sources"] == 1
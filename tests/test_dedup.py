@@ -0,0 +1,91 @@
+"""
+Unit tests for search result deduplication.
+"""
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.dedup import ResultDeduplicator, canonical_url_key, clean_url, hamming_distance, simhash
+from plugins.searchPlugin import SearchPlugin
+
+ARTICLE = (
+    "Anthropic introduced the Model Context Protocol as an open standard that lets AI assistants "
+    "connect to the systems where data lives, including content repositories, business tools and "
+    "development environments, replacing fragmented integrations with a single protocol."
+)
+
+
+class TestDedup:
+    """Test cases for URL canonicalization and ResultDeduplicator."""
+
+    def test_clean_url_strips_tracking(self):
+        """Tracking parameters and fragments are removed, real parameters kept."""
+        url = "https://example.com/a?id=7&utm_source=x&fbclid=abc#section"
+        assert clean_url(url) == "https://example.com/a?id=7"
+
+    def test_canonical_key_matches_mirrors(self):
+        """Scheme, www/mobile hosts, AMP suffixes and parameter order are ignored."""
+        key = canonical_url_key("https://www.example.com/news/story/?b=2&a=1")
+        assert canonical_url_key("http://m.example.com/news/story/amp?a=1&b=2&utm_medium=social") == key
+        assert canonical_url_key("https://example.com/news/other") != key
+
+    def test_canonical_key_keeps_short_hosts(self):
+        """A prefix is only stripped when a registrable host remains."""
+        assert canonical_url_key("https://amp.dev/documentation") != canonical_url_key("https://www.dev/documentation")
+        assert canonical_url_key("https://m.me/x").startswith("m.me/")
+        assert canonical_url_key("https://www.amp.dev/documentation") == canonical_url_key("https://amp.dev/documentation")
+
+    def test_simhash_near_duplicates(self):
+        """Lightly edited text stays within a small Hamming distance."""
+        edited = ARTICLE.replace("single protocol.", "single protocol. Read more.")
+        unrelated = "Quarterly revenue grew on strong cloud demand while operating margins narrowed slightly."
+        assert hamming_distance(simhash(ARTICLE), simhash(edited)) <= 3
+        assert hamming_distance(simhash(ARTICLE), simhash(unrelated)) > 3
+
+    def test_dedupe_merges_with_provenance(self):
+        """Duplicates in one batch merge into the first hit and keep their sources."""
+        dedup = ResultDeduplicator()
+        results = dedup.dedupe([
+            {"url": "https://www.example.com/mcp?utm_source=a", "title": "MCP", "snippet": ARTICLE, "score": 0.5},
+            {"url": "https://example.com/mcp/", "title": "MCP", "snippet": ARTICLE, "score": 0.9},
+            {"url": "https://mirror.net/reprint", "title": "MCP reprint", "snippet": ARTICLE + " Read more.", "score": 0.4},
+        ], query="mcp")
+
+        assert len(results) == 1
+        assert results[0]["url"] == "https://www.example.com/mcp"
+        assert results[0]["score"] == 0.9
+        assert results[0]["also_at"] == ["https://example.com/mcp/", "https://mirror.net/reprint"]
+        assert dedup.provenance("https://mirror.net/reprint")["queries"] == ["mcp"]
+
+    def test_dedupe_references_earlier_results(self):
+        """Hits returned by an earlier search come back as a short reference."""
+        dedup = ResultDeduplicator()
+        dedup.dedupe([{"url": "https://example.com/mcp", "title": "MCP", "snippet": ARTICLE}], query="first")
+        results = dedup.dedupe([
+            {"url": "https://syndicated.org/story", "title": "Copy", "snippet": ARTICLE},
+            {"url": "https://new.com", "title": "New", "snippet": "Different content entirely."},
+        ], query="second")
+
+        assert results[0] == {"url": "https://example.com/mcp", "title": "MCP", "seen_before": True}
+        assert results[1]["url"] == "https://new.com"
+        assert dedup.provenance("https://example.com/mcp")["queries"] == ["first", "second"]
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_multi_search_drops_syndicated_copies(self, mock_tavily_client):
+        """Batched searches collapse the same article found under different URLs."""
+        class DummyAsyncClient:
+            async def search(self, **kwargs):
+                url = "https://example.com/mcp" if kwargs["query"] == "a" else "https://www.example.com/mcp?utm_source=feed"
+                return {"results": [{"url": url, "title": "MCP", "content": ARTICLE, "score": 0.5}]}
+
+        plugin = SearchPlugin()
+        plugin.client = DummyAsyncClient()
+
+        results = json.loads(asyncio.run(plugin.tavily_multi_search(["a", "b"])))
+        assert len(results) == 1
+        assert sorted(results[0]["queries"]) == ["a", "b"]
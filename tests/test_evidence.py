@@ -0,0 +1,90 @@
+"""
+Unit tests for the evidence store and retrieval plugin.
+"""
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.evidence import EvidenceStore, HashingEmbedder
+from plugins.evidencePlugin import EvidencePlugin
+from plugins.searchPlugin import SearchPlugin
+
+PASSAGES = [
+    {"url": "https://a.com", "text": "The Model Context Protocol standardizes how tools connect to language models."},
+    {"url": "https://b.com", "text": "Electric vehicle battery prices fell sharply in 2024."},
+    {"url": "https://c.com", "text": "MCP servers expose tools and resources over JSON-RPC transports."},
+    {"url": "https://d.com", "text": "高速铁路网络在中国持续扩张。"},
+]
+
+
+class TestEvidence:
+    """Test cases for the evidence store."""
+
+    def test_embedder_returns_unit_vectors(self):
+        """Embeddings are normalized and deterministic."""
+        embedder = HashingEmbedder(dimension=64)
+        vectors = embedder.embed(["model context protocol", "model context protocol", ""])
+        assert vectors.shape == (3, 64)
+        assert np.isclose(np.linalg.norm(vectors[0]), 1.0)
+        assert np.allclose(vectors[0], vectors[1])
+        assert not vectors[2].any()
+
+    def test_search_ranks_relevant_passages(self):
+        """The most similar passages come first, including CJK text."""
+        store = EvidenceStore(initial_capacity=2)
+        assert store.add(PASSAGES) == 4
+        assert len(store) == 4  # grown past the initial capacity
+
+        hits = store.search("model context protocol tools", top_k=2)
+        assert {h["url"] for h in hits} == {"https://a.com", "https://c.com"}
+        assert hits[0]["score"] >= hits[1]["score"]
+
+        assert store.search("中国高速铁路", top_k=1)[0]["url"] == "https://d.com"
+
+    def test_add_is_idempotent_and_filters_by_url(self):
+        """Repeated passages are skipped and retrieval can be restricted to sources."""
+        store = EvidenceStore()
+        store.add(PASSAGES)
+        assert store.add(PASSAGES[:2]) == 0
+
+        hits = store.search("tools", top_k=5, urls=["https://c.com"])
+        assert [h["url"] for h in hits] == ["https://c.com"]
+
+    def test_capacity_evicts_oldest_passages(self):
+        """Past the capacity limit the oldest passages go first and can be added again."""
+        store = EvidenceStore(initial_capacity=2, max_passages=3)
+        store.add(PASSAGES)
+        assert store.stats() == {"passages": 3, "sources": 3}
+        assert store.search("model context protocol", top_k=5, urls=["https://a.com"]) == []
+        assert store.search("MCP servers JSON-RPC", top_k=1)[0]["url"] == "https://c.com"
+        assert store.add(PASSAGES[:1]) == 1
+        assert store.search("model context protocol", top_k=1)[0]["url"] == "https://a.com"
+
+    def test_plugin_retrieves_search_snippets(self):
+        """Snippets returned by searches become retrievable evidence."""
+        class DummyAsyncClient:
+            async def search(self, **kwargs):
+                return {"results": [
+                    {"url": p["url"], "title": "T", "content": p["text"], "score": 0.5} for p in PASSAGES
+                ]}
+
+        store = EvidenceStore()
+        with patch('plugins.searchPlugin.get_search_backend'):
+            search = SearchPlugin(evidence=store)
+        search.client = DummyAsyncClient()
+        asyncio.run(search.tavily_search("anything"))
+
+        plugin = EvidencePlugin(store)
+        passages = json.loads(plugin.retrieve_evidence("battery prices", top_k=1))
+        assert passages[0]["url"] == "https://b.com"
+        assert passages[0]["source"] == "snippet"
+
+        empty = json.loads(EvidencePlugin(EvidenceStore()).retrieve_evidence("anything"))
+        assert "error" in empty[0]
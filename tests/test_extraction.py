@@ -0,0 +1,184 @@
+"""
+Unit tests for full-page extraction, chunking and the extraction plugin.
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.extractPlugin import ExtractPlugin
+from plugins.extraction import ChunkStore, PageExtractor, chunk_text, html_to_text
+from plugins.searchPlugin import SearchPlugin
+
+ARTICLE = " ".join(f"The Model Context Protocol sentence number {i} explains tool servers." for i in range(40))
+
+PAGES = {
+    "/article": (
+        "text/html; charset=utf-8",
+        f"""<html><head><title>MCP Explained</title><style>body {{color: red}}</style></head>
+        <body>
+          <nav><a href="/">Home</a> <a href="/about">About</a></nav>
+          <div class="cookie-banner">We use cookies</div>
+          <main><h1>MCP Explained</h1><p>{ARTICLE}</p><p>Closing remarks on transports.</p></main>
+          <div id="sidebar">Trending: celebrity gossip</div>
+          <footer>Copyright 2025</footer>
+          <script>var tracking = true;</script>
+        </body></html>"""
+    ),
+    "/plain": ("text/plain", "Plain text page about rate limits."),
+    "/image": ("image/png", "not really an image"),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with _Handler.lock:
+            _Handler.active += 1
+            _Handler.peak = max(_Handler.peak, _Handler.active)
+        try:
+            time.sleep(0.05)
+            page = PAGES.get(self.path.split("?")[0])
+            if page is None and self.path.startswith("/slow/"):
+                page = ("text/html", f"<html><body><p>Page {self.path}</p></body></html>")
+            if page is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = page[1].encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", page[0])
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with _Handler.lock:
+                _Handler.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Serve test pages from a local HTTP server."""
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1,localhost")
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    _Handler.peak = 0
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestExtraction:
+    """Test cases for extraction and chunking."""
+
+    def test_html_to_text_strips_boilerplate(self):
+        """Navigation, banners, sidebars, footers and scripts are removed."""
+        title, text = html_to_text(PAGES["/article"][1])
+        assert title == "MCP Explained"
+        assert "sentence number 0" in text
+        assert "Closing remarks" in text
+        for noise in ("Home", "cookies", "celebrity", "Copyright", "tracking", "color"):
+            assert noise not in text
+
+    def test_chunk_text_respects_size_and_order(self):
+        """Chunks stay under the size limit and carry some overlap."""
+        chunks = chunk_text(ARTICLE + "\nSecond paragraph.", max_chars=300, overlap=50)
+        assert len(chunks) > 3
+        assert all(len(c) <= 300 for c in chunks)
+        assert chunks[0].startswith("The Model Context Protocol sentence number 0")
+        assert chunks[-1].endswith("Second paragraph.")
+        assert chunks[1].split()[0] in chunks[0]
+
+    def test_extract_against_local_server(self, server):
+        """Pages are fetched, cleaned, chunked and stored; failures are recorded."""
+        store = ChunkStore()
+        extractor = PageExtractor(store, chunk_chars=500)
+        pages = asyncio.run(extractor.extract([
+            f"{server}/article", f"{server}/plain", f"{server}/image", f"{server}/missing"
+        ]))
+
+        by_path = {p["url"].rsplit("/", 1)[1]: p for p in pages}
+        assert by_path["article"]["status"] == "ok"
+        assert by_path["article"]["title"] == "MCP Explained"
+        assert by_path["article"]["chunks"] > 1
+        assert by_path["plain"]["chunks"] == 1
+        assert by_path["image"]["status"].startswith("error: unsupported content type")
+        assert by_path["missing"]["status"].startswith("error")
+        assert "celebrity" not in " ".join(c["text"] for c in store.get_chunks(f"{server}/article"))
+
+    def test_failed_pages_are_retried_sooner(self, server):
+        """A failed fetch is kept for error_ttl only, while good pages keep the full TTL."""
+        store = ChunkStore(ttl=3600, error_ttl=60)
+        asyncio.run(PageExtractor(store).extract([f"{server}/plain", f"{server}/missing"]))
+        assert store.get_page(f"{server}/missing")["status"].startswith("error")
+
+        later = time.time() + 120
+        with patch("plugins.extraction.time.time", return_value=later):
+            assert store.get_page(f"{server}/missing") is None
+            assert store.get_page(f"{server}/plain")["status"] == "ok"
+
+    def test_extract_bounds_concurrency_and_reuses_store(self, server):
+        """At most max_concurrency pages are fetched at once and stored pages are not refetched."""
+        store = ChunkStore()
+        extractor = PageExtractor(store, max_concurrency=2)
+        urls = [f"{server}/slow/{i}" for i in range(6)]
+        asyncio.run(extractor.extract(urls))
+        assert _Handler.peak <= 2
+        assert store.stats() == {"pages": 6, "chunks": 6}
+
+        _Handler.peak = 0
+        asyncio.run(extractor.extract(urls))
+        assert _Handler.peak == 0
+
+    def test_plugin_reads_and_searches_chunks(self, server):
+        """Agents get an outline and then read or search only the chunks they need."""
+        plugin = ExtractPlugin(PageExtractor(ChunkStore(), chunk_chars=500))
+        url = f"{server}/article"
+
+        pages = json.loads(asyncio.run(plugin.extract_pages([url, f"{server}/plain"])))
+        assert len(pages[0]["outline"]) == pages[0]["chunks"]
+
+        chunks = json.loads(plugin.read_chunks(url, [0]))
+        assert [c["chunk"] for c in chunks] == [0]
+
+        best = json.loads(plugin.search_chunks("closing remarks transports", top_k=1))
+        assert "Closing remarks" in best[0]["text"]
+
+        missing = json.loads(plugin.read_chunks(f"{server}/never"))
+        assert "error" in missing[0]
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_search_extracts_top_results(self, mock_tavily_client, server):
+        """With SEARCH_EXTRACT_TOP_N set, top results are annotated with their chunk counts."""
+        class DummyAsyncClient:
+            async def search(self, **kwargs):
+                return {"results": [
+                    {"url": f"{server}/article", "title": "MCP", "content": "MCP explained", "score": 0.9},
+                    {"url": f"{server}/plain", "title": "Limits", "content": "rate limits", "score": 0.5},
+                ]}
+
+        store = ChunkStore()
+        with patch.dict(os.environ, {"SEARCH_EXTRACT_TOP_N": "1"}):
+            plugin = SearchPlugin(extractor=PageExtractor(store, chunk_chars=500))
+        plugin.client = DummyAsyncClient()
+
+        results = json.loads(asyncio.run(plugin.tavily_search("MCP")))
+        assert results[0]["chunks"] > 1
+        assert "chunks" not in results[1]
+        assert store.stats()["pages"] == 1
@@ -0,0 +1,100 @@
+"""
+Unit tests for the asynchronous human input channels.
+"""
+import asyncio
+import io
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from semantic_kernel.contents import ChatHistory
+
+from utils.human_input import (ConsoleChannel, FileQueueChannel, HumanInputBroker, NullChannel,
+                               is_termination_request)
+
+
+class SilentChannel:
+    """Channel whose human never answers."""
+
+    async def ask(self, request):
+        await asyncio.sleep(3600)
+
+
+class TestHumanInput:
+    """Test cases for deadlines, default actions and channels."""
+
+    def test_unattended_run_continues_at_once(self):
+        """Without anyone to ask, the default response is returned immediately."""
+        broker = HumanInputBroker(NullChannel(), timeout=300)
+        message = asyncio.run(broker.ask("Feedback? "))
+        assert message.content == broker.default_response
+        assert message.metadata == {"human_input": "unavailable", "action": "continue"}
+
+    def test_deadline_does_not_block_other_work(self):
+        """A pending question times out while unrelated coroutines keep running."""
+        broker = HumanInputBroker(SilentChannel(), timeout=0.2, default_action="terminate")
+        ticks = []
+
+        async def other_session():
+            for _ in range(5):
+                ticks.append(1)
+                await asyncio.sleep(0.02)
+
+        async def run():
+            return (await asyncio.gather(broker.ask("Feedback? "), other_session()))[0]
+
+        message = asyncio.run(run())
+        assert len(ticks) == 5
+        assert message.metadata == {"human_input": "timeout", "action": "terminate"}
+        history = ChatHistory()
+        history.add_message(message)
+        assert is_termination_request(history)
+
+    def test_file_queue_round_trip(self, tmp_path):
+        """A request file is published and the answer file becomes the reply; both are cleaned up."""
+        channel = FileQueueChannel(str(tmp_path), poll_interval=0.01)
+        broker = HumanInputBroker(channel, timeout=5)
+
+        async def operator():
+            while not os.listdir(channel.requests_dir):
+                await asyncio.sleep(0.01)
+            request_id = os.listdir(channel.requests_dir)[0][:-len(".json")]
+            with open(os.path.join(channel.responses_dir, f"{request_id}.txt"), "w", encoding="utf-8") as f:
+                f.write("Add a section on security.\n")
+
+        async def run():
+            return (await asyncio.gather(broker.ask("Feedback? ", context="Reviewer: draft"), operator()))[0]
+
+        message = asyncio.run(run())
+        assert message.content == "Add a section on security."
+        assert message.metadata["human_input"] == "answered"
+        assert os.listdir(channel.requests_dir) == [] and os.listdir(channel.responses_dir) == []
+
+    def test_console_reads_on_a_background_thread(self):
+        """Console answers arrive from the reader thread; end of input falls back to the default."""
+        read_fd, write_fd = os.pipe()
+        prompts = io.StringIO()
+        channel = ConsoleChannel(prompt_stream=prompts, input_stream=os.fdopen(read_fd, encoding="utf-8"))
+        broker = HumanInputBroker(channel, timeout=5)
+
+        async def run():
+            ask = asyncio.ensure_future(broker.ask("User: "))
+            await asyncio.sleep(0.05)
+            os.write(write_fd, "approved\n".encode())
+            first = await ask
+            os.close(write_fd)
+            second = await broker.ask("User: ")
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first.content == "approved" and prompts.getvalue().startswith("User: ")
+        assert second.metadata["human_input"] == "unavailable"
+
+    def test_unknown_default_action(self):
+        """Only the documented default actions are accepted."""
+        with pytest.raises(ValueError):
+            HumanInputBroker(NullChannel(), default_action="retry")
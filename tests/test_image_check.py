@@ -0,0 +1,183 @@
+"""
+Unit tests for image deduplication, reachability checks and the image cache.
+"""
+import asyncio
+import json
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.image_check import ImageCache, ImageChecker, image_size
+from plugins.searchPlugin import SearchPlugin
+
+
+def _png(width, height):
+    """Build a minimal valid PNG."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    raw = b"".join(b"\x00" + b"\x00" * (width * 3) for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+
+CHART = _png(64, 48)
+IMAGES = {
+    "/chart.png": ("image/png", CHART),
+    "/mirror/chart.png": ("image/png", CHART),
+    "/diagram.png": ("image/png", _png(40, 40)),
+    "/pixel.gif": ("image/gif", b"GIF89a\x01\x00\x01\x00\x00\x00\x00;"),
+    "/page.html": ("text/html", b"<html>not an image</html>"),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    active = 0
+    peak = 0
+    requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with _Handler.lock:
+            _Handler.active += 1
+            _Handler.requests += 1
+            _Handler.peak = max(_Handler.peak, _Handler.active)
+        try:
+            time.sleep(0.05)
+            path = self.path.split("?")[0]
+            image = IMAGES.get(path)
+            if image is None and path.startswith("/many/"):
+                image = ("image/png", _png(50 + int(path.split("/")[-1].split(".")[0]), 50))
+            if image is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", image[0])
+            self.send_header("Content-Length", str(len(image[1])))
+            self.end_headers()
+            self.wfile.write(image[1])
+        finally:
+            with _Handler.lock:
+                _Handler.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Serve test images from a local HTTP server."""
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1,localhost")
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    _Handler.peak = 0
+    _Handler.requests = 0
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestImageCheck:
+    """Test cases for the image checker and cache."""
+
+    def test_image_size(self):
+        """Dimensions are read from PNG, GIF and JPEG headers."""
+        assert image_size(CHART) == (64, 48)
+        assert image_size(IMAGES["/pixel.gif"][1]) == (1, 1)
+        jpeg = b"\xff\xd8" + b"\xff\xe0\x00\x04\x00\x00" + b"\xff\xc0\x00\x11\x08\x00\x78\x00\xa0\x03" + b"\x00" * 8
+        assert image_size(jpeg) == (160, 120)
+        assert image_size(b"not an image") is None
+
+    def test_only_live_unique_images_survive(self, server):
+        """Dead links, non-images, pixels and duplicates are dropped."""
+        checker = ImageChecker(ImageCache())
+        images = [{"url": f"{server}{path}", "description": path} for path in (
+            "/chart.png", "/chart.png?utm_source=feed", "/mirror/chart.png", "/diagram.png",
+            "/pixel.gif", "/page.html", "/missing.png"
+        )]
+        live = asyncio.run(checker.check(images))
+        assert [i["description"] for i in live] == ["/chart.png", "/diagram.png"]
+        assert (live[0]["width"], live[0]["height"]) == (64, 48)
+
+        again = asyncio.run(checker.check([{"url": f"{server}/chart.png"}, {"url": f"{server}/many/1.png"}]))
+        assert [i["url"] for i in again] == [f"{server}/many/1.png"]
+
+    def test_concurrency_is_bounded_and_results_cached(self, server, tmp_path):
+        """At most max_concurrency images are fetched at once and cached checks are reused."""
+        cache = ImageCache(str(tmp_path / "images"))
+        images = [{"url": f"{server}/many/{i}.png"} for i in range(8)]
+        live = asyncio.run(ImageChecker(cache, max_concurrency=3).check(images))
+        assert len(live) == 8
+        assert _Handler.peak <= 3
+        assert cache.thumbnail(f"{server}/many/0.png")
+
+        _Handler.requests = 0
+        reopened = ImageCache(str(tmp_path / "images"))
+        live = asyncio.run(ImageChecker(reopened).check(images + [{"url": f"{server}/missing.png"}]))
+        assert len(live) == 8
+        assert _Handler.requests == 1
+        assert reopened.get(f"{server}/missing.png")["status"].startswith("error")
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_search_hands_writer_only_live_images(self, mock_tavily_client, server):
+        """tavily_search filters attached images through the checker."""
+        class DummyAsyncClient:
+            async def search(self, **kwargs):
+                return {
+                    "results": [{"url": "https://a.com", "title": "A", "content": "MCP", "score": 0.9}],
+                    "images": [
+                        {"url": f"{server}/chart.png", "description": "chart"},
+                        {"url": f"{server}/missing.png", "description": "gone"},
+                    ],
+                }
+
+        plugin = SearchPlugin(image_checker=ImageChecker(ImageCache()))
+        plugin.client = DummyAsyncClient()
+        results = json.loads(asyncio.run(plugin.tavily_search("MCP", include_image_descriptions=True)))
+        assert [i["description"] for i in results[0]["images"]] == ["chart"]
+        assert results[0]["images"][0]["markdown"] == f"![chart]({server}/chart.png)"
+
+    def test_failed_check_drops_only_that_results_images(self):
+        """A check that raises for one result does not stop the others from being checked."""
+        class FlakyChecker:
+            calls = 0
+
+            async def check(self, images):
+                FlakyChecker.calls += 1
+                if FlakyChecker.calls == 1:
+                    raise ConnectionError("probe failed")
+                return images
+
+        plugin = SearchPlugin(image_checker=FlakyChecker())
+        results = [
+            {"url": "https://a.com", "images": [{"url": "https://a.com/1.png"}]},
+            {"url": "https://b.com", "images": [{"url": "https://b.com/1.png"}]},
+        ]
+        asyncio.run(plugin._check_images(results))
+        assert "images" not in results[0]
+        assert results[1]["images"] == [{"url": "https://b.com/1.png"}]
+
+    def test_results_are_checked_concurrently(self):
+        """The images of all results are checked in one concurrent round, not one result at a time."""
+        class SlowChecker:
+            async def check(self, images):
+                await asyncio.sleep(0.2)
+                return images
+
+        plugin = SearchPlugin(image_checker=SlowChecker())
+        results = [{"url": f"https://{i}.com", "images": [{"url": f"https://{i}.com/1.png"}]} for i in range(5)]
+        start = time.perf_counter()
+        asyncio.run(plugin._check_images(results))
+        assert time.perf_counter() - start < 0.6
+        assert all(len(r["images"]) == 1 for r in results)
@@ -0,0 +1,118 @@
+"""
+Unit tests for the local document index.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.local_index import LocalIndex, LocalIndexBackend, main
+from plugins.search_cache import MemorySearchCache
+from plugins.searchPlugin import SearchPlugin
+
+
+def _corpus(root):
+    docs = root / "docs"
+    (docs / "nested").mkdir(parents=True)
+    (docs / "mcp.md").write_text(
+        "# Model Context Protocol\n\nMCP connects agents to tool servers over stdio or HTTP transports.\n"
+    )
+    (docs / "nested" / "quota.txt").write_text("Azure OpenAI quota limits are set per deployment and region.\n")
+    (docs / "page.html").write_text(
+        "<html><head><title>Release Notes</title></head><body><nav>Home</nav>"
+        "<p>The o3 reasoning model is available in East US 2.</p></body></html>"
+    )
+    (docs / "ignored.bin").write_bytes(b"\x00\x01")
+    return docs
+
+
+class TestLocalIndex:
+    """Test cases for ingestion, incremental updates and search."""
+
+    def test_ingest_and_search(self, tmp_path):
+        """Supported files are indexed and queries return Tavily-shaped results."""
+        docs = _corpus(tmp_path)
+        index = LocalIndex(str(tmp_path / "index"))
+        assert index.ingest(str(docs)) == {"added": 3, "updated": 0, "removed": 0, "unchanged": 0}
+
+        results = index.search("tool servers transports")
+        assert results[0]["url"] == f"file://{docs / 'mcp.md'}"
+        assert results[0]["title"] == "Model Context Protocol"
+        assert "stdio" in results[0]["content"]
+        assert results[0]["score"] == 1.0
+
+        html = index.search("reasoning model region")
+        assert html[0]["title"] == "Release Notes"
+        assert "Home" not in html[0]["content"]
+        assert index.search("nothing matches this") == []
+
+    def test_incremental_update(self, tmp_path):
+        """Only changed files are re-read; stale passages disappear."""
+        docs = _corpus(tmp_path)
+        index = LocalIndex(str(tmp_path / "index"))
+        index.ingest(str(docs))
+
+        (docs / "mcp.md").write_text("# MCP\n\nSampling lets servers request completions.\n")
+        os.remove(docs / "nested" / "quota.txt")
+        (docs / "new.md").write_text("Quota increases are requested through the portal.\n")
+        counts = index.ingest(str(docs))
+        assert counts == {"added": 1, "updated": 1, "removed": 1, "unchanged": 1}
+
+        assert index.search("stdio transports") == []
+        assert index.search("sampling completions")[0]["title"] == "MCP"
+        assert [r["url"] for r in index.search("quota")] == [f"file://{docs / 'new.md'}"]
+        assert index.stats()["files"] == 3
+
+        reopened = LocalIndex(str(tmp_path / "index"))
+        assert reopened.search("sampling completions")[0]["title"] == "MCP"
+        index.ingest(str(docs), rebuild=True)
+        assert reopened.stats() == {"files": 3, "passages": 3, "segments": 1}
+
+    def test_compaction_keeps_other_directories(self, tmp_path):
+        """Auto-compaction merges segments without dropping files ingested from another directory."""
+        dir_a, dir_b = tmp_path / "a", tmp_path / "b"
+        dir_a.mkdir()
+        dir_b.mkdir()
+        (dir_a / "alpha.md").write_text("# Alpha\n\nAlpha covers vector retrieval.\n")
+        index = LocalIndex(str(tmp_path / "index"))
+        index.ingest(str(dir_a))
+        for i in range(9):
+            (dir_b / f"beta{i}.md").write_text(f"# Beta {i}\n\nBeta note number {i} on quotas.\n")
+            index.ingest(str(dir_b))
+
+        assert index.stats() == {"files": 10, "passages": 10, "segments": 2}
+        assert index.search("vector retrieval")[0]["url"] == f"file://{dir_a / 'alpha.md'}"
+        assert index.search("note number 8")[0]["title"] == "Beta 8"
+        assert LocalIndex(str(tmp_path / "index")).search("alpha")[0]["title"] == "Alpha"
+
+    def test_queries_are_fast(self, tmp_path):
+        """Queries over a few thousand passages answer in milliseconds."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        for i in range(300):
+            body = "\n\n".join(f"Document {i} paragraph {j} about topic{(i * j) % 97} and shared words." for j in range(10))
+            (docs / f"doc{i}.md").write_text(body)
+        index = LocalIndex(str(tmp_path / "index"), chunk_chars=80)
+        index.ingest(str(docs))
+
+        index.search("topic5 shared")
+        start = time.perf_counter()
+        results = index.search("topic5 shared", top_k=10)
+        assert time.perf_counter() - start < 0.05
+        assert len(results) == 10
+
+    def test_plugin_and_cli(self, tmp_path, capsys):
+        """The CLI builds an index that SearchPlugin can query as the local backend."""
+        docs = _corpus(tmp_path)
+        path = str(tmp_path / "index")
+        assert main(["--index", path, "ingest", str(docs)]) == 0
+        assert json.loads(capsys.readouterr().out)["files"] == 3
+
+        plugin = SearchPlugin(backend=LocalIndexBackend(LocalIndex(path)), memory_cache=MemorySearchCache())
+        results = json.loads(asyncio.run(plugin.tavily_search("Azure quota deployment", top_k=2)))
+        assert results[0]["url"].endswith("quota.txt")
+        assert results[0]["domain"] == "local"
@@ -0,0 +1,97 @@
+"""
+Unit tests for the non-blocking output sinks.
+"""
+import io
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.output_sink import OutputDispatcher, TextSink, build_sinks, coalesce_events
+
+
+class RecordingSink:
+    """Sink recording batches, optionally blocked until released."""
+
+    def __init__(self, gate=None):
+        self.batches = []
+        self.gate = gate
+        self.closed = False
+
+    def write_batch(self, events):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batches.append(events)
+
+    def close(self):
+        self.closed = True
+
+
+class TestOutputSink:
+    """Test cases for coalescing, batching and the full-queue policies."""
+
+    def test_coalesce_joins_adjacent_chunks_per_agent(self):
+        """Adjacent chunks of one stream merge unless the later one opens with a banner."""
+        events = coalesce_events([
+            {"type": "stream_chunk", "agent": "A", "content": "Hel", "header": "start"},
+            {"type": "stream_chunk", "agent": "A", "content": "lo"},
+            {"type": "stream_chunk", "agent": "B", "content": "Hi"},
+            {"type": "stream_chunk", "agent": "A", "content": "!", "header": "continue"},
+            {"type": "stream_end", "agent": "A"},
+        ])
+        assert [e["agent"] for e in events] == ["A", "B", "A", "A"]
+        assert events[0]["content"] == "Hello"
+
+    def test_stream_is_written_in_few_batches(self):
+        """Many tokens reach the text sink as a handful of writes with the original rendering."""
+        stream = io.StringIO()
+        dispatcher = OutputDispatcher([TextSink(stream)], flush_interval=0.2)
+        dispatcher.emit({"type": "stream_chunk", "agent": "Writer", "content": "", "header": "start"})
+        for token in ["tok "] * 200:
+            dispatcher.emit({"type": "stream_chunk", "agent": "Writer", "content": token})
+        dispatcher.emit({"type": "stream_end", "agent": "Writer"})
+        assert dispatcher.flush()
+        dispatcher.close()
+
+        text = stream.getvalue()
+        assert "🤖 **Writer**" in text
+        assert "tok " * 200 in text
+        assert dispatcher.written <= 10
+
+    def test_emit_does_not_wait_on_a_slow_sink(self):
+        """With drop policies, a stuck sink drops events instead of blocking the caller."""
+        gate = threading.Event()
+        sink = RecordingSink(gate)
+        dispatcher = OutputDispatcher([sink], max_queue=5, flush_interval=0, max_batch=1, policy="drop_oldest")
+        for i in range(50):
+            dispatcher.emit({"type": "message", "agent": "A", "content": str(i)})
+        assert dispatcher.dropped > 0
+        gate.set()
+        dispatcher.close()
+
+        written = [e for batch in sink.batches for e in batch]
+        messages = [e["content"] for e in written if e["type"] == "message"]
+        assert messages[-1] == "49" and len(messages) < 50
+        assert any(e["type"] == "notice" for e in written)
+        assert sink.closed
+
+    def test_build_sinks_from_spec(self, tmp_path):
+        """Sinks are built from the spec; JSONL keeps the raw events."""
+        path = tmp_path / "out" / "run.jsonl"
+        sinks = build_sinks(f"jsonl:{path}, file:{tmp_path / 'run.txt'}")
+        dispatcher = OutputDispatcher(sinks)
+        dispatcher.emit({"type": "message", "agent": "Critic", "content": "ok"})
+        dispatcher.close()
+
+        record = json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+        assert record["agent"] == "Critic" and "ts" in record
+        assert "ok" in (tmp_path / "run.txt").read_text(encoding="utf-8")
+        with pytest.raises(ValueError):
+            build_sinks("syslog")
+        with pytest.raises(ValueError):
+            OutputDispatcher([], policy="wait")
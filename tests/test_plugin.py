@@ -1,6 +1,7 @@
 """
 Unit tests for SearchPlugin functionality.
 """
+import asyncio
 import json
 import pytest
 from unittest.mock import Mock, patch, MagicMock
@@ -22,7 +23,7 @@ class TestSearchPlugin:
     @pytest.fixture
     def plugin(self):
         """Create SearchPlugin instance for testing."""
-        with patch('plugins.searchPlugin.TavilyClient') as mock_client:
+        with patch('plugins.searchPlugin.get_search_backend') as mock_client:
             mock_client.return_value = Mock()
             return SearchPlugin()
     
@@ -31,7 +32,7 @@ class TestSearchPlugin:
         assert plugin.client is not None
         assert hasattr(plugin, 'tavily_search')
 
-    @patch('plugins.searchPlugin.TavilyClient')
+    @patch('plugins.searchPlugin.get_search_backend')
     def test_successful_search(self, mock_tavily_client):
         """Test successful search operation."""
         # Mock response
@@ -61,7 +62,7 @@ class TestSearchPlugin:
         
         # Create plugin and perform search
         plugin = SearchPlugin()
-        result = plugin.tavily_search("test query")
+        result = asyncio.run(plugin.tavily_search("test query"))
         
         # Parse and validate result
         parsed_result = json.loads(result)
@@ -72,7 +73,7 @@ class TestSearchPlugin:
         assert 'domain' in parsed_result[0]
         assert 'crawled_at' in parsed_result[0]
 
-    @patch('plugins.searchPlugin.TavilyClient')
+    @patch('plugins.searchPlugin.get_search_backend')
     def test_search_with_images(self, mock_tavily_client):
         """Test search with image descriptions."""
         # Mock response with images
@@ -102,7 +103,7 @@ class TestSearchPlugin:
         mock_tavily_client.return_value = mock_client_instance
         
         plugin = SearchPlugin()
-        result = plugin.tavily_search("test query", include_image_descriptions=True)
+        result = asyncio.run(plugin.tavily_search("test query", include_image_descriptions=True))
         
         parsed_result = json.loads(result)
         assert len(parsed_result) == 1
@@ -110,7 +111,7 @@ class TestSearchPlugin:
         assert len(parsed_result[0]['images']) == 2
         assert parsed_result[0]['images'][0]['url'] == 'https://example.com/image1.jpg'
 
-    @patch('plugins.searchPlugin.TavilyClient')
+    @patch('plugins.searchPlugin.get_search_backend')
     def test_search_error_handling(self, mock_tavily_client):
         """Test error handling in search operation."""
         # Configure mock to raise exception
@@ -119,7 +120,7 @@ class TestSearchPlugin:
         mock_tavily_client.return_value = mock_client_instance
         
         plugin = SearchPlugin()
-        result = plugin.tavily_search("test query")
+        result = asyncio.run(plugin.tavily_search("test query"))
         
         parsed_result = json.loads(result)
         assert isinstance(parsed_result, list)
@@ -159,7 +160,7 @@ class TestSearchPlugin:
             domain = plugin._extract_domain(url)
             assert domain == expected_domain
 
-    @patch('plugins.searchPlugin.TavilyClient')
+    @patch('plugins.searchPlugin.get_search_backend')
     def test_tavily_search_time_range_default(self, mock_tavily_client):
         plugin = SearchPlugin()
         class DummyClient:
@@ -168,7 +169,7 @@ class TestSearchPlugin:
                 return {"results": [{"url": "https://example.com", "title": "title", "content": "text", "score": 1.0}]}
         plugin.client = DummyClient()
         # Call with time_range=None
-        result_json = plugin.tavily_search("test query", top_k=5, time_range=None)
+        result_json = asyncio.run(plugin.tavily_search("test query", top_k=5, time_range=None))
         assert '"title": "title"' in result_json
         # Test if time_range="month" parameter is generated correctly by testing _build_search_params directly
         params = plugin._build_search_params("test", 5, None, "general", "basic", False)
@@ -176,7 +177,7 @@ class TestSearchPlugin:
         params2 = plugin._build_search_params("test", 5, "month", "general", "basic", False)
         assert params2["time_range"] == "month"
 
-    @patch('plugins.searchPlugin.TavilyClient')
+    @patch('plugins.searchPlugin.get_search_backend')
     def test_tavily_search_none_results(self, mock_tavily_client):
         plugin = SearchPlugin()
         class NoneClient:
@@ -184,11 +185,11 @@ class TestSearchPlugin:
                 return {"results": None}
         plugin.client = NoneClient()
         # Even if None is returned, no error occurs and an empty list is returned
-        result_json = plugin.tavily_search("test query", top_k=5, time_range=None)
+        result_json = asyncio.run(plugin.tavily_search("test query", top_k=5, time_range=None))
         assert '"error"' not in result_json
         assert '[]' in result_json  # Empty list is returned
 
-    @patch('plugins.searchPlugin.TavilyClient')
+    @patch('plugins.searchPlugin.get_search_backend')
     def test_tavily_search_invalid_response(self, mock_tavily_client):
         plugin = SearchPlugin()
         class InvalidClient:
@@ -196,10 +197,10 @@ class TestSearchPlugin:
                 return "not a dict"
         plugin.client = InvalidClient()
         # Error message is returned even for invalid responses
-        result_json = plugin.tavily_search("test query", top_k=5, time_range=None)
+        result_json = asyncio.run(plugin.tavily_search("test query", top_k=5, time_range=None))
         assert '"error"' in result_json
 
-    @patch('plugins.searchPlugin.TavilyClient')
+    @patch('plugins.searchPlugin.get_search_backend')
     def test_tavily_search_integration(self, mock_tavily_client):
         """
         Integration test for SearchPlugin.tavily_search.
@@ -240,21 +241,133 @@ class TestSearchPlugin:
         plugin.client = DummyClient()
 
         # With time_range and images
-        result_json = plugin.tavily_search(
+        result_json = asyncio.run(plugin.tavily_search(
             "integration test query", top_k=3, time_range="week", include_image_descriptions=True
-        )
+        ))
         assert called_params["time_range"] == "week"
         assert called_params["include_images"] is True
         assert '"images": [' in result_json
         assert '"description": "desc1"' in result_json        # Without time_range and images
-        result_json2 = plugin.tavily_search(
+        result_json2 = asyncio.run(plugin.tavily_search(
             "integration test query", top_k=2, time_range=None, include_image_descriptions=False
-        )
+        ))
         assert "time_range" not in called_params
         assert "include_images" not in called_params or called_params["include_images"] is False
         assert '"images": [' not in result_json2
         assert '"title": "title"' in result_json2
 
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_concurrent_async_searches_overlap(self, mock_tavily_client):
+        """Concurrent searches on an async client overlap instead of serializing."""
+        class SlowAsyncClient:
+            async def search(self, **kwargs):
+                await asyncio.sleep(0.2)
+                return {"results": [{"url": "https://example.com", "title": kwargs["query"], "content": "text", "score": 1.0}]}
+
+        plugin = SearchPlugin()
+        plugin.client = SlowAsyncClient()
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            results = await asyncio.gather(*(plugin.tavily_search(f"query {i}") for i in range(5)))
+            return results, loop.time() - start
+
+        results, elapsed = asyncio.run(run())
+        assert len(results) == 5
+        assert elapsed < 0.6
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_search_cancellation_during_backoff(self, mock_tavily_client):
+        """Cancelling a search while it backs off propagates promptly."""
+        class FailingAsyncClient:
+            async def search(self, **kwargs):
+                raise RuntimeError("API Error")
+
+        plugin = SearchPlugin()
+        plugin.client = FailingAsyncClient()
+
+        async def run():
+            task = asyncio.create_task(plugin.tavily_search("test query"))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_multi_search_merges_and_dedups(self, mock_tavily_client):
+        """Batched search runs every query and merges duplicate URLs."""
+        called_params = []
+
+        class DummyAsyncClient:
+            async def search(self, **kwargs):
+                called_params.append(kwargs)
+                return {
+                    "results": [
+                        {"url": "https://shared.com", "title": "shared", "content": "text", "score": 0.5},
+                        {"url": f"https://{kwargs['query']}.com", "title": kwargs["query"], "content": "text", "score": 0.9}
+                    ]
+                }
+
+        plugin = SearchPlugin()
+        plugin.client = DummyAsyncClient()
+
+        result_json = asyncio.run(plugin.tavily_multi_search(
+            [{"query": "alpha", "time_range": "week"}, {"query": "beta", "topic": "news", "top_k": 3}]
+        ))
+        results = json.loads(result_json)
+
+        assert len(called_params) == 2
+        assert {p["query"] for p in called_params} == {"alpha", "beta"}
+        assert next(p for p in called_params if p["query"] == "alpha")["time_range"] == "week"
+        assert next(p for p in called_params if p["query"] == "beta")["max_results"] == 3
+        assert len(results) == 3
+        shared = next(r for r in results if r["url"] == "https://shared.com")
+        assert sorted(shared["queries"]) == ["alpha", "beta"]
+        assert results[-1]["url"] == "https://shared.com"
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_multi_search_respects_concurrency_cap(self, mock_tavily_client):
+        """No more than max_concurrency searches are in flight at once."""
+        in_flight = 0
+        peak = 0
+
+        class CountingAsyncClient:
+            async def search(self, **kwargs):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.05)
+                in_flight -= 1
+                return {"results": [{"url": f"https://{kwargs['query']}.com", "title": "t", "content": "c", "score": 1.0}]}
+
+        plugin = SearchPlugin()
+        plugin.client = CountingAsyncClient()
+
+        result_json = asyncio.run(plugin.tavily_multi_search([f"q{i}" for i in range(6)], max_concurrency=2))
+        assert len(json.loads(result_json)) == 6
+        assert peak == 2
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_multi_search_reports_failed_queries(self, mock_tavily_client):
+        """A failing query yields an error entry without dropping other results."""
+        class PartiallyFailingClient:
+            async def search(self, **kwargs):
+                if kwargs["query"] == "bad":
+                    raise ValueError("API Error")
+                return {"results": [{"url": "https://good.com", "title": "t", "content": "c", "score": 1.0}]}
+
+        plugin = SearchPlugin()
+        plugin.client = PartiallyFailingClient()
+
+        plugin.max_retries = 1
+        results = json.loads(asyncio.run(plugin.tavily_multi_search(["good", "bad"])))
+        assert results[0]["url"] == "https://good.com"
+        assert results[1]["query"] == "bad"
+        assert "API Error" in results[1]["error"]
+
 
 class TestSearchPluginIntegration:
     """Integration tests for SearchPlugin."""
@@ -277,7 +390,7 @@ class TestSearchPluginIntegration:
             pytest.skip("Skipping because TAVILY_API_KEY is not set")
         plugin = SearchPlugin()
         # Without images
-        result_json = plugin.tavily_search("AI technology trends", top_k=3, time_range=None, include_image_descriptions=False)
+        result_json = asyncio.run(plugin.tavily_search("AI technology trends", top_k=3, time_range=None, include_image_descriptions=False))
         results = None
         try:
             results = json.loads(result_json)
@@ -289,7 +402,7 @@ class TestSearchPluginIntegration:
             assert "title" in results[0]
             assert "snippet" in results[0]
         # With images
-        result_json2 = plugin.tavily_search("AI technology trends", top_k=3, time_range=None, include_image_descriptions=True)
+        result_json2 = asyncio.run(plugin.tavily_search("AI technology trends", top_k=3, time_range=None, include_image_descriptions=True))
         results2 = json.loads(result_json2)
         assert isinstance(results2, list)
         # If image information is included, there should be an "images" field
@@ -0,0 +1,142 @@
+"""
+Unit tests for search rate limiting and circuit breaking.
+"""
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tavily import InvalidAPIKeyError, UsageLimitExceededError
+
+from plugins.rate_limit import (CircuitBreaker, SearchGuard, SearchUnavailableError, TokenBucket,
+                                backoff_delay, retry_after_seconds)
+from plugins.searchPlugin import SearchPlugin
+
+
+class TestRateLimit:
+    """Test cases for the token bucket, circuit breaker and backoff helpers."""
+
+    def test_token_bucket_burst_then_wait(self):
+        """The bucket allows a burst and then asks callers to wait."""
+        bucket = TokenBucket(rate=10, capacity=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+    def test_token_bucket_pause(self):
+        """A pause delays every caller."""
+        bucket = TokenBucket(rate=10, capacity=5)
+        bucket.pause(2)
+        assert bucket.reserve() == pytest.approx(2, abs=0.05)
+
+    def test_circuit_breaker_opens_and_probes(self):
+        """The circuit opens after consecutive failures and half-opens after the timeout."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_released_probe_lets_the_next_call_probe(self):
+        """A half-open probe that ends without an outcome does not keep the circuit shut."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        breaker._opened_at -= 60
+        assert breaker.allow() and not breaker.allow()
+        breaker.release()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow()
+
+    def test_cancelled_probe_releases_the_circuit(self):
+        """Cancelling the search that probes a half-open circuit lets later searches probe again."""
+        class HangingClient:
+            async def search(self, **params):
+                await asyncio.sleep(3600)
+
+        plugin = SearchPlugin(backend=HangingClient())
+        plugin.guard = SearchGuard(failure_threshold=1, reset_timeout=0)
+        plugin.guard.record_failure(RuntimeError("down"))
+
+        async def run():
+            probe = asyncio.ensure_future(plugin._execute_search_with_retry({"query": "q"}))
+            await asyncio.sleep(0.05)
+            assert plugin.guard.breaker.state == CircuitBreaker.HALF_OPEN
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+
+        asyncio.run(run())
+        assert plugin.guard.breaker.allow()
+
+    def test_backoff_honours_retry_after(self):
+        """Jittered backoff stays under the cap but never below Retry-After."""
+        for attempt in range(5):
+            assert 0 <= backoff_delay(attempt, 1, 4) <= 4
+        assert backoff_delay(0, 1, 4, retry_after=7) == 7
+
+    def test_retry_after_from_http_error(self):
+        """Retry-After is read from HTTP 429 responses."""
+        request = httpx.Request("POST", "https://api.tavily.com/search")
+        response = httpx.Response(429, headers={"Retry-After": "3"}, request=request)
+        error = httpx.HTTPStatusError("429", request=request, response=response)
+        assert retry_after_seconds(error) == 3
+        assert retry_after_seconds(ValueError("no hint")) is None
+
+    def test_guard_rejects_when_open(self):
+        """An open circuit fails fast and is counted as rejected."""
+        guard = SearchGuard(failure_threshold=1, reset_timeout=60)
+        guard.record_failure(RuntimeError("down"))
+
+        with pytest.raises(SearchUnavailableError):
+            asyncio.run(guard.acquire())
+        assert guard.metrics()["rejected"] == 1
+        assert guard.metrics()["circuit_state"] == CircuitBreaker.OPEN
+
+    def test_guard_throttle_does_not_open_circuit(self):
+        """Quota errors pause the bucket instead of tripping the breaker."""
+        guard = SearchGuard(failure_threshold=1)
+        error = UsageLimitExceededError("slow down")
+        error.retry_after_seconds = 1
+        guard.record_failure(error)
+
+        metrics = guard.metrics()
+        assert metrics["rate_limited"] == 1
+        assert metrics["circuit_state"] == CircuitBreaker.CLOSED
+        assert guard.bucket.reserve() > 0.9
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_plugin_does_not_retry_auth_errors(self, mock_tavily_client):
+        """Non-retryable errors surface after one attempt."""
+        client = Mock()
+        client.search.side_effect = InvalidAPIKeyError("bad key")
+        plugin = SearchPlugin()
+        plugin.client = client
+
+        result = json.loads(asyncio.run(plugin.tavily_search("test query")))
+        assert client.search.call_count == 1
+        assert "bad key" in result[0]["error"]
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_plugin_fails_fast_when_circuit_open(self, mock_tavily_client):
+        """Searches are rejected without calling the backend when the circuit is open."""
+        client = Mock()
+        plugin = SearchPlugin()
+        plugin.client = client
+        plugin.guard = SearchGuard(failure_threshold=1, reset_timeout=60)
+        plugin.guard.record_failure(RuntimeError("down"))
+
+        result = json.loads(asyncio.run(plugin.tavily_search("test query")))
+        assert client.search.call_count == 0
+        assert "circuit is open" in result[0]["error"]
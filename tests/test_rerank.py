@@ -0,0 +1,92 @@
+"""
+Unit tests for lexical reranking and diversity selection.
+"""
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.rerank import bm25_scores, mmr_select, rerank_results, tokenize
+from plugins.searchPlugin import SearchPlugin
+
+
+class TestRerank:
+    """Test cases for the BM25 reranker and MMR selector."""
+
+    def test_tokenize_mixed_scripts(self):
+        """Latin words and CJK bigrams are both produced."""
+        assert tokenize("MCP 协议架构") == ["mcp", "协议", "议架", "架构"]
+
+    def test_bm25_prefers_matching_documents(self):
+        """Documents containing the query terms score higher."""
+        scores = bm25_scores("context protocol", [
+            "cooking recipes for pasta",
+            "the model context protocol connects tools",
+            "protocol buffers serialization",
+        ])
+        assert int(np.argmax(scores)) == 1
+        assert scores[0] == 0
+
+    def test_mmr_skips_redundant_candidates(self):
+        """MMR picks a diverse second result over a near-copy of the first."""
+        relevance = np.array([1.0, 0.95, 0.6])
+        similarity = np.array([[1.0, 0.99, 0.0], [0.99, 1.0, 0.0], [0.0, 0.0, 1.0]])
+        assert mmr_select(relevance, similarity, 2, diversity=0.5) == [0, 2]
+        assert mmr_select(relevance, similarity, 2, diversity=0.0) == [0, 1]
+
+    def test_rerank_results_top_n(self):
+        """Results are reranked against the task and cut to top_n."""
+        results = [
+            {"url": "https://a.com", "title": "Celebrity news", "snippet": "gossip and rumours", "score": 0.3},
+            {"url": "https://b.com", "title": "MCP architecture", "snippet": "model context protocol architecture", "score": 0.5},
+            {"url": "https://c.com", "title": "MCP servers", "snippet": "open source model context protocol servers", "score": 0.4},
+            {"url": "https://d.com", "title": "Seen", "seen_before": True},
+        ]
+        ranked = rerank_results(results, "model context protocol architecture", top_n=2)
+
+        assert [r["url"] for r in ranked] == ["https://b.com", "https://c.com", "https://d.com"]
+        assert "rerank_score" in ranked[0]
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_plugin_reranks_against_research_task(self, mock_tavily_client):
+        """The plugin keeps the results most relevant to its research task."""
+        class DummyAsyncClient:
+            async def search(self, **kwargs):
+                return {"results": [
+                    {"url": f"https://off{i}.com", "title": "Sports", "content": f"football scores week {i}", "score": 0.9}
+                    for i in range(3)
+                ] + [{"url": "https://mcp.com", "title": "MCP", "content": "Model Context Protocol whitepaper", "score": 0.1}]}
+
+        plugin = SearchPlugin(research_task="Model Context Protocol whitepaper")
+        plugin.client = DummyAsyncClient()
+        plugin.rerank_top_n = 2
+
+        results = json.loads(asyncio.run(plugin.tavily_search("latest updates", top_k=2)))
+        assert len(results) == 2
+        assert results[0]["url"] == "https://mcp.com"
+
+    def test_plugin_keeps_the_requested_number_of_results(self):
+        """Reranking never returns fewer results than the caller asked for."""
+        class ManyResultsBackend:
+            name = "tavily"
+
+            async def search(self, **params):
+                return {"results": [
+                    {"url": f"https://site{i}.example/{params['query'].replace(' ', '-')}",
+                     "title": f"{params['query']} report {i}",
+                     "content": f"Distinct finding number {i} about {params['query']}", "score": 0.9 - i / 100}
+                    for i in range(params["max_results"])
+                ]}
+
+        plugin = SearchPlugin(backend=ManyResultsBackend())
+        assert plugin.rerank_top_n == 10
+        assert len(json.loads(asyncio.run(plugin.tavily_search("battery recycling", top_k=15)))) == 15
+
+        specs = json.dumps([{"query": "solid state batteries", "top_k": 8}, {"query": "sodium ion cells", "top_k": 8}])
+        assert len(json.loads(asyncio.run(plugin.tavily_multi_search(specs)))) == 16
@@ -0,0 +1,84 @@
+"""
+Unit tests for search result serialization.
+"""
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.result_serializer import count_tokens, serialize_results
+from plugins.searchPlugin import SearchPlugin
+
+
+def make_results(count=5, snippet_length=1200):
+    """Build processed search results with long snippets and images."""
+    results = [
+        {
+            "url": f"https://example{i}.com/article",
+            "title": f"Article {i}",
+            "snippet": ("lorem ipsum dolor sit amet " * 100)[:snippet_length],
+            "score": 0.812345,
+            "crawled_at": "2025-06-01T00:00:00+00:00",
+            "published_date": "",
+            "domain": f"example{i}.com"
+        }
+        for i in range(count)
+    ]
+    results[0]["images"] = [
+        {"url": "https://img.com/1.png", "description": "desc", "markdown": "![desc](https://img.com/1.png)"}
+    ]
+    return results
+
+
+class TestResultSerializer:
+    """Test cases for serialize_results."""
+
+    def test_pretty_matches_legacy_output(self):
+        """Pretty output is the indented JSON the plugin always produced."""
+        results = make_results(2)
+        output, stats = serialize_results(results, "pretty")
+        assert output == json.dumps(results, ensure_ascii=False, indent=2)
+        assert stats["tokens_saved"] == 0
+
+    def test_compact_projects_fields(self):
+        """Compact output drops redundant fields but stays a parseable result list."""
+        output, stats = serialize_results(make_results(2), "compact")
+        parsed = json.loads(output)
+
+        assert "\n" not in output
+        assert set(parsed[1]) == {"url", "title", "snippet", "score"}
+        assert parsed[0]["images"] == [{"url": "https://img.com/1.png", "description": "desc"}]
+        assert parsed[0]["score"] == 0.812
+        assert stats["tokens_saved"] > 0
+
+    def test_token_budget_trims_snippets_proportionally(self):
+        """Snippets shrink so the output fits the budget."""
+        results = make_results(5)
+        results[1]["snippet"] = results[1]["snippet"][:600]
+        output, stats = serialize_results(results, "compact", token_budget=600)
+        parsed = json.loads(output)
+
+        assert stats["output_tokens"] <= 600
+        assert count_tokens(output) == stats["output_tokens"]
+        assert all(r["snippet"].endswith("...") for r in parsed)
+        assert len(parsed[1]["snippet"]) < len(parsed[0]["snippet"])
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_plugin_compact_output(self, mock_tavily_client):
+        """tavily_search honours output_format and records tokens saved."""
+        class DummyAsyncClient:
+            async def search(self, **kwargs):
+                return {"results": [{"url": "https://example.com", "title": "t", "content": "text " * 200, "score": 1.0}]}
+
+        plugin = SearchPlugin()
+        plugin.client = DummyAsyncClient()
+
+        output = asyncio.run(plugin.tavily_search("test query", output_format="compact", token_budget=100))
+        parsed = json.loads(output)
+        assert parsed[0]["url"] == "https://example.com"
+        assert "crawled_at" not in parsed[0]
+        assert plugin.tokens_saved > 0
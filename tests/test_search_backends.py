@@ -0,0 +1,231 @@
+"""
+Unit tests for pluggable search backends.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.search_backends import (FederatedSearchBackend, FixtureSearchBackend, RecordingSearchBackend,
+                                     SearchBackend, TavilySearchBackend, build_federated_backend, get_search_backend,
+                                     reciprocal_rank_fusion, register_search_backend)
+from plugins.search_cache import MemorySearchCache
+from plugins.searchPlugin import SearchPlugin
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "search_responses.jsonl")
+
+
+class TestSearchBackends:
+    """Test cases for the backend protocol and the fixture backend."""
+
+    def test_registry(self):
+        """Backends are created by name and unknown names are rejected."""
+        assert isinstance(get_search_backend("tavily"), TavilySearchBackend)
+        with patch.dict(os.environ, {"SEARCH_FIXTURE_PATH": FIXTURES}):
+            backend = get_search_backend("fixture")
+        assert isinstance(backend, SearchBackend)
+        assert len(backend.responses) == 2
+        with pytest.raises(ValueError):
+            get_search_backend("nope")
+
+    def test_fixture_serves_recorded_and_ranked_responses(self):
+        """Recorded queries are served verbatim; unknown queries rank the recorded pool."""
+        backend = FixtureSearchBackend.from_file(FIXTURES)
+        recorded = asyncio.run(backend.search(query="  model context PROTOCOL ", max_results=2))
+        assert [r["url"] for r in recorded["results"]] == [
+            "https://modelcontextprotocol.io/introduction",
+            "https://www.anthropic.com/news/model-context-protocol",
+        ]
+        assert recorded["images"] == []
+
+        pooled = asyncio.run(backend.search(query="azure reasoning models", max_results=5))
+        assert pooled["results"][0]["url"].startswith("https://techcommunity.microsoft.com")
+        assert all(r["score"] > 0 for r in pooled["results"])
+        assert "https://github.com/modelcontextprotocol/servers" not in [r["url"] for r in pooled["results"]]
+
+    def test_fixture_latency_and_errors(self):
+        """Latency is injected and the first calls can be forced to fail."""
+        backend = FixtureSearchBackend({}, latency=0.05, fail_first=1)
+        start = time.perf_counter()
+        with pytest.raises(ConnectionError):
+            asyncio.run(backend.search(query="q"))
+        asyncio.run(backend.search(query="q"))
+        assert time.perf_counter() - start >= 0.1
+        assert (backend.calls, backend.errors) == (2, 1)
+
+        seeded = [FixtureSearchBackend({}, error_rate=0.5, seed=7) for _ in range(2)]
+        outcomes = []
+        for backend in seeded:
+            run = []
+            for _ in range(10):
+                try:
+                    asyncio.run(backend.search(query="q"))
+                    run.append(True)
+                except ConnectionError:
+                    run.append(False)
+            outcomes.append(run)
+        assert outcomes[0] == outcomes[1]
+        assert not all(outcomes[0])
+
+    def test_plugin_runs_offline_with_retries(self):
+        """SearchPlugin runs end to end on the fixture backend and retries injected failures."""
+        backend = FixtureSearchBackend.from_file(FIXTURES, fail_first=1)
+        plugin = SearchPlugin(backend=backend, memory_cache=MemorySearchCache(max_entries=0))
+        plugin.backoff_base = 0.01
+
+        results = json.loads(asyncio.run(plugin.tavily_search("Model Context Protocol", top_k=3)))
+        assert backend.calls == 2
+        assert len(results) == 3
+        assert {r["url"] for r in results} == {
+            "https://modelcontextprotocol.io/introduction",
+            "https://www.anthropic.com/news/model-context-protocol",
+            "https://github.com/modelcontextprotocol/servers",
+        }
+
+    def test_cache_is_keyed_by_backend(self):
+        """Fixture responses never satisfy lookups for the live backend."""
+        cache = MemorySearchCache()
+        fixture = SearchPlugin(backend=FixtureSearchBackend.from_file(FIXTURES), memory_cache=cache)
+        asyncio.run(fixture.tavily_search("Model Context Protocol"))
+
+        class LiveBackend:
+            name = "tavily"
+            calls = 0
+
+            async def search(self, **params):
+                LiveBackend.calls += 1
+                return {"results": []}
+
+        live = SearchPlugin(backend=LiveBackend(), memory_cache=cache)
+        asyncio.run(live.tavily_search("Model Context Protocol"))
+        assert LiveBackend.calls == 1
+
+    def test_recording_backend_round_trip(self, tmp_path):
+        """Responses recorded from one backend can be replayed by the fixture backend."""
+        path = str(tmp_path / "recorded.jsonl")
+        recorder = RecordingSearchBackend(FixtureSearchBackend.from_file(FIXTURES), path)
+        original = asyncio.run(recorder.search(query="Azure OpenAI updates 2025", max_results=5))
+
+        replayed = asyncio.run(FixtureSearchBackend.from_file(path).search(query="Azure OpenAI updates 2025"))
+        assert replayed["results"] == original["results"]
+
+    def test_recording_federation_records_each_backend_once(self, tmp_path, monkeypatch):
+        """With recording on, a federated search writes one line per member backend and no fused copy."""
+        path = tmp_path / "recorded.jsonl"
+        monkeypatch.setenv("SEARCH_RECORD_PATH", str(path))
+        for name in ("test_rec_a", "test_rec_b"):
+            register_search_backend(name, lambda: FixtureSearchBackend.from_file(FIXTURES))
+        federation = build_federated_backend(["test_rec_a", "test_rec_b"], deadline=1.0)
+        assert isinstance(federation, FederatedSearchBackend)
+        asyncio.run(federation.search(query="Azure OpenAI updates 2025", max_results=5))
+        assert len(path.read_text().splitlines()) == 2
+
+        wrapped = RecordingSearchBackend(federation, str(path))
+        params = SearchPlugin(backend=wrapped, memory_cache=MemorySearchCache())._cache_params({"query": "q"}, wrapped)
+        assert params["backend"] == "federated:test_rec_a,test_rec_b"
+
+
+def _backend(urls, latency=0.0, fail=False):
+    """Fixture backend answering every query with the given URLs in rank order."""
+    results = [{"url": url, "title": url, "content": f"content of {url}", "score": 0.5} for url in urls]
+    return FixtureSearchBackend({"q": {"results": results}}, latency=latency, fail_first=100 if fail else 0)
+
+
+class TestFederatedSearch:
+    """Test cases for reciprocal-rank fusion and the federated backend."""
+
+    def test_rrf_rewards_agreement_and_merges_variants(self):
+        """Results ranked by several backends rise; URL variants merge."""
+        fused = reciprocal_rank_fusion({
+            "web": [{"url": "https://a.com/x"}, {"url": "https://www.b.com/y/"}],
+            "local": [{"url": "https://b.com/y?utm_source=feed"}, {"url": "https://c.com"}],
+        })
+        assert fused[0]["url"] == "https://www.b.com/y/"
+        assert fused[0]["backends"] == ["web", "local"]
+        assert [r["url"] for r in fused[1:]] == ["https://a.com/x", "https://c.com"]
+
+    def test_deadline_returns_partial_results(self):
+        """A backend that misses the deadline is cancelled and reported."""
+        federation = FederatedSearchBackend(
+            {"fast": _backend(["https://fast.com"]), "slow": _backend(["https://slow.com"], latency=2.0)},
+            deadline=0.2
+        )
+        start = time.perf_counter()
+        response = asyncio.run(federation.search(query="q", max_results=5))
+        assert time.perf_counter() - start < 1.0
+        assert [r["url"] for r in response["results"]] == ["https://fast.com"]
+        assert response["backends"] == {"fast": "ok", "slow": "timeout"}
+        assert response["partial"] is True
+
+    def test_all_backends_failing_raises(self):
+        """With no backend answering, the error surfaces for retry handling."""
+        federation = FederatedSearchBackend({"a": _backend([], fail=True)}, deadline=1.0)
+        with pytest.raises(ConnectionError):
+            asyncio.run(federation.search(query="q"))
+
+    def test_cancelling_the_caller_cancels_backend_calls(self):
+        """Backend calls still running when the caller is cancelled are cancelled too."""
+        cancelled = []
+
+        class HangingBackend:
+            name = "hanging"
+
+            async def search(self, **params):
+                try:
+                    await asyncio.sleep(3600)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+
+        federation = FederatedSearchBackend({"a": HangingBackend(), "b": HangingBackend()}, deadline=60)
+
+        async def run():
+            search = asyncio.ensure_future(federation.search(query="q"))
+            await asyncio.sleep(0.05)
+            search.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await search
+            return list(cancelled)
+
+        assert asyncio.run(run()) == [True, True]
+
+    def test_guard_success_requires_tavily_to_answer(self):
+        """A partial federated response without Tavily does not count as a Tavily success."""
+        partial = FederatedSearchBackend(
+            {"tavily": _backend(["https://slow.com"], latency=2.0), "local": _backend(["https://local.com"])},
+            deadline=0.2
+        )
+        complete = FederatedSearchBackend({"tavily": _backend(["https://web.com"])}, deadline=1.0)
+        for backend, expected in ((partial, 0), (complete, 1)):
+            plugin = SearchPlugin(backend=backend, memory_cache=MemorySearchCache())
+            with patch.object(plugin.guard, "record_success") as record_success:
+                asyncio.run(plugin.tavily_search("q"))
+            assert record_success.call_count == expected
+
+    def test_plugin_federated_search(self):
+        """federated_search fuses registered backends and reports missing ones without caching partials."""
+        backends = {
+            "test_web": _backend(["https://shared.com", "https://web.com"]),
+            "test_local": _backend(["https://local.com", "https://shared.com"]),
+            "test_slow": _backend(["https://slow.com"], latency=2.0),
+        }
+        for name, backend in backends.items():
+            register_search_backend(name, lambda backend=backend: backend)
+
+        plugin = SearchPlugin(backend=FixtureSearchBackend({}))
+        output = asyncio.run(plugin.federated_search("q", backends=list(backends), deadline_seconds=0.3))
+        results = json.loads(output)
+
+        assert results[0]["url"] == "https://shared.com"
+        assert sorted(results[0]["backends"]) == ["test_local", "test_web"]
+        assert {"error": "Backend test_slow timeout", "query": "q"} in results
+
+        asyncio.run(plugin.federated_search("q", backends=list(backends), deadline_seconds=0.3))
+        assert backends["test_web"].calls == 2
@@ -0,0 +1,176 @@
+"""
+Unit tests for the persistent search cache.
+"""
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.search_cache import MemorySearchCache, SearchCache, SingleFlight, make_cache_key
+from plugins.searchPlugin import SearchPlugin
+
+
+class TestSearchCache:
+    """Test cases for SearchCache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a SearchCache backed by a temporary database."""
+        cache = SearchCache(str(tmp_path / "cache.sqlite"), max_entries=3)
+        yield cache
+        cache.close()
+
+    def test_key_normalization(self):
+        """Equivalent queries share a key; different parameters do not."""
+        base = {"query": "MCP  Protocol", "max_results": 5, "include_answer": False}
+        assert make_cache_key(base) == make_cache_key({"query": "mcp protocol", "max_results": 5})
+        assert make_cache_key(base) != make_cache_key({**base, "time_range": "day"})
+
+    def test_hit_and_miss_counters(self, cache):
+        """Lookups update hit/miss statistics."""
+        params = {"query": "test", "max_results": 5}
+        assert cache.get(params) is None
+        cache.set(params, {"results": [{"url": "https://example.com"}]})
+        assert cache.get(params) == {"results": [{"url": "https://example.com"}]}
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+
+    def test_time_range_ttl_expiry(self, tmp_path):
+        """Entries expire according to their time_range TTL."""
+        cache = SearchCache(str(tmp_path / "ttl.sqlite"), ttls={"day": 0})
+        cache.set({"query": "news", "time_range": "day"}, {"results": []})
+        cache.set({"query": "history"}, {"results": []})
+
+        assert cache.get({"query": "news", "time_range": "day"}) is None
+        assert cache.get({"query": "history"}) == {"results": []}
+        cache.close()
+
+    def test_lru_eviction(self, cache):
+        """The least recently used entry is evicted once capacity is exceeded."""
+        for name in ["a", "b", "c"]:
+            cache.set({"query": name}, {"results": [name]})
+            time.sleep(0.01)
+        cache.get({"query": "a"})
+        cache.set({"query": "d"}, {"results": ["d"]})
+
+        assert cache.get({"query": "b"}) is None
+        assert cache.get({"query": "a"}) is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_persistence_across_instances(self, tmp_path):
+        """Cached responses survive reopening the database."""
+        path = str(tmp_path / "persist.sqlite")
+        first = SearchCache(path)
+        first.set({"query": "persist"}, {"results": [1]})
+        first.close()
+
+        second = SearchCache(path)
+        assert second.get({"query": "persist"}) == {"results": [1]}
+        second.close()
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_plugin_serves_repeated_search_from_cache(self, mock_tavily_client, cache):
+        """A repeated search does not reach the client."""
+        calls = []
+
+        class DummyAsyncClient:
+            async def search(self, **kwargs):
+                calls.append(kwargs)
+                return {"results": [{"url": "https://example.com", "title": "t", "content": "c", "score": 1.0}]}
+
+        plugin = SearchPlugin(cache=cache, memory_cache=MemorySearchCache(max_entries=0))
+        plugin.client = DummyAsyncClient()
+
+        first = asyncio.run(plugin.tavily_search("cached query", top_k=5))
+        second = asyncio.run(plugin.tavily_search("Cached  Query", top_k=5))
+
+        assert len(calls) == 1
+        assert '"url": "https://example.com"' in first
+        assert '"url": "https://example.com"' in second
+        assert cache.stats()["hits"] == 1
+
+
+class TestMemoryCacheAndSingleFlight:
+    """Test cases for the process-wide memory cache and single-flight layer."""
+
+    def test_memory_cache_lru_and_ttl(self):
+        """Entries are evicted by recency and expire by time_range TTL."""
+        cache = MemorySearchCache(max_entries=2, ttls={"day": 0})
+        cache.set({"query": "a"}, {"results": ["a"]})
+        cache.set({"query": "b"}, {"results": ["b"]})
+        cache.get({"query": "a"})
+        cache.set({"query": "c"}, {"results": ["c"]})
+        cache.set({"query": "news", "time_range": "day"}, {"results": []})
+
+        assert cache.get({"query": "b"}) is None
+        assert cache.get({"query": "news", "time_range": "day"}) is None
+        assert cache.get({"query": "c"}) == {"results": ["c"]}
+
+    def test_single_flight_shares_one_call(self):
+        """Concurrent callers with the same key share one upstream call."""
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"results": []}
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+
+        results = asyncio.run(run())
+        assert len(calls) == 1
+        assert all(r == {"results": []} for r in results)
+        assert flight.shared == 4
+
+    def test_single_flight_survives_leader_cancellation(self):
+        """Cancelling the first caller does not cancel the shared call."""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def run():
+            leader = asyncio.create_task(flight.do("key", fetch))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(flight.do("key", fetch))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(run()) == "done"
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_plugins_share_inflight_and_cached_results(self, mock_tavily_client):
+        """Separate plugin instances share one upstream call and the memory cache."""
+        calls = []
+
+        class SlowAsyncClient:
+            async def search(self, **kwargs):
+                calls.append(kwargs)
+                await asyncio.sleep(0.05)
+                return {"results": [{"url": "https://example.com", "title": "t", "content": "c", "score": 1.0}]}
+
+        feeder = SearchPlugin()
+        critic = SearchPlugin()
+        feeder.client = SlowAsyncClient()
+        critic.client = SlowAsyncClient()
+
+        async def run():
+            await asyncio.gather(feeder.tavily_search("shared query"), critic.tavily_search("shared query"))
+            return await critic.tavily_search("shared query")
+
+        result = asyncio.run(run())
+        assert len(calls) == 1
+        assert '"url": "https://example.com"' in result
@@ -0,0 +1,61 @@
+"""
+Unit tests for the shared search client registry.
+"""
+import asyncio
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.search_clients import SearchClientRegistry, _pool_limits
+
+
+class TestSearchClientRegistry:
+    """Test cases for SearchClientRegistry."""
+
+    def test_client_shared_within_loop(self):
+        """Every caller on one loop gets the same pooled client."""
+        registry = SearchClientRegistry()
+
+        async def run():
+            first = registry.get("test-key")
+            second = registry.get("test-key")
+            other = registry.get("other-key")
+            await registry.close()
+            return first, second, other
+
+        first, second, other = asyncio.run(run())
+        assert first is second
+        assert first is not other
+
+    def test_new_loop_gets_new_client(self):
+        """Clients are not reused across event loops."""
+        registry = SearchClientRegistry()
+
+        async def run():
+            client = registry.get("test-key")
+            await registry.close()
+            return client
+
+        assert asyncio.run(run()) is not asyncio.run(run())
+
+    def test_close_releases_pool(self):
+        """Closing the registry closes the pooled HTTP client."""
+        registry = SearchClientRegistry()
+
+        async def run():
+            registry.get("test-key")
+            _, http_client = registry._clients[asyncio.get_running_loop()]["test-key"]
+            await registry.close()
+            return http_client
+
+        assert asyncio.run(run()).is_closed
+
+    def test_pool_limits_from_environment(self, monkeypatch):
+        """Pool limits are configurable."""
+        monkeypatch.setenv("SEARCH_POOL_MAX_CONNECTIONS", "7")
+        monkeypatch.setenv("SEARCH_POOL_MAX_KEEPALIVE", "3")
+        limits = _pool_limits()
+        assert limits.max_connections == 7
+        assert limits.max_keepalive_connections == 3
@@ -0,0 +1,130 @@
+"""
+Unit tests for the paraphrase-tolerant query cache.
+"""
+import asyncio
+import json
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.search_cache import MemorySearchCache, SearchCache
+from plugins.searchPlugin import SearchPlugin
+from plugins.semantic_cache import SemanticQueryCache, align_queries, ngram_similarity, normalize_query
+
+
+class CountingBackend:
+    """Backend returning one result per query and counting calls."""
+
+    name = "tavily"
+
+    def __init__(self):
+        self.queries = []
+
+    async def search(self, **params):
+        self.queries.append(params["query"])
+        return {"results": [{"url": f"https://example.com/{len(self.queries)}", "title": params["query"],
+                             "content": f"Result for {params['query']}", "score": 0.9}]}
+
+
+class TestSemanticCache:
+    """Test cases for query normalization and paraphrase matching."""
+
+    def test_normalize_query(self):
+        """Case, punctuation, stopwords and plurals are dropped; CJK is segmented."""
+        assert normalize_query("What is the  Model Context Protocol?") == ["model", "context", "protocol"]
+        assert normalize_query("Azure OpenAI updates in 2025") == ["azure", "openai", "update", "2025"]
+        assert normalize_query("C++ and C# news") == ["c++", "c#", "news"]
+        assert normalize_query("windows server statistics") == ["windows", "server", "statistics"]
+        assert normalize_query("什么是模型上下文协议") == normalize_query("模型上下文协议介绍")
+        assert normalize_query("the of and") == []
+
+    def test_acronyms_match_their_expansion(self):
+        """An acronym and its spelled-out form compare equal, redundant words included."""
+        a, b = align_queries(normalize_query("MCP protocol architecture"),
+                             normalize_query("Model Context Protocol architecture overview"))
+        assert sorted(a) == sorted(b) == ["architecture", "mcp"]
+
+        a, b = align_queries(normalize_query("gpt tutorial"), normalize_query("gpt"))
+        assert a == ["gpt", "tutorial"]
+
+    def test_similarity_threshold(self):
+        """Close paraphrases pass the threshold; different topics do not."""
+        assert ngram_similarity(normalize_query("Azure OpenAI updates 2025"),
+                                normalize_query("latest Azure OpenAI update 2025")) > 0.85
+        assert ngram_similarity(["o3", "model", "pricing"], ["o3", "model", "benchmark"]) < 0.6
+
+    def test_lookup_requires_matching_parameters(self):
+        """Only the query may differ; other parameters must be identical."""
+        cache = SemanticQueryCache(threshold=0.85)
+        cache.add({"query": "Model Context Protocol architecture", "max_results": 5})
+
+        match = cache.lookup({"query": "MCP protocol architecture", "max_results": 5})
+        assert match.kind == "semantic"
+        assert match.params["query"] == "Model Context Protocol architecture"
+        assert cache.lookup({"query": "the model context protocol architecture", "max_results": 5}).kind == \
+            "normalized"
+        assert cache.lookup({"query": "MCP protocol architecture", "max_results": 5, "time_range": "day"}) is None
+        assert cache.lookup({"query": "MCP security", "max_results": 5}) is None
+
+    def test_different_versions_numbers_and_opposites_never_match(self):
+        """Near-identical queries that differ in a number, version, negation or opposite word are misses."""
+        cache = SemanticQueryCache(threshold=0.5)
+        pairs = [
+            ("python 3.12 release notes", "python 3.11 release notes"),
+            ("gpt-5 benchmark results", "gpt-4 benchmark results"),
+            ("AI regulation news 2025", "AI regulation news 2024"),
+            ("uninstall windows", "install windows"),
+            ("agents with memory", "agents without memory"),
+            ("pricing before launch", "pricing after launch"),
+            ("climate change effects on agriculture", "climate change effects on agriculture in africa"),
+            ("quantum computing error correction", "quantum computing error correction ibm"),
+            ("large language model evaluation benchmarks", "large language model evaluation benchmarks for medicine"),
+            ("electric vehicle market trends", "electric vehicle market trends china"),
+            ("azure openai service quotas", "azure openai service quotas japan"),
+        ]
+        for cached, query in pairs:
+            cache.add({"query": cached, "max_results": 5})
+            assert cache.lookup({"query": query, "max_results": 5}) is None, (cached, query)
+        assert cache.lookup({"query": "Python 3.12 release note", "max_results": 5}).kind == "normalized"
+
+    def test_reordering_and_word_forms_still_match(self):
+        """Queries with the same content terms in another order or form are served from the cache."""
+        cache = SemanticQueryCache()
+        cache.add({"query": "large language model evaluation benchmarks", "max_results": 5})
+        match = cache.lookup({"query": "benchmarks for evaluating large language models", "max_results": 5})
+        assert match is not None and match.kind == "semantic"
+
+    def test_plugin_serves_paraphrases_and_counts_hits(self):
+        """Paraphrased searches are served from the cache and reported separately from exact hits."""
+        backend = CountingBackend()
+        query_cache = SemanticQueryCache()
+        plugin = SearchPlugin(backend=backend, memory_cache=MemorySearchCache(), query_cache=query_cache)
+
+        first = json.loads(asyncio.run(plugin.tavily_search("Model Context Protocol architecture overview")))
+        asyncio.run(plugin.tavily_search("model context protocol architecture overview"))
+        paraphrase = json.loads(asyncio.run(SearchPlugin(
+            backend=backend, memory_cache=plugin.memory_cache, query_cache=query_cache
+        ).tavily_search("MCP protocol architecture")))
+        asyncio.run(plugin.tavily_search("MCP security best practices"))
+
+        assert backend.queries == ["Model Context Protocol architecture overview", "MCP security best practices"]
+        assert paraphrase[0]["url"] == first[0]["url"]
+        stats = query_cache.stats()
+        assert (stats["exact_hits"], stats["semantic_hits"], stats["misses"]) == (1, 1, 2)
+        assert stats["hit_rate"] == 0.5
+
+    def test_paraphrase_hits_persistent_cache(self, tmp_path):
+        """A paraphrase is served from the persistent cache when memory no longer holds the response."""
+        backend = CountingBackend()
+        cache = SearchCache(str(tmp_path / "cache.sqlite"))
+        query_cache = SemanticQueryCache()
+        plugin = SearchPlugin(cache=cache, backend=backend, memory_cache=MemorySearchCache(max_entries=0),
+                              query_cache=query_cache)
+
+        asyncio.run(plugin.tavily_search("large language model evaluation benchmarks"))
+        asyncio.run(plugin.tavily_search("benchmarks for evaluating large language models"))
+        assert len(backend.queries) == 1
+        assert query_cache.stats()["semantic_hits"] == 1
+        cache.close()
@@ -0,0 +1,46 @@
+"""
+Unit tests for the chat completion service registry.
+"""
+import asyncio
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.service_registry import ChatServiceRegistry
+
+
+class TestServiceRegistry:
+    """Test cases for memoized services and the shared HTTP client."""
+
+    def test_services_are_memoized_and_share_one_client(self, monkeypatch):
+        """The same deployment returns the same service; all services share one pool."""
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com/")
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_API_VERSION", "2024-10-21")
+        monkeypatch.setenv("AZURE_OPENAI_POOL_MAX_CONNECTIONS", "7")
+        registry = ChatServiceRegistry()
+
+        mini = registry.get("gpt-4.1-mini")
+        assert registry.get("gpt-4.1-mini") is mini
+        o3 = registry.get("o3")
+        assert o3 is not mini
+        assert len(registry) == 2
+        assert mini.client._client is o3.client._client
+        assert mini.client._client._transport._pool._max_connections == 7
+
+    def test_close_releases_client_and_services(self, monkeypatch):
+        """Closing shuts the shared client; later requests build fresh services."""
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com/")
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        registry = ChatServiceRegistry()
+        service = registry.get("o3")
+        http_client = service.client._client
+
+        asyncio.run(registry.close())
+        assert http_client.is_closed
+        assert len(registry) == 0
+        fresh = registry.get("o3")
+        assert fresh is not service
+        assert not fresh.client._client.is_closed
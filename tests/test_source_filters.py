@@ -0,0 +1,81 @@
+"""
+Unit tests for domain filters and source-type presets.
+"""
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plugins.searchPlugin import SearchPlugin
+from plugins.source_filters import SOURCE_PRESETS, domain_matches, normalize_domain, resolve_domain_filters
+
+
+class TestSourceFilters:
+    """Test cases for domain validation and filtering."""
+
+    def test_normalize_domain(self):
+        """URLs, wildcards and www prefixes reduce to a bare host; junk is rejected."""
+        assert normalize_domain("https://www.Anthropic.com/news") == "anthropic.com"
+        assert normalize_domain("*.arxiv.org") == "arxiv.org"
+        assert normalize_domain("edu") == "edu"
+        for invalid in ("", "not a domain", "exa_mple.com"):
+            with pytest.raises(ValueError):
+                normalize_domain(invalid)
+
+    def test_resolve_combines_presets(self):
+        """Presets extend the include list; conflicts and unknown presets are errors."""
+        include, exclude = resolve_domain_filters("anthropic.com", ["reddit.com"], ["Official Docs"])
+        assert "anthropic.com" in include and "learn.microsoft.com" in include
+        assert len(include) == len(SOURCE_PRESETS["official_docs"]) + 1
+        assert exclude == ["reddit.com"]
+        with pytest.raises(ValueError, match="Unknown source type"):
+            resolve_domain_filters(source_types=["blogs"])
+        with pytest.raises(ValueError, match="both included and excluded"):
+            resolve_domain_filters(["reuters.com"], ["reuters.com"])
+
+    def test_exclude_narrows_a_preset(self):
+        """Excluding a preset domain removes it from the include list instead of failing."""
+        include, exclude = resolve_domain_filters(exclude_domains=["arxiv.org"], source_types=["academic"])
+        assert "arxiv.org" not in include and len(include) == len(SOURCE_PRESETS["academic"]) - 1
+        assert exclude == ["arxiv.org"]
+
+    def test_domain_matches_suffixes(self):
+        """Subdomains and suffix presets match; lookalike hosts do not."""
+        assert domain_matches("www.docs.anthropic.com", ["anthropic.com"])
+        assert domain_matches("cs.stanford.edu", ["edu"])
+        assert not domain_matches("notanthropic.com", ["anthropic.com"])
+
+    @patch('plugins.searchPlugin.get_search_backend')
+    def test_plugin_sends_and_enforces_filters(self, mock_tavily_client):
+        """Filters reach the backend and are enforced on the results it returns."""
+        class DummyAsyncClient:
+            params = None
+
+            async def search(self, **kwargs):
+                DummyAsyncClient.params = kwargs
+                return {"results": [
+                    {"url": "https://www.anthropic.com/news/mcp", "title": "MCP", "content": "MCP", "score": 0.9},
+                    {"url": "https://cs.stanford.edu/mcp", "title": "Paper", "content": "MCP paper", "score": 0.8},
+                    {"url": "https://someblog.net/mcp", "title": "Blog", "content": "MCP blog", "score": 0.7},
+                ]}
+
+        plugin = SearchPlugin()
+        plugin.client = DummyAsyncClient()
+        results = json.loads(asyncio.run(plugin.tavily_search(
+            "MCP", include_domains=["anthropic.com"], source_types=["academic"]
+        )))
+        assert {r["url"] for r in results} == {"https://www.anthropic.com/news/mcp", "https://cs.stanford.edu/mcp"}
+        assert "anthropic.com" in DummyAsyncClient.params["include_domains"]
+        assert "exclude_domains" not in DummyAsyncClient.params
+
+        excluded = json.loads(asyncio.run(plugin.tavily_search("MCP agents", exclude_domains=["someblog.net"])))
+        assert "https://someblog.net/mcp" not in [r.get("url") for r in excluded]
+
+        error = json.loads(asyncio.run(plugin.tavily_search("MCP", source_types=["blogs"])))
+        assert "Unknown source type" in error[0]["error"]
@@ -0,0 +1,102 @@
+"""
+Unit tests for the streaming multiplexer.
+"""
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from semantic_kernel.contents import StreamingChatMessageContent
+from semantic_kernel.contents.utils.author_role import AuthorRole
+
+from utils.output_sink import render_event
+from utils.stream_mux import StreamMultiplexer
+from utils.util import make_streaming_callback
+
+
+class ListDispatcher:
+    """Dispatcher collecting events in a list."""
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+        return True
+
+
+def _chunk(name, text):
+    return StreamingChatMessageContent(role=AuthorRole.ASSISTANT, content=text, choice_index=0, name=name)
+
+
+class TestStreamMux:
+    """Test cases for per-stream buffering, banners and metrics."""
+
+    def test_interleaved_streams_do_not_mix(self):
+        """Tokens of concurrent agents are flushed as whole blocks under the right banner."""
+        dispatcher = ListDispatcher()
+        mux = StreamMultiplexer(dispatcher, flush_chars=6, flush_interval=60)
+        for a, b in zip(["Hel", "lo ", "wor", "ld"], ["Bon", "jou", "r"]):
+            mux.feed("run-1", "Writer", a, False)
+            mux.feed("run-1", "Critic", b, False)
+        mux.feed("run-1", "Writer", "ld", True)
+        mux.feed("run-1", "Critic", "", True)
+
+        text = "".join(render_event(e) for e in dispatcher.events)
+        writer_blocks = [e["content"] for e in dispatcher.events if e.get("agent") == "Writer"
+                         and e["type"] == "stream_chunk"]
+        assert "".join(writer_blocks) == "Hello world"
+        assert text.count("🤖 **Writer**") == 1 and text.count("🤖 **Critic**") == 1
+        assert "Critic (continued)" in text or "Writer (continued)" in text
+        assert [e["agent"] for e in dispatcher.events if e["type"] == "stream_end"] == ["Writer", "Critic"]
+
+    def test_same_agent_in_two_orchestrations(self):
+        """Equal agent names in different orchestrations are separate streams."""
+        dispatcher = ListDispatcher()
+        mux = StreamMultiplexer(dispatcher, flush_chars=1000)
+        mux.feed("a", "Writer", "first", False)
+        mux.feed("b", "Writer", "second", False)
+        mux.feed("a", "Writer", "", True)
+        mux.feed("b", "Writer", "", True)
+        chunks = [e for e in dispatcher.events if e["type"] == "stream_chunk"]
+        assert [(c["stream"].split("/")[0], c["content"]) for c in chunks] == [("a", "first"), ("b", "second")]
+
+    def test_metrics_per_stream(self):
+        """Time to first token and tokens per second are reported when a stream ends."""
+        dispatcher = ListDispatcher()
+        mux = StreamMultiplexer(dispatcher)
+        mux.begin("run")
+        time.sleep(0.05)
+        for token in ["a", "b", "c", "d", "e"]:
+            mux.feed("run", "Writer", token, False)
+            time.sleep(0.01)
+        mux.feed("run", "Writer", "", True)
+
+        stats = mux.stats()["completed"][-1]
+        assert stats["tokens"] == 5 and stats["complete"]
+        assert stats["ttft"] >= 0.05
+        assert 0 < stats["tokens_per_second"] <= 400
+        assert dispatcher.events[-1]["stats"] == stats
+
+    def test_open_streams_are_bounded(self):
+        """Beyond max_streams the least recently active stream is closed as incomplete."""
+        mux = StreamMultiplexer(ListDispatcher(), max_streams=2)
+        for agent in ["A", "B", "C"]:
+            mux.feed("run", agent, "x", False)
+        stats = mux.stats()
+        assert [s["agent"] for s in stats["completed"]] == ["A"]
+        assert stats["completed"][0]["complete"] is False
+        assert [s["agent"] for s in stats["active"]] == ["B", "C"]
+
+    def test_callback_per_orchestration(self, monkeypatch):
+        """make_streaming_callback binds chat message chunks to one orchestration."""
+        dispatcher = ListDispatcher()
+        mux = StreamMultiplexer(dispatcher)
+        monkeypatch.setattr("utils.util.get_stream_multiplexer", lambda: mux)
+        callback = make_streaming_callback("report")
+        callback(_chunk("Writer", "Hi"), False)
+        callback(_chunk("Writer", ""), True)
+        assert dispatcher.events[0]["stream"].startswith("report/Writer")
+        assert mux.stats()["completed"][0]["orchestration"] == "report"
@@ -0,0 +1,100 @@
+"""
+Unit tests for the token and cost ledger.
+"""
+import asyncio
+import json
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai.types.chat import ChatCompletion
+from semantic_kernel.agents import ChatCompletionAgent
+from semantic_kernel.functions import kernel_function
+
+from utils import usage_ledger
+from utils.usage_ledger import MeteredAzureChatCompletion, UsageLedger
+
+
+def _completion(content=None, tool_call=None, prompt=1000, cached=400, completion=200, reasoning=50):
+    message = {"role": "assistant", "content": content}
+    if tool_call:
+        message["tool_calls"] = [{"id": "call_1", "type": "function",
+                                  "function": {"name": tool_call, "arguments": "{}"}}]
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "o4-mini",
+        "choices": [{"index": 0, "finish_reason": "tool_calls" if tool_call else "stop", "message": message}],
+        "usage": {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion,
+                  "prompt_tokens_details": {"cached_tokens": cached},
+                  "completion_tokens_details": {"reasoning_tokens": reasoning}},
+    })
+
+
+class ClockPlugin:
+    """Plugin with one tool for the agent to call."""
+
+    @kernel_function(description="Return the time.")
+    def now(self) -> str:
+        return "12:00"
+
+
+class TestUsageLedger:
+    """Test cases for recording, aggregation, cost and export."""
+
+    def test_cost_counts_cached_tokens_at_the_cached_price(self):
+        """Cached prompt tokens use the cached price; unknown deployments have no cost."""
+        ledger = UsageLedger({"o4-mini": (1.0, 0.25, 4.0)})
+        assert ledger.cost("o4-mini", 1_000_000, 400_000, 100_000) == 0.6 + 0.1 + 0.4
+        assert ledger.cost("custom", 10, 0, 10) is None
+
+    def test_aggregate_per_agent_deployment_and_run(self, tmp_path):
+        """Records roll up per group, most expensive first, and export as JSONL."""
+        ledger = UsageLedger({"o4-mini": (1.1, 0.275, 4.4), "gpt-4.1-mini": (0.4, 0.1, 1.6)})
+        run = ledger.start_run("run-a")
+        for _ in range(3):
+            ledger.record_completion("ReportWriterAgent", "o4-mini", _completion().usage, 2.0)
+        ledger.record_completion("DataFeederAgent", "gpt-4.1-mini", _completion().usage, 1.0)
+        ledger.record_tool_call("DataFeederAgent", "SearchPlugin-tavily_search", 0.5)
+        ledger.start_run("run-b")
+        ledger.record_completion("DataFeederAgent", "gpt-4.1-mini", None, 1.0, error="timeout")
+
+        rows = ledger.aggregate(("agent",), run_id=run)
+        assert [r["agent"] for r in rows] == ["ReportWriterAgent", "DataFeederAgent"]
+        assert rows[0]["calls"] == 3 and rows[0]["cached_tokens"] == 1200 and rows[0]["reasoning_tokens"] == 150
+        assert rows[1]["tool_calls"] == 1 and rows[1]["errors"] == 0
+        assert [r["run"] for r in ledger.aggregate(("run",))] == ["run-a", "run-b"]
+        assert ledger.aggregate(("deployment",), run_id="run-b")[0]["errors"] == 1
+
+        table = ledger.summary_table(run_id=run)
+        assert "ReportWriterAgent" in table.splitlines()[2] and "TOTAL" in table.splitlines()[-1]
+
+        path = tmp_path / "usage.jsonl"
+        assert ledger.export_jsonl(str(path), run_id=run) == 5
+        assert json.loads(path.read_text().splitlines()[0])["deployment"] == "o4-mini"
+
+    def test_agent_requests_and_tool_calls_are_attributed(self, monkeypatch):
+        """Each model request of an agent turn and each tool call is recorded under the agent."""
+        ledger = UsageLedger()
+        monkeypatch.setattr(usage_ledger, "_ledger", ledger)
+        responses = [_completion(tool_call="ClockPlugin-now"), _completion(content="It is noon.", cached=0)]
+
+        async def send_request(self, settings):
+            return responses.pop(0)
+
+        monkeypatch.setattr(MeteredAzureChatCompletion, "_send_request", send_request)
+        service = MeteredAzureChatCompletion(deployment_name="o4-mini", endpoint="https://example.openai.azure.com/",
+                                             api_key="test-key", api_version="2024-10-21")
+        agent = ledger.register_agent(ChatCompletionAgent(name="ReportWriterAgent", instructions="Answer.",
+                                                          service=service, plugins=[ClockPlugin()]))
+
+        response = asyncio.run(agent.get_response(messages="What time is it?"))
+        assert "noon" in str(response.content)
+
+        records = ledger.records()
+        assert [(r["kind"], r["agent"]) for r in records] == [
+            ("completion", "ReportWriterAgent"), ("tool", "ReportWriterAgent"), ("completion", "ReportWriterAgent")
+        ]
+        assert records[0]["deployment"] == "o4-mini" and records[0]["cached_tokens"] == 400
+        assert records[1]["function"] == "ClockPlugin-now"
+        assert records[2]["cost"] > 0
@@ -0,0 +1,286 @@
+"""
+Asynchronous human-in-the-loop input with deadlines and a default action.
+"""
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from semantic_kernel.contents import AuthorRole, ChatHistory, ChatMessageContent
+
+from utils.output_sink import get_output_dispatcher
+
+logger = logging.getLogger(__name__)
+
+# What happens when nobody answers before the deadline
+DEFAULT_ACTIONS = ("continue", "terminate")
+
+
+class NullChannel:
+    """Channel for unattended runs: nobody ever answers."""
+
+    async def ask(self, request: Dict[str, Any]) -> Optional[str]:
+        """Return None at once."""
+        return None
+
+
+class ConsoleChannel:
+    """Channel reading answers from standard input on a background thread.
+
+    One daemon thread reads stdin line by line and hands each line to the
+    request waiting for it, so the event loop never blocks in input(). Lines
+    typed while no request is waiting are discarded. Requests are answered one
+    at a time.
+    """
+
+    def __init__(self, prompt_stream: Any = None, input_stream: Any = None):
+        """
+        Initialize the channel.
+
+        Args:
+            prompt_stream: Stream prompts are written to (default sys.stdout)
+            input_stream: Stream answers are read from (default sys.stdin)
+        """
+        self.prompt_stream = prompt_stream
+        self.input_stream = input_stream
+        self._waiter: Optional[tuple] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._turn: Optional[asyncio.Lock] = None
+        self._eof = False
+
+    def _read_lines(self) -> None:
+        for line in self.input_stream or sys.stdin:
+            self._deliver(line.rstrip("\r\n"))
+        with self._lock:
+            self._eof = True
+        self._deliver(None)
+
+    def _deliver(self, line: Optional[str]) -> None:
+        with self._lock:
+            waiter, self._waiter = self._waiter, None
+        if waiter is None:
+            if line is not None:
+                logger.debug("Discarded console input received while no request was waiting")
+            return
+        loop, future = waiter
+        try:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(line))
+        except RuntimeError:
+            logger.debug("Discarded console input for a closed event loop")
+
+    async def ask(self, request: Dict[str, Any]) -> Optional[str]:
+        """
+        Prompt on the console and wait for the next line.
+
+        Args:
+            request: Request with a "prompt"
+
+        Returns:
+            Optional[str]: The line typed, or None once stdin is closed
+        """
+        if self._eof:
+            return None
+        if self._turn is None:
+            self._turn = asyncio.Lock()
+        async with self._turn:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            with self._lock:
+                if self._eof:
+                    return None
+                self._waiter = (loop, future)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._read_lines, name="human-input-reader", daemon=True)
+                    self._thread.start()
+            await asyncio.to_thread(get_output_dispatcher().flush)
+            stream = self.prompt_stream or sys.stdout
+            stream.write(request["prompt"])
+            stream.flush()
+            try:
+                return await future
+            finally:
+                with self._lock:
+                    if self._waiter is not None and self._waiter[1] is future:
+                        self._waiter = None
+
+
+class FileQueueChannel:
+    """Channel exchanging requests and answers through a directory.
+
+    Each request is written to requests/<id>.json with its prompt, context and
+    deadline. An operator, script or UI answers by writing responses/<id>.txt;
+    the channel polls for it without blocking the event loop. Both files are
+    removed once the request is answered or abandoned.
+    """
+
+    def __init__(self, directory: str, poll_interval: float = 0.5):
+        """
+        Initialize the channel.
+
+        Args:
+            directory: Queue directory; requests/ and responses/ are created in it
+            poll_interval: Seconds between checks for an answer
+        """
+        self.requests_dir = os.path.join(directory, "requests")
+        self.responses_dir = os.path.join(directory, "responses")
+        self.poll_interval = poll_interval
+        os.makedirs(self.requests_dir, exist_ok=True)
+        os.makedirs(self.responses_dir, exist_ok=True)
+
+    async def ask(self, request: Dict[str, Any]) -> Optional[str]:
+        """
+        Publish a request and wait for its answer file.
+
+        Args:
+            request: Request with an "id"
+
+        Returns:
+            Optional[str]: Content of the answer file
+        """
+        request_path = os.path.join(self.requests_dir, f"{request['id']}.json")
+        response_path = os.path.join(self.responses_dir, f"{request['id']}.txt")
+        tmp_path = request_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(request, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, request_path)
+        logger.info(f"Waiting for human input: write {response_path} to answer")
+        try:
+            while not os.path.exists(response_path):
+                await asyncio.sleep(self.poll_interval)
+            with open(response_path, encoding="utf-8") as f:
+                return f.read().strip()
+        finally:
+            for path in (request_path, response_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+class HumanInputBroker:
+    """Ask a human through a channel, falling back to a default action at the deadline.
+
+    Every request gets its own deadline. If nobody answers in time (or the
+    channel has nobody to ask), the default action applies: "continue" replies
+    with the default response so the orchestration carries on, "terminate"
+    replies with a message the group chat manager treats as a stop signal.
+    Waiting only suspends the requesting coroutine; other sessions keep running.
+    """
+
+    def __init__(
+        self,
+        channel: Any,
+        timeout: Optional[float] = 300.0,
+        default_action: str = "continue",
+        default_response: str = "No further feedback. Please continue."
+    ):
+        """
+        Initialize the broker.
+
+        Args:
+            channel: Object with async ask(request) returning the answer or None
+            timeout: Seconds to wait per request (None or <= 0 waits indefinitely)
+            default_action: Action on timeout, one of DEFAULT_ACTIONS
+            default_response: Reply used by the "continue" action
+
+        Raises:
+            ValueError: On an unknown default action
+        """
+        if default_action not in DEFAULT_ACTIONS:
+            raise ValueError(
+                f"Unknown default action {default_action!r} (available: {', '.join(DEFAULT_ACTIONS)})"
+            )
+        self.channel = channel
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.default_action = default_action
+        self.default_response = default_response
+
+    async def ask(
+        self,
+        prompt: str,
+        context: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> ChatMessageContent:
+        """
+        Request input from a human.
+
+        Args:
+            prompt: Text shown to the human
+            context: Message the human is asked to respond to
+            timeout: Deadline for this request in seconds (default: the broker's)
+
+        Returns:
+            ChatMessageContent: User message; metadata "human_input" is "answered",
+                "timeout" or "unavailable", and "action" names the default action applied
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        request = {
+            "id": uuid.uuid4().hex,
+            "prompt": prompt,
+            "context": context,
+            "created": time.time(),
+            "deadline": time.time() + timeout if timeout else None,
+            "default_action": self.default_action,
+        }
+        try:
+            answer = await asyncio.wait_for(self.channel.ask(request), timeout)
+            status = "answered" if answer is not None else "unavailable"
+        except asyncio.TimeoutError:
+            answer, status = None, "timeout"
+
+        if answer is not None:
+            return ChatMessageContent(role=AuthorRole.USER, content=answer, metadata={"human_input": status})
+
+        logger.info(f"No human input ({status}) for request {request['id']}; applying '{self.default_action}'")
+        content = (
+            self.default_response if self.default_action == "continue"
+            else "No human response before the deadline. Stop here."
+        )
+        return ChatMessageContent(role=AuthorRole.USER, content=content,
+                                  metadata={"human_input": status, "action": self.default_action})
+
+
+def is_termination_request(chat_history: ChatHistory) -> bool:
+    """Return True if the last message is a default "terminate" human response."""
+    if not chat_history.messages:
+        return False
+    metadata = chat_history.messages[-1].metadata or {}
+    return metadata.get("action") == "terminate" and metadata.get("human_input") != "answered"
+
+
+_broker: Optional[HumanInputBroker] = None
+_broker_lock = threading.Lock()
+
+
+def _build_channel() -> Any:
+    """Build the channel named by HUMAN_INPUT_CHANNEL."""
+    default = "console" if sys.stdin is not None and sys.stdin.isatty() else "none"
+    name = os.getenv("HUMAN_INPUT_CHANNEL", default).lower()
+    if name == "console":
+        return ConsoleChannel()
+    if name == "file":
+        return FileQueueChannel(os.getenv("HUMAN_INPUT_DIR", ".cache/human_input"),
+                                poll_interval=float(os.getenv("HUMAN_INPUT_POLL_INTERVAL", "0.5")))
+    if name == "none":
+        return NullChannel()
+    raise ValueError(f"Unknown human input channel: {name!r} (use console, file or none)")
+
+
+def get_human_input_broker() -> HumanInputBroker:
+    """Return the process-wide human input broker configured from the environment."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = HumanInputBroker(
+                _build_channel(),
+                timeout=float(os.getenv("HUMAN_INPUT_TIMEOUT", "300")),
+                default_action=os.getenv("HUMAN_INPUT_DEFAULT_ACTION", "continue").lower(),
+                default_response=os.getenv("HUMAN_INPUT_DEFAULT_RESPONSE", "No further feedback. Please continue."),
+            )
+        return _broker
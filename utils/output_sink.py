@@ -0,0 +1,376 @@
+"""
+Non-blocking, batched output sinks for agent callbacks.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+SEPARATOR = "=" * 60
+
+# What emit() does when the queue is full
+POLICIES = ("block", "drop_new", "drop_oldest")
+
+
+def render_event(event: Dict[str, Any]) -> str:
+    """
+    Render an output event as console text.
+
+    Args:
+        event: Event with a "type" of message, stream_chunk, stream_end or notice.
+            A stream chunk with a "header" of "start" or "continue" is preceded by
+            the agent banner; a stream end may carry the stream's "stats".
+
+    Returns:
+        str: Text to write
+    """
+    kind = event.get("type")
+    if kind == "message":
+        return f"\n{SEPARATOR}\n🤖 **{event.get('agent')}**\n{SEPARATOR}\n{event.get('content', '')}\n{SEPARATOR}\n\n"
+    if kind == "stream_chunk":
+        header = event.get("header")
+        if header == "start":
+            return f"\n{SEPARATOR}\n🤖 **{event.get('agent')}**\n{SEPARATOR}\n{event.get('content', '')}"
+        if header == "continue":
+            return f"\n--- 🤖 {event.get('agent')} (continued) ---\n{event.get('content', '')}"
+        return event.get("content", "")
+    if kind == "stream_end":
+        stats = event.get("stats")
+        if stats:
+            return (
+                f"\n{SEPARATOR}\n[{stats['tokens']} tokens, first token after {stats['ttft']}s, "
+                f"{stats['tokens_per_second']} tokens/s]\n\n"
+            )
+        return f"{SEPARATOR}\n\n"
+    return f"\n[{event.get('content', '')}]\n"
+
+
+def coalesce_events(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge consecutive chunks of the same stream into one event.
+
+    Args:
+        events: Events in emission order
+
+    Returns:
+        List[Dict[str, Any]]: Events with adjacent chunks joined
+    """
+    merged: List[Dict[str, Any]] = []
+    for event in events:
+        previous = merged[-1] if merged else None
+        if (
+            previous is not None
+            and event.get("type") == "stream_chunk"
+            and previous.get("type") == "stream_chunk"
+            and not event.get("header")
+            and previous.get("stream", previous.get("agent")) == event.get("stream", event.get("agent"))
+        ):
+            merged[-1] = dict(previous, content=previous.get("content", "") + event.get("content", ""))
+        else:
+            merged.append(event)
+    return merged
+
+
+class TextSink:
+    """Sink writing rendered events to a text stream."""
+
+    def __init__(self, stream: TextIO, owns_stream: bool = False):
+        """
+        Initialize the sink.
+
+        Args:
+            stream: Stream to write to
+            owns_stream: Close the stream when the sink closes
+        """
+        self.stream = stream
+        self.owns_stream = owns_stream
+
+    def write_batch(self, events: List[Dict[str, Any]]) -> None:
+        """Write a batch of events with a single write and flush."""
+        self.stream.write("".join(render_event(e) for e in events))
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Close the stream if the sink owns it."""
+        if self.owns_stream:
+            self.stream.close()
+
+
+class StdoutSink(TextSink):
+    """Sink writing rendered events to standard output."""
+
+    def __init__(self):
+        """Initialize the sink on sys.stdout."""
+        super().__init__(sys.stdout)
+
+
+class FileSink(TextSink):
+    """Sink appending rendered events to a text file."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the sink.
+
+        Args:
+            path: File to append to; parent directories are created
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        super().__init__(open(path, "a", encoding="utf-8"), owns_stream=True)
+
+
+class JsonlSink:
+    """Sink appending raw events as JSON lines."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the sink.
+
+        Args:
+            path: JSONL file to append to; parent directories are created
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.stream = open(path, "a", encoding="utf-8")
+
+    def write_batch(self, events: List[Dict[str, Any]]) -> None:
+        """Write a batch of events, one JSON object per line."""
+        self.stream.write("".join(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in events))
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self.stream.close()
+
+
+def build_sinks(spec: str) -> List[Any]:
+    """
+    Build sinks from a comma-separated specification.
+
+    Args:
+        spec: Entries such as "stdout", "file:logs/run.txt" or "jsonl:logs/run.jsonl"
+
+    Returns:
+        List[Any]: Sinks in the given order
+
+    Raises:
+        ValueError: On an unknown sink type
+    """
+    sinks: List[Any] = []
+    for entry in (part.strip() for part in spec.split(",")):
+        if not entry:
+            continue
+        kind, _, path = entry.partition(":")
+        kind = kind.lower()
+        if kind == "stdout":
+            sinks.append(StdoutSink())
+        elif kind == "file" and path:
+            sinks.append(FileSink(path))
+        elif kind == "jsonl" and path:
+            sinks.append(JsonlSink(path))
+        else:
+            raise ValueError(f"Unknown output sink: {entry!r} (use stdout, file:PATH or jsonl:PATH)")
+    return sinks
+
+
+class OutputDispatcher:
+    """Bounded queue drained by a background writer thread.
+
+    Callbacks call emit(), which only enqueues. The writer waits up to
+    flush_interval to collect a batch, joins adjacent stream chunks and hands
+    the batch to every sink, so a slow terminal or pipe costs one write per
+    interval instead of one blocking print per token. When the queue is full
+    the policy decides: "block" waits up to block_timeout (backpressure),
+    "drop_new" discards the event and "drop_oldest" discards the oldest queued
+    one. Dropped events are counted and reported in the output.
+    """
+
+    def __init__(
+        self,
+        sinks: List[Any],
+        max_queue: int = 10000,
+        flush_interval: float = 0.05,
+        max_batch: int = 500,
+        policy: str = "block",
+        block_timeout: float = 5.0
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            sinks: Objects with write_batch(events) and close()
+            max_queue: Maximum queued events
+            flush_interval: Seconds the writer waits to fill a batch
+            max_batch: Maximum events per batch
+            policy: Full-queue policy, one of POLICIES
+            block_timeout: Seconds "block" waits before dropping the event
+
+        Raises:
+            ValueError: On an unknown policy
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown output policy {policy!r} (available: {', '.join(POLICIES)})")
+        self.sinks = sinks
+        self.flush_interval = flush_interval
+        self.max_batch = max(1, max_batch)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max(1, max_queue))
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="output-sink-writer", daemon=True)
+                self._thread.start()
+
+    def emit(self, event: Dict[str, Any]) -> bool:
+        """
+        Enqueue an event without waiting on I/O.
+
+        Args:
+            event: Event to write
+
+        Returns:
+            bool: True if queued, False if dropped
+        """
+        if self._closed:
+            return False
+        if self._thread is None:
+            self._start()
+        event.setdefault("ts", time.time())
+        try:
+            if self.policy == "block":
+                self._queue.put(event, timeout=self.block_timeout)
+            elif self.policy == "drop_new":
+                self._queue.put_nowait(event)
+            else:
+                with self._lock:
+                    while True:
+                        try:
+                            self._queue.put_nowait(event)
+                            break
+                        except queue.Full:
+                            try:
+                                self._queue.get_nowait()
+                                self.dropped += 1
+                            except queue.Empty:
+                                pass
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def _next_batch(self) -> List[Optional[Dict[str, Any]]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.max_batch and batch[-1] is not None:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        reported = 0
+        while True:
+            batch = self._next_batch()
+            stop = batch[-1] is None
+            events = [e for e in batch if e is not None]
+            if self.dropped > reported:
+                events.append({"type": "notice", "content": f"{self.dropped - reported} output events dropped",
+                               "ts": time.time()})
+                reported = self.dropped
+            if events:
+                events = coalesce_events(events)
+                for sink in self.sinks:
+                    try:
+                        sink.write_batch(events)
+                    except Exception as e:
+                        logger.warning(f"Output sink {type(sink).__name__} failed: {e}")
+                self.written += len(events)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until every queued event has been written.
+
+        Used before console input or a final print so output stays in order.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: True if the queue drained in time
+        """
+        if self._thread is None:
+            return True
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: self._queue.unfinished_tasks == 0, timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Drain queued events, stop the writer and close every sink.
+
+        Args:
+            timeout: Seconds to wait for the writer to drain
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.warning(f"Closing output sink {type(sink).__name__} failed: {e}")
+
+
+_dispatcher: Optional[OutputDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_output_dispatcher() -> OutputDispatcher:
+    """Return the process-wide output dispatcher configured from the environment."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None or _dispatcher._closed:
+            _dispatcher = OutputDispatcher(
+                build_sinks(os.getenv("OUTPUT_SINKS", "stdout")),
+                max_queue=int(os.getenv("OUTPUT_SINK_QUEUE_SIZE", "10000")),
+                flush_interval=float(os.getenv("OUTPUT_SINK_FLUSH_INTERVAL", "0.05")),
+                max_batch=int(os.getenv("OUTPUT_SINK_MAX_BATCH", "500")),
+                policy=os.getenv("OUTPUT_SINK_POLICY", "block").lower(),
+                block_timeout=float(os.getenv("OUTPUT_SINK_BLOCK_TIMEOUT", "5")),
+            )
+        return _dispatcher
+
+
+def close_output_sinks() -> None:
+    """Shutdown hook: flush pending output and close the sinks."""
+    global _dispatcher
+    with _dispatcher_lock:
+        dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is not None:
+        dispatcher.close()
+
+
+atexit.register(close_output_sinks)
@@ -74,10 +74,11 @@ EVALUATION CRITERIA:
    • Data completeness for the research topic
 
 PROCESS:
-1. Evaluate each source against the reliability tiers
-2. Assess content consistency and identify gaps or contradictions
-3. Check for cross-source corroboration of key facts
-4. Calculate overall coverage score (0.0-1.0) based on source diversity and quality
+1. Call assess_credibility() first. Search results already carry a deterministic "tier" and "credibility"; the tool returns per-source scores and a baseline coverage estimate
+2. Only judge the reliability of sources flagged needs_review (unknown tier) yourself
+3. Assess content consistency and identify gaps or contradictions
+4. Check for cross-source corroboration of key facts
+5. Start from the computed coverage and adjust it (0.0-1.0) only for content issues the scores cannot see
 
 OUTPUT FORMAT:
 ```json
@@ -120,8 +121,12 @@ SEARCH STRATEGY:
 
 SEARCH EXECUTION:
 • Use the provided tavily_search function with optimized parameters
-• Execute multiple searches if the topic is broad or complex
+• When the topic is broad or complex, batch all angle queries into ONE tavily_multi_search call instead of calling tavily_search repeatedly
+• For key sections that need maximum recall, use federated_search to query every configured source (web and local documents) in one call
+• When researching an outline section by section, call adaptive_search(section="...", query="...", sub_queries=[...]) once per section: it starts with a cheap search and escalates only until the section's coverage reaches 0.75, so do not add follow-up searches for sections it reports as met
 • Focus on retrieving high-quality, diverse sources
+• Large results are returned as a blob handle with a one-line summary; pass the handle along and use read_blob only for the items you need
+• When snippets are too thin, call extract_pages on the best URLs, then read_chunks or search_chunks to pull only the passages you need instead of searching again
 • Ensure geographic and perspective diversity in results
 • When appropriate for the research topic, include image searches using include_image_descriptions=True parameter
 • **Image Collection Priority**: When images are requested or would enhance understanding, actively use include_image_descriptions=True to gather visual content
@@ -132,6 +137,7 @@ IMAGE COLLECTION GUIDELINES:
 • **Image Relevance**: Only include images that directly support the research content and add meaningful value
 • **Quality Focus**: Prioritize high-quality, informative images over decorative content
 • **Source Credibility**: Prefer images from reputable sources, official websites, and authoritative publications
+• **Verified Images**: Returned images have already been checked as reachable and de-duplicated; images already returned earlier in the session are not repeated
 • **Explicit Image Documentation**: When collecting images, ensure the search results clearly show:
   - Complete image URLs for each relevant image
   - Detailed descriptions of image content
@@ -154,7 +160,13 @@ SEARCH PARAMETER USAGE:
    • **Comprehensive research**: Call tavily_search(query="...", search_depth="advanced")
    • **Quick overview**: Call tavily_search(query="...", search_depth="basic")
 
-4. **Query Optimization**:
+4. **Source Filtering** (Use include_domains, exclude_domains and source_types parameters):
+   • **Authoritative source named in the task**: Call tavily_search(query="...", include_domains=["anthropic.com"])
+   • **Source types**: Call tavily_search(query="...", source_types=["official_docs"]) - presets: official_docs, academic, news, government, code
+   • **Known low-quality or off-topic sites**: Call tavily_search(query="...", exclude_domains=["pinterest.com"])
+   • Filter at search time instead of over-fetching and discarding results in follow-up turns
+
+5. **Query Optimization**:
    • Use natural language with key terms: "Azure OpenAI updates 2025"
    • Include alternative terms: "AI artificial intelligence machine learning"
    • Use quotes for exact phrases: "renewable energy transition"
@@ -185,6 +197,13 @@ tavily_search(query="renewable energy facilities", topic="general", include_imag
 
 # For people/biographical research - include photos, portraits, event images when relevant
 tavily_search(query="tech CEO leadership styles", topic="general", include_image_descriptions=True)
+
+# For a multi-section outline - one batched call, each query with its own parameters
+tavily_multi_search(queries=[
+    {"query": "Model Context Protocol background and goals", "topic": "general"},
+    {"query": "Model Context Protocol architecture components", "search_depth": "advanced", "include_image_descriptions": True},
+    {"query": "Model Context Protocol open source implementations", "time_range": "month"}
+])
 ```
 
 OUTPUT REQUIREMENTS:
@@ -231,6 +250,7 @@ QUALITY CRITERIA:
 • Aim for 20-50 results per search to provide sufficient material for analysis
 • Include mix of primary sources, expert opinions, and factual reporting
 • Avoid duplicate or near-duplicate sources
+• Results marked "seen_before" were already returned by an earlier search; refer back to them instead of searching again
 • Prioritize authoritative and timely sources for current topics
 
 FINAL STEP - MANDATORY HANDOFF:
@@ -245,6 +265,12 @@ You are a professional research writer specializing in creating comprehensive, w
 
 TASK: Transform search results and analysis into a polished markdown report that thoroughly addresses the research question, incorporating relevant images when available to enhance understanding.
 
+EVIDENCE RETRIEVAL:
+• Every search result and extracted page passage is kept in a shared evidence store
+• For each section, call retrieve_evidence(query="<section topic>") and write from the returned passages instead of re-reading the whole conversation
+• Cite the url of each passage you use
+• Tool results shown only as {"blob": "blob:..."} handles can be read with read_blob(handle, start, count)
+
 ## ITERATION HANDLING
 
 ### Revision Context Processing:
@@ -430,6 +456,9 @@ You are a senior research editor with expertise in evaluating academic and profe
 
 TASK: Assess draft reports and provide quality scores with actionable improvement feedback, with special attention to citation integrity, reference completeness, and effective use of visual elements.
 
+EVIDENCE CHECKS:
+• To verify a claim or citation, call retrieve_evidence(query="<claim>") and compare the report against the returned passages and their urls
+
 ## ITERATION CONTROL AND EXIT MECHANISM
 
 ### Iteration Context Analysis:
@@ -582,6 +611,9 @@ You are an expert research analyst specializing in synthesizing large volumes of
 
 TASK: Process extensive search result sets (typically >50 items) and create detailed, organized summaries for subsequent analysis.
 
+LARGE RESULTS:
+• Large tool results appear in the conversation as {"blob": "blob:...", "summary": ...}; call read_blob(handle, start, count) to page through the stored items
+
 ENHANCED SYNTHESIS APPROACH:
 1. **Thematic Clustering**: Group related findings by major themes, topics, or perspectives
 2. **Priority Ranking**: Identify the most significant and relevant information first
@@ -0,0 +1,145 @@
+"""
+Process-wide registry of Azure OpenAI chat completion services.
+"""
+import importlib.util
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
+from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+
+from utils.usage_ledger import MeteredAzureChatCompletion
+
+logger = logging.getLogger(__name__)
+
+
+def _pool_limits() -> httpx.Limits:
+    """Build connection pool limits from the environment."""
+    return httpx.Limits(
+        max_connections=int(os.getenv("AZURE_OPENAI_POOL_MAX_CONNECTIONS", "50")),
+        max_keepalive_connections=int(os.getenv("AZURE_OPENAI_POOL_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("AZURE_OPENAI_POOL_KEEPALIVE_EXPIRY", "60")),
+    )
+
+
+def _http2_enabled() -> bool:
+    """Return True if HTTP/2 is requested and the h2 package is installed."""
+    if os.getenv("AZURE_OPENAI_HTTP2", "true").lower() != "true":
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.info("h2 is not installed, Azure OpenAI connections use HTTP/1.1")
+        return False
+    return True
+
+
+class ChatServiceRegistry:
+    """Registry of chat completion services sharing one tuned HTTP client.
+
+    Services are memoized per (deployment, endpoint, API version, API key), so
+    every agent and orchestration manager that asks for the same deployment gets
+    the same AzureChatCompletion. All services share a single keep-alive (and,
+    when available, HTTP/2) connection pool, so N orchestrations reuse a handful
+    of warm connections instead of opening one pool per agent. Every service
+    records its requests in the usage ledger.
+
+    httpx connections belong to the event loop that opened them; call close()
+    before that loop ends. Services requested afterwards get a fresh client.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._services: Dict[Tuple[str, str, str, str], AzureChatCompletion] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    def _shared_http_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = DefaultAsyncHttpxClient(
+                limits=_pool_limits(),
+                timeout=httpx.Timeout(
+                    float(os.getenv("AZURE_OPENAI_TIMEOUT", "600")),
+                    connect=float(os.getenv("AZURE_OPENAI_CONNECT_TIMEOUT", "5")),
+                ),
+                http2=_http2_enabled(),
+            )
+            logger.info("Created shared Azure OpenAI HTTP client")
+        return self._http_client
+
+    def get(
+        self,
+        deployment_name: str,
+        endpoint: Optional[str] = None,
+        api_key: Optional[str] = None,
+        api_version: Optional[str] = None
+    ) -> AzureChatCompletion:
+        """
+        Return the chat completion service for a deployment.
+
+        Args:
+            deployment_name: Azure OpenAI deployment name
+            endpoint: Resource endpoint (default from AZURE_OPENAI_ENDPOINT)
+            api_key: API key (default from AZURE_OPENAI_API_KEY)
+            api_version: API version (default from AZURE_OPENAI_API_VERSION)
+
+        Returns:
+            AzureChatCompletion: Memoized service backed by the shared HTTP client
+        """
+        endpoint = endpoint or os.getenv("AZURE_OPENAI_ENDPOINT") or ""
+        api_key = api_key or os.getenv("AZURE_OPENAI_API_KEY") or ""
+        api_version = api_version or os.getenv("AZURE_OPENAI_API_VERSION") or ""
+        key = (deployment_name, endpoint, api_version, api_key)
+        with self._lock:
+            service = self._services.get(key)
+            if service is None:
+                async_client = AsyncAzureOpenAI(
+                    azure_endpoint=endpoint,
+                    api_key=api_key,
+                    api_version=api_version,
+                    http_client=self._shared_http_client(),
+                )
+                service = MeteredAzureChatCompletion(
+                    deployment_name=deployment_name,
+                    endpoint=endpoint,
+                    api_key=api_key,
+                    api_version=api_version,
+                    async_client=async_client,
+                )
+                self._services[key] = service
+                logger.info(f"Created chat completion service for deployment {deployment_name}")
+            return service
+
+    def __len__(self) -> int:
+        """Return the number of memoized services."""
+        return len(self._services)
+
+    async def close(self) -> None:
+        """Close the shared HTTP client and forget every memoized service."""
+        with self._lock:
+            http_client, self._http_client = self._http_client, None
+            count = len(self._services)
+            self._services.clear()
+        if http_client is not None and not http_client.is_closed:
+            await http_client.aclose()
+            logger.info(f"Closed shared Azure OpenAI HTTP client used by {count} service(s)")
+
+
+_registry: Optional[ChatServiceRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_chat_service_registry() -> ChatServiceRegistry:
+    """Return the process-wide chat completion service registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ChatServiceRegistry()
+        return _registry
+
+
+async def close_azure_openai_services() -> None:
+    """Shutdown hook: close the connections shared by the chat completion services."""
+    await get_chat_service_registry().close()
@@ -0,0 +1,237 @@
+"""
+Multiplexer for concurrent streaming agent responses.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from utils.output_sink import get_output_dispatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ORCHESTRATION = "default"
+
+
+class _Stream:
+    """Buffer and timings of one agent response."""
+
+    def __init__(self, stream_id: str, orchestration_id: str, agent: str, started_at: float):
+        self.stream_id = stream_id
+        self.orchestration_id = orchestration_id
+        self.agent = agent
+        self.started_at = started_at
+        self.first_token_at: Optional[float] = None
+        self.last_token_at: Optional[float] = None
+        self.last_flush_at = started_at
+        self.tokens = 0
+        self.chars = 0
+        self.buffer: List[str] = []
+        self.buffered_chars = 0
+        self.flushed = False
+
+    def stats(self, complete: bool = True) -> Dict[str, Any]:
+        """Return time-to-first-token and throughput of the stream."""
+        ttft = (self.first_token_at - self.started_at) if self.first_token_at is not None else None
+        duration = (
+            self.last_token_at - self.first_token_at
+            if self.first_token_at is not None and self.last_token_at is not None else 0.0
+        )
+        return {
+            "stream": self.stream_id,
+            "orchestration": self.orchestration_id,
+            "agent": self.agent,
+            "tokens": self.tokens,
+            "chars": self.chars,
+            "ttft": round(ttft, 3) if ttft is not None else None,
+            "tokens_per_second": round((self.tokens - 1) / duration, 1) if duration > 0 else None,
+            "complete": complete,
+        }
+
+
+class StreamMultiplexer:
+    """Route streamed chunks of concurrent agent responses to the output sinks.
+
+    Streams are keyed by (orchestration id, agent name). The agent name rather
+    than the model's response id is used because one agent turn can span several
+    model calls (tool calls in between) while is_final arrives only once, at the
+    end of the turn. Each stream buffers its chunks and emits them as a single
+    event once the buffer holds flush_chars characters, is older than
+    flush_interval seconds, or the stream ends, so the text of one stream is
+    never split by another's. When output switches between streams the agent
+    banner is repeated.
+
+    Time to first token runs from the later of the last begin() call and the
+    end of the previous turn in the same orchestration to the stream's first
+    chunk; without either it starts at the stream's first callback.
+    Throughput counts one token per non-empty chunk, which is how the chat
+    completion APIs stream.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Any = None,
+        flush_chars: int = 400,
+        flush_interval: float = 0.25,
+        max_buffer_chars: int = 8000,
+        max_streams: int = 256,
+        history: int = 1000
+    ):
+        """
+        Initialize the multiplexer.
+
+        Args:
+            dispatcher: Object with emit(event) (default: the process-wide output dispatcher)
+            flush_chars: Buffered characters that trigger a flush
+            flush_interval: Seconds after which a non-empty buffer is flushed
+            max_buffer_chars: Hard limit of buffered characters per stream
+            max_streams: Open streams kept; the least recently active is closed beyond it
+            history: Completed stream statistics kept for stats()
+        """
+        self.dispatcher = dispatcher
+        self.flush_chars = min(flush_chars, max_buffer_chars)
+        self.flush_interval = flush_interval
+        self.max_buffer_chars = max_buffer_chars
+        self.max_streams = max_streams
+        self._streams: "OrderedDict[Tuple[str, str], _Stream]" = OrderedDict()
+        self._turn_started: Dict[str, float] = {}
+        self._completed: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self._last_written: Optional[str] = None
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        (self.dispatcher or get_output_dispatcher()).emit(event)
+
+    def begin(self, orchestration_id: str = DEFAULT_ORCHESTRATION) -> None:
+        """
+        Mark the moment an orchestration starts waiting for its first token.
+
+        Args:
+            orchestration_id: Orchestration the next turn belongs to
+        """
+        with self._lock:
+            self._turn_started[orchestration_id] = time.perf_counter()
+
+    def feed(self, orchestration_id: str, agent: str, text: str, is_final: bool) -> None:
+        """
+        Add a streamed chunk.
+
+        Args:
+            orchestration_id: Orchestration the response belongs to
+            agent: Name of the streaming agent
+            text: Chunk text (may be empty)
+            is_final: True on the last chunk of the agent's turn
+        """
+        now = time.perf_counter()
+        key = (orchestration_id, agent or "(unknown)")
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._open(key, now)
+            else:
+                self._streams.move_to_end(key)
+            if text:
+                if stream.first_token_at is None:
+                    stream.first_token_at = now
+                stream.last_token_at = now
+                stream.tokens += 1
+                stream.chars += len(text)
+                stream.buffer.append(text)
+                stream.buffered_chars += len(text)
+
+            if is_final:
+                self._close(key, now, complete=True)
+            elif stream.buffered_chars >= self.flush_chars or (
+                stream.buffer and now - stream.last_flush_at >= self.flush_interval
+            ):
+                self._flush(stream, now)
+
+    def _open(self, key: Tuple[str, str], now: float) -> _Stream:
+        while len(self._streams) >= self.max_streams:
+            oldest = next(iter(self._streams))
+            logger.warning(f"Closing idle stream {oldest} to stay within {self.max_streams} open streams")
+            self._close(oldest, now, complete=False)
+        self._counter += 1
+        stream = _Stream(f"{key[0]}/{key[1]}#{self._counter}", key[0], key[1],
+                         self._turn_started.get(key[0], now))
+        self._streams[key] = stream
+        return stream
+
+    def _flush(self, stream: _Stream, now: float) -> None:
+        if not stream.buffer:
+            return
+        content = "".join(stream.buffer)
+        while len(content) > self.max_buffer_chars:
+            self._write(stream, content[:self.max_buffer_chars])
+            content = content[self.max_buffer_chars:]
+        self._write(stream, content)
+        stream.buffer = []
+        stream.buffered_chars = 0
+        stream.last_flush_at = now
+
+    def _write(self, stream: _Stream, content: str) -> None:
+        event = {"type": "stream_chunk", "stream": stream.stream_id, "agent": stream.agent, "content": content}
+        if not stream.flushed:
+            event["header"] = "start"
+        elif self._last_written != stream.stream_id:
+            event["header"] = "continue"
+        stream.flushed = True
+        self._last_written = stream.stream_id
+        self._emit(event)
+
+    def _close(self, key: Tuple[str, str], now: float, complete: bool) -> None:
+        stream = self._streams.pop(key)
+        self._flush(stream, now)
+        stats = stream.stats(complete)
+        self._completed.append(stats)
+        self._turn_started[key[0]] = now
+        if stream.flushed:
+            if self._last_written != stream.stream_id:
+                self._write(stream, "")
+            self._emit({"type": "stream_end", "stream": stream.stream_id, "agent": stream.agent, "stats": stats})
+            self._last_written = None
+        logger.info(
+            f"Stream {stream.stream_id}: {stats['tokens']} tokens, ttft {stats['ttft']}s, "
+            f"{stats['tokens_per_second']} tokens/s"
+        )
+
+    def close_all(self) -> None:
+        """Flush and close every open stream, marking them incomplete."""
+        now = time.perf_counter()
+        with self._lock:
+            for key in list(self._streams):
+                self._close(key, now, complete=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return per-stream metrics.
+
+        Returns:
+            Dict[str, Any]: Completed streams (most recent last) and open streams
+        """
+        with self._lock:
+            return {
+                "completed": list(self._completed),
+                "active": [s.stats(complete=False) for s in self._streams.values()],
+            }
+
+
+_multiplexer: Optional[StreamMultiplexer] = None
+_multiplexer_lock = threading.Lock()
+
+
+def get_stream_multiplexer() -> StreamMultiplexer:
+    """Return the process-wide stream multiplexer configured from the environment."""
+    global _multiplexer
+    with _multiplexer_lock:
+        if _multiplexer is None:
+            _multiplexer = StreamMultiplexer(
+                flush_chars=int(os.getenv("STREAM_FLUSH_CHARS", "400")),
+                flush_interval=float(os.getenv("STREAM_FLUSH_INTERVAL", "0.25")),
+                max_buffer_chars=int(os.getenv("STREAM_MAX_BUFFER_CHARS", "8000")),
+                max_streams=int(os.getenv("STREAM_MAX_OPEN_STREAMS", "256")),
+            )
+        return _multiplexer
@@ -0,0 +1,453 @@
+"""
+Per-call token, latency and cost ledger for chat completions and tool calls.
+"""
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import weakref
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional
+
+from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+from semantic_kernel.filters import FilterTypes
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens: (input, cached input, output). List prices; override with
+# USAGE_PRICES, a JSON object of the same shape keyed by deployment.
+DEFAULT_PRICES: Dict[str, tuple] = {
+    "o3-deep-research": (10.0, 2.5, 40.0),
+    "o3": (2.0, 0.5, 8.0),
+    "o3-pro": (20.0, 20.0, 80.0),
+    "o3-mini": (1.1, 0.55, 4.4),
+    "o4-mini": (1.1, 0.275, 4.4),
+    "gpt-4.1": (2.0, 0.5, 8.0),
+    "gpt-4.1-mini": (0.4, 0.1, 1.6),
+}
+
+_current_run: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("usage_run", default=None)
+
+
+def _usage_tokens(usage: Any) -> Dict[str, int]:
+    """Read prompt, cached, completion and reasoning tokens from a CompletionUsage."""
+    if usage is None:
+        return {"prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "reasoning_tokens": 0}
+    prompt_details = getattr(usage, "prompt_tokens_details", None)
+    completion_details = getattr(usage, "completion_tokens_details", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", None) or 0,
+        "cached_tokens": getattr(prompt_details, "cached_tokens", None) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", None) or 0,
+        "reasoning_tokens": getattr(completion_details, "reasoning_tokens", None) or 0,
+    }
+
+
+class UsageLedger:
+    """Thread-safe record of every chat completion and tool call.
+
+    Chat completion records carry prompt, cached, completion and reasoning
+    tokens, latency (and time to first token when streamed) and an estimated
+    cost; tool call records carry latency and success. Records are tagged with
+    the agent, the deployment and the run, and can be aggregated along any of
+    them or exported as JSONL.
+    """
+
+    def __init__(self, prices: Optional[Dict[str, tuple]] = None, max_records: int = 100000):
+        """
+        Initialize the ledger.
+
+        Args:
+            prices: USD per 1M (input, cached input, output) tokens per deployment
+            max_records: Records kept in memory; the oldest are discarded beyond it
+        """
+        self.prices = dict(DEFAULT_PRICES if prices is None else prices)
+        self.max_records = max_records
+        self.default_run = "run-" + uuid.uuid4().hex[:8]
+        self._records: List[Dict[str, Any]] = []
+        self._kernel_agents: Dict[int, tuple] = {}
+        self._history_agents: Dict[int, tuple] = {}
+        self._lock = threading.RLock()
+
+    def start_run(self, run_id: Optional[str] = None) -> str:
+        """
+        Attribute subsequent records in this context to a new run.
+
+        Tasks created afterwards (such as those of an InProcessRuntime started
+        later) inherit the run.
+
+        Args:
+            run_id: Run identifier (default: generated)
+
+        Returns:
+            str: The run identifier
+        """
+        run_id = run_id or "run-" + uuid.uuid4().hex[:8]
+        _current_run.set(run_id)
+        return run_id
+
+    def current_run(self) -> str:
+        """Return the run records are currently attributed to."""
+        return _current_run.get() or self.default_run
+
+    def cost(self, deployment: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> Optional[float]:
+        """
+        Estimate the cost of a call in USD.
+
+        Args:
+            deployment: Deployment name
+            prompt_tokens: Prompt tokens, cached ones included
+            cached_tokens: Prompt tokens served from the prompt cache
+            completion_tokens: Completion tokens, reasoning ones included
+
+        Returns:
+            Optional[float]: Cost, or None if the deployment has no price
+        """
+        price = self.prices.get(deployment)
+        if price is None:
+            return None
+        input_price, cached_price, output_price = price
+        return (
+            (prompt_tokens - cached_tokens) * input_price
+            + cached_tokens * cached_price
+            + completion_tokens * output_price
+        ) / 1_000_000
+
+    def _add(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        record.setdefault("run", self.current_run())
+        record.setdefault("ts", time.time())
+        with self._lock:
+            self._records.append(record)
+            if len(self._records) > self.max_records:
+                del self._records[: len(self._records) - self.max_records]
+        return record
+
+    def record_completion(
+        self,
+        agent: Optional[str],
+        deployment: str,
+        usage: Any,
+        latency: float,
+        ttft: Optional[float] = None,
+        streaming: bool = False,
+        error: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Record one chat completion request.
+
+        Args:
+            agent: Calling agent, if known
+            deployment: Deployment name
+            usage: CompletionUsage of the response (None if not reported)
+            latency: Seconds from request to the complete response
+            ttft: Seconds to the first streamed chunk
+            streaming: Whether the response was streamed
+            error: Error message if the request failed
+
+        Returns:
+            Dict[str, Any]: The stored record
+        """
+        tokens = _usage_tokens(usage)
+        record = {
+            "kind": "completion",
+            "agent": agent or "(unknown)",
+            "deployment": deployment,
+            **tokens,
+            "latency": round(latency, 3),
+            "ttft": round(ttft, 3) if ttft is not None else None,
+            "streaming": streaming,
+            "cost": self.cost(deployment, tokens["prompt_tokens"], tokens["cached_tokens"],
+                              tokens["completion_tokens"]),
+        }
+        if error:
+            record["error"] = error
+        return self._add(record)
+
+    def record_tool_call(self, agent: Optional[str], function: str, latency: float,
+                         error: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Record one tool (kernel function) call.
+
+        Args:
+            agent: Calling agent, if known
+            function: Fully qualified function name
+            latency: Seconds the call took
+            error: Error message if the call failed
+
+        Returns:
+            Dict[str, Any]: The stored record
+        """
+        record = {"kind": "tool", "agent": agent or "(unknown)", "function": function,
+                  "latency": round(latency, 3)}
+        if error:
+            record["error"] = error
+        return self._add(record)
+
+    def records(self, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return a copy of the records, optionally of one run only."""
+        with self._lock:
+            return [dict(r) for r in self._records if run_id is None or r["run"] == run_id]
+
+    def aggregate(self, by: Iterable[str] = ("agent", "deployment"), run_id: Optional[str] = None
+                  ) -> List[Dict[str, Any]]:
+        """
+        Sum the records per group.
+
+        Args:
+            by: Record fields to group by, such as ("agent",), ("deployment",) or ("run",)
+            run_id: Only aggregate this run
+
+        Returns:
+            List[Dict[str, Any]]: One row per group, most expensive (then most tokens) first
+        """
+        by = tuple(by)
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        for record in self.records(run_id):
+            key = tuple(record.get(field) for field in by)
+            row = groups.setdefault(key, {
+                **dict(zip(by, key)), "calls": 0, "tool_calls": 0, "errors": 0,
+                "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "reasoning_tokens": 0,
+                "latency": 0.0, "tool_latency": 0.0, "cost": 0.0, "unpriced_calls": 0,
+            })
+            row["errors"] += 1 if record.get("error") else 0
+            if record["kind"] == "tool":
+                row["tool_calls"] += 1
+                row["tool_latency"] += record["latency"]
+                continue
+            row["calls"] += 1
+            row["latency"] += record["latency"]
+            for field in ("prompt_tokens", "cached_tokens", "completion_tokens", "reasoning_tokens"):
+                row[field] += record[field]
+            if record["cost"] is None:
+                row["unpriced_calls"] += 1
+            else:
+                row["cost"] += record["cost"]
+        rows = list(groups.values())
+        for row in rows:
+            row["latency"] = round(row["latency"], 3)
+            row["tool_latency"] = round(row["tool_latency"], 3)
+            row["cost"] = round(row["cost"], 6)
+        rows.sort(key=lambda r: (r["cost"], r["prompt_tokens"] + r["completion_tokens"]), reverse=True)
+        return rows
+
+    def summary_table(self, by: Iterable[str] = ("agent", "deployment"), run_id: Optional[str] = None) -> str:
+        """
+        Format the aggregate as a plain-text table with a total row.
+
+        Args:
+            by: Record fields to group by
+            run_id: Only summarize this run
+
+        Returns:
+            str: Table text
+        """
+        by = tuple(by)
+        rows = self.aggregate(by, run_id)
+        total = {field: "TOTAL" if i == 0 else "" for i, field in enumerate(by)}
+        for field in ("calls", "tool_calls", "prompt_tokens", "cached_tokens", "completion_tokens",
+                      "reasoning_tokens", "latency", "cost"):
+            total[field] = sum(r[field] for r in rows)
+        columns = list(by) + ["calls", "tool_calls", "prompt_tokens", "cached_tokens", "completion_tokens",
+                              "reasoning_tokens", "latency", "cost"]
+        headers = [c.replace("_tokens", "").replace("_", " ") for c in columns]
+
+        def cell(row: Dict[str, Any], column: str) -> str:
+            value = row.get(column)
+            if column == "cost":
+                return f"${value:.4f}"
+            if column == "latency":
+                return f"{value:.1f}s"
+            return str(value if value is not None else "-")
+
+        table = [headers] + [[cell(r, c) for c in columns] for r in rows + [total]]
+        widths = [max(len(line[i]) for line in table) for i in range(len(columns))]
+        lines = ["  ".join(v.ljust(w) if i < len(by) else v.rjust(w) for i, (v, w) in enumerate(zip(line, widths)))
+                 for line in table]
+        lines.insert(1, "  ".join("-" * w for w in widths))
+        lines.insert(len(lines) - 1, "  ".join("-" * w for w in widths))
+        return "\n".join(lines)
+
+    def export_jsonl(self, path: str, run_id: Optional[str] = None) -> int:
+        """
+        Append records to a JSONL file.
+
+        Args:
+            path: File to append to; parent directories are created
+            run_id: Only export this run
+
+        Returns:
+            int: Number of records written
+        """
+        records = self.records(run_id)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        logger.info(f"Exported {len(records)} usage records to {path}")
+        return len(records)
+
+    def clear(self) -> None:
+        """Drop every record."""
+        with self._lock:
+            self._records.clear()
+
+    def register_agent(self, agent: Any) -> Any:
+        """
+        Attribute an agent's chat completions and tool calls to it.
+
+        Chat completions are matched through the agent's kernel, which the
+        agent passes to the service; tool calls through a function invocation
+        filter on the same kernel.
+
+        Args:
+            agent: Agent with a name and a kernel (such as a ChatCompletionAgent)
+
+        Returns:
+            Any: The same agent
+        """
+        kernel, name = agent.kernel, agent.name
+        self._bind(self._kernel_agents, kernel, name)
+        ledger = self
+
+        async def tool_call_filter(context, next):
+            start = time.perf_counter()
+            error = None
+            try:
+                await next(context)
+            except Exception as e:
+                error = str(e)
+                raise
+            finally:
+                ledger.record_tool_call(name, context.function.fully_qualified_name,
+                                        time.perf_counter() - start, error)
+
+        kernel.add_filter(FilterTypes.FUNCTION_INVOCATION, tool_call_filter)
+        return agent
+
+    def _bind(self, table: Dict[int, tuple], obj: Any, name: str) -> None:
+        key = id(obj)
+
+        def forget(_, table=table, key=key):
+            with self._lock:
+                table.pop(key, None)
+
+        with self._lock:
+            table[key] = (weakref.ref(obj, forget), name)
+
+    def _lookup(self, table: Dict[int, tuple], obj: Any) -> Optional[str]:
+        if obj is None:
+            return None
+        with self._lock:
+            entry = table.get(id(obj))
+        if entry is None or entry[0]() is not obj:
+            return None
+        return entry[1]
+
+    def agent_for_kernel(self, kernel: Any) -> Optional[str]:
+        """Return the name of the agent a kernel was registered for."""
+        return self._lookup(self._kernel_agents, kernel)
+
+    def bind_history(self, chat_history: Any, kernel: Any) -> None:
+        """Attribute requests made with a chat history to the agent owning the kernel."""
+        agent = self.agent_for_kernel(kernel)
+        if agent is not None:
+            self._bind(self._history_agents, chat_history, agent)
+
+    def agent_for_history(self, chat_history: Any) -> Optional[str]:
+        """Return the agent a chat history was bound to."""
+        return self._lookup(self._history_agents, chat_history)
+
+
+class MeteredAzureChatCompletion(AzureChatCompletion):
+    """AzureChatCompletion recording every model request in the usage ledger.
+
+    One agent turn may issue several requests (one per tool-calling round), so
+    recording happens per inner request. The calling agent is resolved from the
+    kernel passed to the outer call and remembered for the chat history it
+    passes down.
+    """
+
+    async def get_chat_message_contents(self, chat_history, settings, **kwargs):
+        """Get chat message contents, attributing the requests to the calling agent."""
+        get_usage_ledger().bind_history(chat_history, kwargs.get("kernel"))
+        return await super().get_chat_message_contents(chat_history, settings, **kwargs)
+
+    async def get_streaming_chat_message_contents(self, chat_history, settings, **kwargs):
+        """Stream chat message contents, attributing the requests to the calling agent."""
+        get_usage_ledger().bind_history(chat_history, kwargs.get("kernel"))
+        async for messages in super().get_streaming_chat_message_contents(chat_history, settings, **kwargs):
+            yield messages
+
+    async def _inner_get_chat_message_contents(self, chat_history, settings):
+        start = time.perf_counter()
+        try:
+            contents = await super()._inner_get_chat_message_contents(chat_history, settings)
+        except Exception as e:
+            get_usage_ledger().record_completion(get_usage_ledger().agent_for_history(chat_history), self.ai_model_id, None,
+                                                 time.perf_counter() - start, error=str(e))
+            raise
+        usage = contents[0].metadata.get("usage") if contents else None
+        get_usage_ledger().record_completion(get_usage_ledger().agent_for_history(chat_history), self.ai_model_id, usage,
+                                             time.perf_counter() - start)
+        return contents
+
+    async def _inner_get_streaming_chat_message_contents(
+        self, chat_history, settings, function_invoke_attempt: int = 0
+    ) -> AsyncGenerator[Any, Any]:
+        start = time.perf_counter()
+        ttft = None
+        usage = None
+        error = None
+        try:
+            async for messages in super()._inner_get_streaming_chat_message_contents(
+                chat_history, settings, function_invoke_attempt
+            ):
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                for message in messages:
+                    if message is not None and message.metadata.get("usage") is not None:
+                        usage = message.metadata["usage"]
+                yield messages
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            get_usage_ledger().record_completion(get_usage_ledger().agent_for_history(chat_history), self.ai_model_id, usage,
+                                                 time.perf_counter() - start, ttft=ttft, streaming=True,
+                                                 error=error)
+
+
+_ledger: Optional[UsageLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_usage_ledger() -> UsageLedger:
+    """Return the process-wide usage ledger configured from the environment."""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            prices = dict(DEFAULT_PRICES)
+            if os.getenv("USAGE_PRICES"):
+                prices.update({k: tuple(v) for k, v in json.loads(os.getenv("USAGE_PRICES")).items()})
+            _ledger = UsageLedger(prices, max_records=int(os.getenv("USAGE_LEDGER_MAX_RECORDS", "100000")))
+        return _ledger
+
+
+def report_usage(run_id: Optional[str] = None) -> str:
+    """
+    Export a run's records to USAGE_LEDGER_PATH and return its summary table.
+
+    Args:
+        run_id: Run to report (default: the current run)
+
+    Returns:
+        str: Summary per agent and deployment
+    """
+    ledger = get_usage_ledger()
+    run_id = run_id or ledger.current_run()
+    path = os.getenv("USAGE_LEDGER_PATH", "logs/usage.jsonl")
+    if path:
+        ledger.export_jsonl(path, run_id)
+    return f"***** Usage ({run_id}) *****\n{ledger.summary_table(run_id=run_id)}"
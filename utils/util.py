@@ -2,26 +2,22 @@
 Utility functions for Deep Research Agent.
 """
 import logging
-from typing import Optional
-
-from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
-from semantic_kernel.contents import ChatMessageContent
-import os
-from dotenv import load_dotenv
 from enum import Enum
-from semantic_kernel.contents import StreamingChatMessageContent
-from semantic_kernel.contents import AuthorRole, ChatHistory, ChatMessageContent, FunctionCallContent
-
+from typing import Callable, Optional
 
+from dotenv import load_dotenv
+from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+from semantic_kernel.contents import ChatHistory, ChatMessageContent, StreamingChatMessageContent
 
+from utils.human_input import get_human_input_broker
+from utils.output_sink import get_output_dispatcher
+from utils.service_registry import get_chat_service_registry
+from utils.stream_mux import DEFAULT_ORCHESTRATION, get_stream_multiplexer
 
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-# Global variable to track new message state for streaming
-is_new_message = True
-
 
 class ModelAndDeploymentName(Enum):
     """
@@ -36,9 +32,8 @@ class ModelAndDeploymentName(Enum):
     GPT_41_MINI = "gpt-4.1-mini"
 
 
-def agent_response_callback(msg: ChatMessageContent) -> None:
-    """Observer callback – print every agent message to stdout with improved formatting."""
-    role = msg.name or "(unknown)"
+def _message_text(msg) -> str:
+    """Return the message content, or a description of its function calls if it has none."""
     content = msg.content or ""
 
     # If content is empty, try to get content from items (FunctionCallContent)
@@ -62,72 +57,61 @@ def agent_response_callback(msg: ChatMessageContent) -> None:
                     function_calls.append(f"Arguments: {arguments}")
         if function_calls:
             content = "\n".join(function_calls)
+    return content
+
+
+def agent_response_callback(msg: ChatMessageContent) -> None:
+    """Observer callback – queue every agent message for the output sinks."""
+    role = msg.name or "(unknown)"
+    content = _message_text(msg)
 
     # Log to file and console
     logger.info(f"Agent Response - {role}: {content[:100]}...")
 
-    # Pretty print to console
-    print(f"\n{'=' * 60}")
-    print(f"🤖 **{role}**")
-    print(f"{'=' * 60}")
-    print(f"{content}")
-    print(f"{'=' * 60}\n")
+    # Rendering and terminal I/O happen on the output writer thread
+    get_output_dispatcher().emit({"type": "message", "agent": role, "content": content})
 
 def streaming_agent_response_callback(message: StreamingChatMessageContent, is_final: bool) -> None:
-    """Observer function to print the messages from the agents.
+    """Observer function to route the streamed messages from the agents to the stream multiplexer.
 
     Args:
         message (StreamingChatMessageContent): The streaming message content from the agent.
         is_final (bool): Indicates if this is the final part of the message.
     """
-    global is_new_message
-    if is_new_message:
-        print(f"\n{'=' * 60}")
-        print(f"🤖 **{message.name}**")
-        print(f"{'=' * 60}")
-        is_new_message = False
-    
-    content = message.content or ""
-    
-    # If content is empty, try to get content from items (FunctionCallContent)
-    if not content and hasattr(message, 'items') and message.items:
-        function_calls = []
-        for item in message.items:
-            if hasattr(item, 'function_name'):
-                function_calls.append(f"Function: {item.function_name}")
-                
-                # Try to get arguments from different sources
-                arguments = None
-                
-                # Check if metadata is a dict and has 'arguments' key
-                if hasattr(item, 'metadata') and isinstance(item.metadata, dict) and 'arguments' in item.metadata:
-                    arguments = item.metadata['arguments']
-                # Check if item has arguments attribute
-                elif hasattr(item, 'arguments'):
-                    arguments = item.arguments
-                
-                if arguments:
-                    function_calls.append(f"Arguments: {arguments}")
-        if function_calls:
-            content = "\n".join(function_calls)
-    
-    print(f"{content}", end="", flush=True)
-    if is_final:
-        print(f"{'=' * 60}\n")
-        is_new_message = True
+    get_stream_multiplexer().feed(DEFAULT_ORCHESTRATION, message.name, _message_text(message), is_final)
+
+
+def make_streaming_callback(orchestration_id: str) -> Callable[[StreamingChatMessageContent, bool], None]:
+    """
+    Create a streaming callback for one orchestration.
+
+    Orchestrations running concurrently in one process each need their own
+    callback so that agents with the same name do not share a stream.
+
+    Args:
+        orchestration_id: Identifier of the orchestration
+
+    Returns:
+        Callable[[StreamingChatMessageContent, bool], None]: Callback for streaming_agent_response_callback
+    """
+    multiplexer = get_stream_multiplexer()
+    multiplexer.begin(orchestration_id)
+
+    def callback(message: StreamingChatMessageContent, is_final: bool) -> None:
+        multiplexer.feed(orchestration_id, message.name, _message_text(message), is_final)
+
+    return callback
 
 
 def get_azure_openai_service(model_and_deployment_name: Optional[ModelAndDeploymentName]=ModelAndDeploymentName.GPT_41_MINI) -> AzureChatCompletion:
     """
-    Create Azure OpenAI chat completion service.
+    Return the Azure OpenAI chat completion service for a deployment.
+
+    Services are memoized process-wide and share one pooled HTTP client; call
+    close_azure_openai_services() at shutdown.
 
     """
-    return AzureChatCompletion(
-        deployment_name=model_and_deployment_name.value,
-        endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-        api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-    )
+    return get_chat_service_registry().get(model_and_deployment_name.value)
 
 
 def truncate_text(text: str, max_length: int = 1000) -> str:
@@ -172,6 +156,13 @@ def validate_search_results(results: list) -> bool:
 
 
 async def human_response_function(chat_history: Optional[ChatHistory]=None) -> ChatMessageContent:
-    """Function to get user input."""
-    user_input = input("User(You)🧑‍💻: ")
-    return ChatMessageContent(role=AuthorRole.USER, content=user_input)
+    """Function to get user input without blocking the event loop.
+
+    The question goes through the configured human input channel; if nobody
+    answers before HUMAN_INPUT_TIMEOUT, the default action applies.
+    """
+    context = None
+    if chat_history is not None and chat_history.messages:
+        last_message = chat_history.messages[-1]
+        context = truncate_text(f"{last_message.name or last_message.role}: {last_message.content or ''}")
+    return await get_human_input_broker().ask("User(You)🧑‍💻: ", context=context)